@@ -3,6 +3,7 @@ from .csv_check import CSVCheck
 from .empty_set_check import EmptySetCheck
 from .excel_check import ExcelCheck
 from .generator import DataCheckGenerator
+from .parquet_check import ParquetCheck
 from .path_not_exists import PathNotExists
 from .pipeline_check import PipelineCheck
 from .table_check import TableCheck
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from importlib.util import find_spec
+from typing import Optional, cast
+
+import numpy as np
+import pandas as pd
+
+from ..exceptions import DataCheckError
+from .sql_base_check import SQLBaseCheck
+
+
+@dataclass
+class Comparison:
+    diff: pd.DataFrame
+    merged: Optional[pd.DataFrame] = None
+
+
+class ComparisonBackend:
+    """
+    Compares the normalized results of a CSV check.
+    The default backend merges both results with pandas.
+    """
+
+    name = "pandas"
+
+    def compare(
+        self, sql_result: pd.DataFrame, expect_result: pd.DataFrame, partitions: int
+    ) -> Comparison:
+        """
+        Returns the rows that are only in one of the results, with the column
+        _merge set to "left_only" or "right_only", like in merge_results.
+        """
+        df_merged = SQLBaseCheck.merge_results(
+            sql_result, expect_result, partitions=partitions
+        )
+        df_diff = cast(pd.DataFrame, df_merged[df_merged._merge != "both"])
+        return Comparison(df_diff, df_merged)
+
+
+def _arrow_table(df: pd.DataFrame):
+    import pyarrow as pa  # type: ignore
+    import pyarrow.compute as pc  # type: ignore
+    import pyarrow.types as pat  # type: ignore
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.rename_columns([f"c{i}" for i in range(table.num_columns)])
+    for i, field in enumerate(table.schema):
+        if pat.is_floating(field.type):
+            # -0.0 + 0.0 is 0.0, both are equal in pandas
+            table = table.set_column(i, field.name, pc.add(table.column(i), 0.0))
+    return table
+
+
+def _unmatched_rows(
+    left: pd.DataFrame, right: pd.DataFrame
+) -> Optional[tuple[np.ndarray, np.ndarray]]:
+    """
+    Returns the positions of the rows that have no equal row in the other result.
+    Returns None if the results cannot be compared with Arrow like with pandas:
+    if their columns differ or have other types.
+    """
+    import pyarrow as pa  # type: ignore
+    import pyarrow.compute as pc  # type: ignore
+
+    if not (left.columns.is_unique and right.columns.is_unique):
+        return None
+    if set(left.columns) != set(right.columns) or len(left.columns) == 0:
+        return None
+    try:
+        left_table = _arrow_table(left)
+        right_table = _arrow_table(right[left.columns])
+    except Exception:
+        # e.g. values of different types in an object column
+        return None
+    if left_table.schema != right_table.schema:
+        return None
+
+    columns = left_table.column_names
+    table = pa.concat_tables([left_table, right_table])
+    table = table.append_column(
+        "_side",
+        pa.array(np.repeat(np.array([0, 1], dtype=np.int8), [len(left), len(right)])),
+    ).append_column("_row", pa.array(np.arange(len(left) + len(right))))
+    # missing values are equal in the groups, like in merge
+    groups = table.group_by(columns).aggregate(
+        [("_side", "min"), ("_side", "max"), ("_row", "list")]
+    )
+    unmatched = groups.filter(pc.equal(groups["_side_min"], groups["_side_max"]))
+    rows = np.sort(unmatched["_row_list"].combine_chunks().flatten().to_numpy())
+    left_rows = rows[rows < len(left)]
+    return left_rows, rows[rows >= len(left)] - len(left)
+
+
+class ArrowComparisonBackend(ComparisonBackend):
+    """
+    Finds the rows that differ by grouping both results in Arrow, which uses
+    several threads. Only these rows are merged with pandas, so the diff is the
+    same as with the pandas backend. The full merged result is not available.
+    Results that cannot be converted into the same Arrow types are merged with pandas.
+    """
+
+    name = "arrow"
+
+    def compare(
+        self, sql_result: pd.DataFrame, expect_result: pd.DataFrame, partitions: int
+    ) -> Comparison:
+        if find_spec("pyarrow") is None:
+            raise DataCheckError(
+                "pyarrow must be installed to use the arrow comparison backend, "
+                "install data-check[arrow]"
+            )
+        SQLBaseCheck.convert_mixed_object_columns(sql_result, expect_result)
+        SQLBaseCheck.convert_mixed_tzinfo_columns(sql_result, expect_result)
+        unmatched = _unmatched_rows(sql_result, expect_result)
+        if unmatched is None:
+            return super().compare(sql_result, expect_result, partitions)
+        left_rows, right_rows = unmatched
+        df_merged = SQLBaseCheck.merge_results(
+            sql_result.iloc[left_rows].reset_index(drop=True),
+            expect_result.iloc[right_rows].reset_index(drop=True),
+        )
+        df_diff = cast(pd.DataFrame, df_merged[df_merged._merge != "both"])
+        return Comparison(df_diff)
+
+
+COMPARISON_BACKENDS: dict[str, type[ComparisonBackend]] = {
+    ComparisonBackend.name: ComparisonBackend,
+    ArrowComparisonBackend.name: ArrowComparisonBackend,
+}
+
+
+def get_comparison_backend(name: str) -> ComparisonBackend:
+    """Returns the comparison backend with the given name from data_check.yml."""
+    backend = COMPARISON_BACKENDS.get(name.lower())
+    if backend is None:
+        raise DataCheckError(f"unknown comparison backend: {name}")
+    return backend()
@@ -1,18 +1,47 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
+from contextlib import closing
 from dataclasses import dataclass
+from itertools import chain
 from pathlib import Path
 from typing import TYPE_CHECKING, Optional, Union, cast
 
+import numpy as np
 import pandas as pd
+from pandas.api.types import (
+    infer_dtype,
+    is_datetime64_any_dtype,
+    is_object_dtype,
+    is_string_dtype,
+)
 
-from ..file_ops import get_expect_file, read_csv
+from ..exceptions import DataCheckError
+from ..file_ops import (
+    get_expect_file,
+    is_csv_file,
+    parse_date_columns,
+    read_check_option,
+    read_csv,
+    read_csv_chunks,
+    read_key_columns,
+    replace_suffix,
+)
 from ..result import DataCheckResult, ResultType
+from ..sql.fingerprint import Fingerprint, dataframe_fingerprint
+from ..sql.result_shape import SHAPE_CHECK_MODES, dataframe_shape, shape_differences
+from ..sql.server_side_diff import ServerSideDiff
+from .comparison_backend import get_comparison_backend
+from .key_diff import key_diff
+from .sort_merge_diff import SortMergeDiff, sort_merge_diff
 from .sql_base_check import SQLBaseCheck
 
 if TYPE_CHECKING:
     from data_check import DataCheck
 
+# number of rows of each result that are shown if the shape check fails
+SHAPE_SAMPLE_ROWS = 10
+
 
 @dataclass
 class CSVCheckResult:
@@ -24,36 +53,96 @@ class CSVCheckResult:
 
 class CSVCheck(SQLBaseCheck):
     def __init__(self, data_check: DataCheck, check_path: Path) -> None:
-        if check_path.suffix.lower() in (".csv", ".xlsx"):
-            check_path = check_path.with_suffix(".sql")
+        if is_csv_file(check_path) or check_path.suffix.lower() in (
+            ".xlsx",
+            ".parquet",
+        ):
+            check_path = replace_suffix(check_path, ".sql")
         super().__init__(data_check, check_path)
 
     @staticmethod
     def is_check_path(path: Path):
         return path.suffix.lower() == ".sql" or (
-            path.suffix.lower() in (".csv", ".xlsx")
-            and path.with_suffix(".sql").exists()
+            (is_csv_file(path) or path.suffix.lower() in (".xlsx", ".parquet"))
+            and replace_suffix(path, ".sql").exists()
+        )
+
+    @staticmethod
+    def normalize_result(df: pd.DataFrame):
+        """
+        Replaces missing values, None and empty strings with pd.NA in place.
+        Only text columns can contain them, typed columns keep NaN and NaT.
+        Object columns without missing values get the type of their values,
+        e.g. int64 for Python ints.
+        """
+        for i, dtype in enumerate(df.dtypes):
+            column = df.iloc[:, i]
+            if isinstance(dtype, pd.StringDtype):
+                empty = (column == "").to_numpy(dtype=bool, na_value=False)
+                if empty.any():
+                    df.isetitem(i, column.mask(empty, pd.NA).array)
+                continue
+            if not is_object_dtype(dtype):
+                continue
+            values = column.to_numpy()
+            only_strings = infer_dtype(values, skipna=False) == "string"
+            if only_strings:
+                # only strings, so no missing values and no other types
+                missing = np.equal(values, "")
+            else:
+                missing = pd.isna(values)
+                present = ~missing
+                missing[present] = np.equal(values[present], "")
+            if missing.any():
+                values = values.copy()
+                values[missing] = pd.NA
+                df.isetitem(i, values)
+            elif not only_strings:
+                inferred = column.infer_objects()
+                if inferred.dtype != dtype:
+                    df.isetitem(i, inferred.array)
+
+    def get_key_columns(self) -> list[str]:
+        """Returns the key columns that are declared in the SQL file of the check."""
+        return read_key_columns(self.check_path)
+
+    @staticmethod
+    def get_key_result(
+        sql_result: pd.DataFrame, expect_result: pd.DataFrame, key_columns: list[str]
+    ) -> CSVCheckResult:
+        """
+        Compares the results on their key columns. The diff contains the values
+        that changed instead of the whole rows. The full merged result is not
+        available in this case.
+        """
+        try:
+            diff = key_diff(sql_result, expect_result, key_columns)
+        except Exception as e:
+            return CSVCheckResult(ResultType.FAILED_WITH_EXCEPTION, exception=e)
+        return CSVCheckResult(
+            DataCheckResult.passed_to_result_type(len(diff.diff) == 0), diff.diff
         )
 
     def get_result(
         self, sql_result: pd.DataFrame, expect_result: pd.DataFrame
     ) -> CSVCheckResult:
-        # replace missing values and None with pd.NA
-        sql_result.fillna(value=pd.NA, inplace=True)
-        # using "" instead of r'^$' doesn't work somehow, so we need to use regex
-        sql_result.replace(r"^$", pd.NA, regex=True, inplace=True)
-        # replace empty datetime values with empty string
-        sql_result.replace({pd.NaT: pd.NA}, inplace=True)
+        key_columns = self.get_key_columns()
+        if key_columns:
+            return self.get_key_result(sql_result, expect_result, key_columns)
 
-        expect_result.fillna(value=pd.NA, inplace=True)
-        expect_result.replace(r"^$", pd.NA, regex=True, inplace=True)
-        expect_result.replace({pd.NaT: pd.NA}, inplace=True)
+        self.normalize_result(sql_result)
+        self.normalize_result(expect_result)
 
         try:
-            df_merged = SQLBaseCheck.merge_results(sql_result, expect_result)
+            backend = get_comparison_backend(self.data_check.config.comparison_backend)
+            comparison = backend.compare(
+                sql_result,
+                expect_result,
+                partitions=self.data_check.config.compare_partitions,
+            )
         except Exception as e:
             return CSVCheckResult(ResultType.FAILED_WITH_EXCEPTION, exception=e)
-        df_diff = cast(pd.DataFrame, df_merged[df_merged._merge != "both"])
+        df_diff, df_merged = comparison.diff, comparison.merged
 
         # empty diff means there are no differences and the test has passed
         passed = len(df_diff) == 0
@@ -65,12 +154,296 @@ class CSVCheck(SQLBaseCheck):
             DataCheckResult.passed_to_result_type(passed), df_diff, df_merged
         )
 
+    def get_server_side_result(
+        self, diff: ServerSideDiff, expect_result: pd.DataFrame
+    ) -> CSVCheckResult:
+        """
+        Builds the same diff as get_result from the rows that differ in the database.
+        The full merged result is not available in this case.
+        """
+        db_only = diff.db_only.df
+        expected_only = expect_result.iloc[diff.expected_only].reset_index(drop=True)
+        expected_only = expected_only[db_only.columns]
+        self.normalize_result(db_only)
+        self.normalize_result(expected_only)
+
+        # empty frames are left out, pandas would warn about them in concat
+        frames = [
+            frame.assign(_merge=merge)
+            for frame, merge in ((db_only, "left_only"), (expected_only, "right_only"))
+            if len(frame) > 0
+        ]
+        if frames:
+            df_diff = pd.concat(frames, ignore_index=True)
+        else:
+            df_diff = db_only.assign(_merge=pd.Series(dtype=object))
+        df_diff["_merge"] = pd.Categorical(
+            df_diff["_merge"], categories=["left_only", "right_only", "both"]
+        )
+
+        passed = len(df_diff) == 0
+        if passed and diff.db_row_count != len(expect_result):
+            return CSVCheckResult(ResultType.FAILED_DIFFERENT_LENGTH, df_diff)
+        return CSVCheckResult(DataCheckResult.passed_to_result_type(passed), df_diff)
+
+    def use_fingerprint(self) -> bool:
+        return (
+            self.data_check.config.fingerprint_check
+            and self.data_check.sql.supports_fingerprint()
+        )
+
+    def expectation_fingerprint(
+        self, expect_file: Path
+    ) -> tuple[list[str], Fingerprint]:
+        """Returns the columns and the fingerprint of the expectation file."""
+        fingerprint_cache = self.data_check.fingerprint_cache
+        cached = fingerprint_cache.get(expect_file)
+        if cached is not None:
+            return cached
+        # the values are hashed like they are written in the file
+        expect_result = read_csv(expect_file, as_strings=True)
+        columns = [str(c) for c in expect_result.columns]
+        fingerprint = dataframe_fingerprint(expect_result)
+        fingerprint_cache.set(expect_file, columns, fingerprint)
+        return columns, fingerprint
+
+    def fingerprint_matches(self, expect_file: Path) -> bool:
+        """
+        Compares the fingerprint of the query result in the database
+        with the fingerprint of the expectation. The results must be
+        compared as usual if the fingerprints differ.
+        """
+        try:
+            columns, fingerprint = self.expectation_fingerprint(expect_file)
+            query_fingerprint = self.data_check.sql.query_fingerprint(
+                self.get_query(), self.data_check.sql_params, columns
+            )
+        except Exception:
+            # errors are reported by the normal comparison
+            return False
+        return query_fingerprint == fingerprint
+
+    def get_shape_check(self) -> str:
+        """
+        Returns the shape check mode that is declared in the SQL file of the check
+        or the default mode from data_check.yml.
+        """
+        shape_check = read_check_option(self.check_path, "shape_check")
+        if shape_check is None:
+            shape_check = self.data_check.config.shape_check
+        shape_check = shape_check.lower()
+        if shape_check not in SHAPE_CHECK_MODES:
+            raise DataCheckError(f"unknown shape check: {shape_check}")
+        return shape_check
+
+    def read_shape_expectation(self, expect_file: Path) -> pd.DataFrame:
+        """Reads the expectation file for the shape check."""
+        return self.data_check.expectation_cache.read(
+            expect_file,
+            lambda: read_csv(expect_file, as_strings=True),
+            as_strings=True,
+        )
+
+    def shape_sample(self, expect_result: pd.DataFrame) -> pd.DataFrame:
+        """
+        Returns the first rows of the query and the expectation as text,
+        instead of the diff of the whole results. Rows that are in both
+        samples are left out.
+        """
+        # only the first chunk is fetched, closing the generator
+        # releases the connection
+        with closing(
+            self.data_check.sql.run_query_chunks(
+                self.get_query(),
+                self.data_check.sql_params,
+                chunk_size=SHAPE_SAMPLE_ROWS,
+            )
+        ) as query_chunks:
+            query_sample = next(query_chunks).astype("string")
+        expect_sample = expect_result.head(SHAPE_SAMPLE_ROWS).astype("string")
+        if query_sample.columns.is_unique and set(query_sample.columns) == set(
+            expect_sample.columns
+        ):
+            sample = query_sample.merge(expect_sample, how="outer", indicator=True)
+            return cast(pd.DataFrame, sample[sample._merge != "both"])
+        frames = [
+            frame.assign(_merge=merge)
+            for frame, merge in (
+                (query_sample, "left_only"),
+                (expect_sample, "right_only"),
+            )
+            if len(frame) > 0
+        ]
+        if not frames:
+            return query_sample.assign(_merge=pd.Series(dtype=object))
+        return pd.concat(frames, ignore_index=True)
+
+    def run_shape_check(
+        self, sql_file: Path, expect_file: Path
+    ) -> Optional[DataCheckResult]:
+        """
+        Compares the columns and the counts of the query and the expectation
+        before fetching the query result. Returns None if the shapes are similar
+        and the results must be compared as usual.
+        """
+        try:
+            shape_check = self.get_shape_check()
+        except DataCheckError as exc:
+            return self.data_check.output.prepare_result(
+                ResultType.FAILED_WITH_EXCEPTION, source=sql_file, exception=exc
+            )
+        if shape_check == "off":
+            return None
+        value_counts = shape_check == "nulls"
+        try:
+            expect_result = self.read_shape_expectation(expect_file)
+            query_shape = self.data_check.sql.query_shape(
+                self.get_query(), self.data_check.sql_params, value_counts
+            )
+        except Exception:
+            # errors are reported by the normal comparison
+            return None
+        differences = shape_differences(
+            query_shape,
+            dataframe_shape(expect_result, value_counts),
+            self.data_check.config.shape_check_ratio,
+        )
+        if not differences:
+            return None
+        try:
+            sample = self.shape_sample(expect_result)
+        except Exception as exc:
+            return self.data_check.output.prepare_result(
+                ResultType.FAILED_WITH_EXCEPTION, source=sql_file, exception=exc
+            )
+        result = self.data_check.output.prepare_result(
+            ResultType.FAILED_DIFFERENT_SHAPE, source=sql_file, result=sample
+        )
+        result.extra_message += f": {'; '.join(differences)}"
+        return result
+
+    def use_server_side_diff(self) -> bool:
+        return (
+            self.data_check.config.server_side_diff
+            and self.data_check.sql.supports_server_side_diff()
+        )
+
+    def run_server_side_diff(
+        self, sql_file: Path, expect_file: Path
+    ) -> Optional[DataCheckResult]:
+        """
+        Compares the query and the expectation inside the database.
+        Returns None if the check must be compared on the client side instead.
+        """
+        try:
+            # the database converts the strings into the types of the query columns
+            expect_strings = self.data_check.expectation_cache.read(
+                expect_file,
+                lambda: read_csv(expect_file, as_strings=True),
+                as_strings=True,
+            )
+        except Exception as exc_csv:
+            return self.data_check.output.prepare_result(
+                ResultType.FAILED_WITH_EXCEPTION, source=expect_file, exception=exc_csv
+            )
+        # the same columns are parsed as dates as in the client side comparison
+        date_columns, _ = parse_date_columns(expect_strings.copy())
+        try:
+            diff = self.data_check.sql.server_side_diff(
+                self.get_query(),
+                self.data_check.sql_params,
+                expect_strings,
+                date_columns,
+            )
+        except Exception:
+            # e.g. a value of the expectation cannot be converted into the column type
+            return None
+        if diff is None:
+            return None
+
+        # the rows only in the expectation are read like in the client side comparison
+        expect_result = self.read_expect_file(expect_file, diff.db_only.string_columns)
+        if isinstance(expect_result, DataCheckResult):
+            return expect_result
+        result = self.get_server_side_result(diff, expect_result)
+        return self.data_check.output.prepare_result(
+            result.result_type,
+            source=sql_file,
+            result=result.diff,
+            exception=result.exception,
+        )
+
+    def use_sort_merge_diff(self) -> bool:
+        return self.data_check.config.sort_merge_diff
+
+    def iter_expect_chunks(
+        self, expect_file: Path, string_columns: list[str], date_columns: list[str]
+    ) -> Iterator[pd.DataFrame]:
+        """Reads the expectation file in chunks for the sort merge comparison."""
+        return read_csv_chunks(
+            expect_file,
+            chunk_size=self.data_check.config.sort_merge_chunk_size,
+            string_columns=string_columns,
+            date_columns=date_columns,
+        )
+
+    @staticmethod
+    def get_sort_merge_result(diff: SortMergeDiff) -> CSVCheckResult:
+        passed = len(diff.diff) == 0
+        if passed and diff.left_row_count != diff.right_row_count:
+            return CSVCheckResult(ResultType.FAILED_DIFFERENT_LENGTH, diff.diff)
+        return CSVCheckResult(DataCheckResult.passed_to_result_type(passed), diff.diff)
+
+    def run_sort_merge_diff(self, sql_file: Path, expect_file: Path) -> DataCheckResult:
+        """
+        Compares the query and the expectation in chunks that are sorted on disk,
+        so neither of them must fit into memory.
+        The full merged result is not available in this case.
+        """
+        query_chunks = self.data_check.sql.run_query_chunks(
+            self.get_query(),
+            self.data_check.sql_params,
+            chunk_size=self.data_check.config.sort_merge_chunk_size,
+        )
+        # the connection is released when the generator is closed,
+        # also if an exception keeps its frame alive
+        with closing(query_chunks):
+            try:
+                first = next(query_chunks)
+                # the columns of the expectation are read like in read_expect_file
+                string_columns = [
+                    str(c) for c, column in first.items() if is_string_dtype(column)
+                ]
+                date_columns = [
+                    str(c)
+                    for c, column in first.items()
+                    if is_datetime64_any_dtype(column)
+                ]
+            except Exception as exc:
+                return self.data_check.output.prepare_result(
+                    ResultType.FAILED_WITH_EXCEPTION, source=sql_file, exception=exc
+                )
+            try:
+                diff = sort_merge_diff(
+                    chain([first], query_chunks),
+                    self.iter_expect_chunks(expect_file, string_columns, date_columns),
+                )
+            except Exception as exc:
+                return self.data_check.output.prepare_result(
+                    ResultType.FAILED_WITH_EXCEPTION, source=sql_file, exception=exc
+                )
+        result = self.get_sort_merge_result(diff)
+        return self.data_check.output.prepare_result(
+            result.result_type, source=sql_file, result=result.diff
+        )
+
     def read_expect_file(
         self, expect_file: Path, string_columns: list[str]
     ) -> Union[DataCheckResult, pd.DataFrame]:
         try:
-            expect_result = read_csv(
+            expect_result = self.data_check.expectation_cache.read(
                 expect_file,
+                lambda: read_csv(expect_file, string_columns=string_columns),
                 string_columns=string_columns,
             )
             return expect_result
@@ -82,6 +455,31 @@ class CSVCheck(SQLBaseCheck):
     def get_expect_file(self, sql_file: Path) -> Path:
         return get_expect_file(sql_file)
 
+    def compare_without_fetch(
+        self, sql_file: Path, expect_file: Path
+    ) -> Optional[DataCheckResult]:
+        """
+        Compares the check without fetching the whole query result into memory.
+        Returns None if the results must be compared in memory.
+        """
+        if self.use_fingerprint() and self.fingerprint_matches(expect_file):
+            return self.data_check.output.prepare_result(
+                ResultType.PASSED, source=sql_file
+            )
+        shape_result = self.run_shape_check(sql_file, expect_file)
+        if shape_result is not None:
+            return shape_result
+        if self.get_key_columns():
+            # checks with key columns are compared in memory
+            return None
+        if self.use_server_side_diff():
+            server_side_result = self.run_server_side_diff(sql_file, expect_file)
+            if server_side_result is not None:
+                return server_side_result
+        if self.use_sort_merge_diff():
+            return self.run_sort_merge_diff(sql_file, expect_file)
+        return None
+
     def run_test(self) -> DataCheckResult:
         """
         Run a data_check test on a single input file.
@@ -94,6 +492,10 @@ class CSVCheck(SQLBaseCheck):
             return self.data_check.output.prepare_result(
                 ResultType.NO_EXPECTED_RESULTS_FILE, source=sql_file
             )
+        result_without_fetch = self.compare_without_fetch(sql_file, expect_file)
+        if result_without_fetch is not None:
+            return result_without_fetch
+
         sql_result = self.get_sql_result()
         if isinstance(sql_result, DataCheckResult):
             return sql_result
@@ -16,6 +16,17 @@ class ExcelCheck(CSVCheck):
     def get_expect_file(self, sql_file: Path) -> Path:
         return sql_file.with_suffix(".xlsx")
 
+    # Values from Excel files are not strings, so they can neither be hashed
+    # like the query values nor be converted into the types of the query columns.
+    def use_fingerprint(self) -> bool:
+        return False
+
+    def use_server_side_diff(self) -> bool:
+        return False
+
+    def use_sort_merge_diff(self) -> bool:
+        return False
+
     def clean_string_column(self, col: str):
         return col.replace("\u00a0", " ")
 
@@ -27,18 +38,28 @@ class ExcelCheck(CSVCheck):
                     df[column_name] = _col
         return df
 
+    def read_excel(self, expect_file: Path) -> pd.DataFrame:
+        expect_result: pd.DataFrame = pd.read_excel(
+            cast(str, expect_file),
+            sheet_name=0,
+            header=0,
+            engine="openpyxl",
+            dtype="object",
+        )
+        return self.clean_excel_df(expect_result)
+
+    def read_shape_expectation(self, expect_file: Path) -> pd.DataFrame:
+        return self.data_check.expectation_cache.read(
+            expect_file, lambda: self.read_excel(expect_file)
+        )
+
     def read_expect_file(
         self, expect_file: Path, string_columns: list[str]
     ) -> Union[DataCheckResult, pd.DataFrame]:
         try:
-            expect_result: pd.DataFrame = pd.read_excel(
-                cast(str, expect_file),
-                sheet_name=0,
-                header=0,
-                engine="openpyxl",
-                dtype="object",
+            return self.data_check.expectation_cache.read(
+                expect_file, lambda: self.read_excel(expect_file)
             )
-            return self.clean_excel_df(expect_result)
         except Exception as exc_csv:
             return self.data_check.output.prepare_result(
                 ResultType.FAILED_WITH_EXCEPTION, source=expect_file, exception=exc_csv
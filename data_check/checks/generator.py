@@ -3,7 +3,13 @@ from __future__ import annotations
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from ..file_ops import get_expect_file, rel_path, write_csv
+from ..file_ops import (
+    get_expect_file,
+    is_csv_file,
+    rel_path,
+    replace_suffix,
+    write_file,
+)
 from ..result import DataCheckResult
 from ..sql.query_result import QueryResult
 from .base_check import BaseCheck
@@ -19,22 +25,38 @@ class DataCheckGenerator(BaseCheck):
     def __init__(
         self, data_check: DataCheck, check_path: Path, check_obj: SQLBaseCheck
     ) -> None:
-        if check_path.suffix.lower() in (".csv", ".xlsx"):
-            check_path = check_path.with_suffix(".sql")
+        if is_csv_file(check_path) or check_path.suffix.lower() in (
+            ".xlsx",
+            ".parquet",
+        ):
+            check_path = replace_suffix(check_path, ".sql")
         super().__init__(data_check, check_path)
         self.check_obj = check_obj
 
+    def get_expect_file(self, sql_file: Path) -> Path:
+        """
+        Returns the existing expectation file, so it keeps its format.
+        Otherwise the file is named by the format that is generated.
+        """
+        parquet_file = sql_file.with_suffix(".parquet")
+        if parquet_file.exists():
+            return parquet_file
+        expect_file = get_expect_file(sql_file)
+        if expect_file.exists():
+            return expect_file
+        return sql_file.with_suffix(f".{self.data_check.config.generate_format}")
+
     def gen_expectation(self, sql_file: Path, force: bool = False) -> DataCheckResult:
         """
         Executes the query for a data_check test
-        and stores the result in the csv file.
+        and stores the result in the expectation file.
         """
-        expect_result = get_expect_file(sql_file)
+        expect_result = self.get_expect_file(sql_file)
         _rel_path = rel_path(expect_result)
         if not expect_result.exists() or force:
             result = self.check_obj.get_sql_result()
             assert isinstance(result, QueryResult)
-            write_csv(result.df, expect_result, sort_output=True)
+            write_file(result.df, expect_result, sort_output=True)
             output = f"expectation written to {_rel_path}"
         else:
             output = f"expectation skipped for {_rel_path}"
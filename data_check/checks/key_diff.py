@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from ..exceptions import DataCheckError
+from .sort_merge_diff import canonical_column
+
+# columns of the diff, after the key columns
+DIFF_COLUMNS = ["_column", "_db", "_expected", "_diff"]
+# number of duplicate keys that are shown in the error message
+MAX_DUPLICATES_SHOWN = 5
+
+
+@dataclass
+class KeyDiff:
+    """Result of comparing two results on their key columns."""
+
+    diff: pd.DataFrame
+    """
+    One row for each changed value with the column and both values,
+    and one row for each key that is only on one side.
+    _diff is "changed", "db" or "expected" like in the printed results.
+    """
+    changed_count: int
+    db_only_count: int
+    expected_only_count: int
+
+
+def _key_index(df: pd.DataFrame, key_columns: list[str], side: str) -> pd.Index:
+    """Returns the canonical key values of the rows, the keys must be unique."""
+    keys = [canonical_column(df[c]) for c in key_columns]
+    index = pd.Index(keys[0]) if len(keys) == 1 else pd.MultiIndex.from_arrays(keys)
+    if not index.is_unique:
+        duplicates = index[index.duplicated()].unique()[:MAX_DUPLICATES_SHOWN]
+        raise DataCheckError(
+            f"key columns {key_columns} are not unique in the {side} result, "
+            f"duplicate keys: {duplicates.tolist()}"
+        )
+    return index
+
+
+def _key_values(
+    key_columns: list[str], index: pd.Index, positions: np.ndarray
+) -> dict[str, np.ndarray]:
+    """Returns the values of each key column for the rows at the positions."""
+    selected = index[positions]
+    if isinstance(selected, pd.MultiIndex):
+        return {
+            c: selected.get_level_values(i).to_numpy(dtype=object)
+            for i, c in enumerate(key_columns)
+        }
+    return {key_columns[0]: selected.to_numpy(dtype=object)}
+
+
+def _diff_frame(
+    keys: dict[str, np.ndarray],
+    column: Any,
+    db_values: Any,
+    expected_values: Any,
+    diff: str,
+) -> pd.DataFrame:
+    df = pd.DataFrame(keys, dtype=object)
+    df["_column"] = column
+    df["_db"] = db_values
+    df["_expected"] = expected_values
+    df["_diff"] = diff
+    return df
+
+
+def key_diff(
+    db_result: pd.DataFrame, expect_result: pd.DataFrame, key_columns: list[str]
+) -> KeyDiff:
+    """
+    Compares the rows of both results that have the same key, column by column.
+    The rows are joined by a hash lookup of the key, so the time grows linearly
+    with the number of values. All common columns are compared,
+    the values are compared by canonical_value like in the sort merge comparison.
+    """
+    columns = [c for c in db_result.columns if c in expect_result.columns]
+    if not columns:
+        raise pd.errors.MergeError("No common columns to compare")
+    missing = [c for c in key_columns if c not in columns]
+    if missing:
+        raise DataCheckError(f"key columns {missing} are missing in the results")
+    db_index = _key_index(db_result, key_columns, "db")
+    expect_index = _key_index(expect_result, key_columns, "expected")
+
+    expect_positions = expect_index.get_indexer(db_index)
+    db_matched = np.flatnonzero(expect_positions >= 0)
+    expect_matched = expect_positions[db_matched]
+    db_only = np.flatnonzero(expect_positions < 0)
+    expected_only_mask = np.ones(len(expect_index), dtype=bool)
+    expected_only_mask[expect_matched] = False
+    expected_only = np.flatnonzero(expected_only_mask)
+
+    frames: list[pd.DataFrame] = []
+    changed_count = 0
+    for column in columns:
+        if column in key_columns:
+            continue
+        db_values = np.array(
+            canonical_column(db_result[column].iloc[db_matched]), dtype=object
+        )
+        expected_values = np.array(
+            canonical_column(expect_result[column].iloc[expect_matched]), dtype=object
+        )
+        changed = np.flatnonzero(db_values != expected_values)
+        if len(changed) > 0:
+            changed_count += len(changed)
+            frames.append(
+                _diff_frame(
+                    _key_values(key_columns, db_index, db_matched[changed]),
+                    str(column),
+                    db_values[changed],
+                    expected_values[changed],
+                    "changed",
+                )
+            )
+    for index, positions, diff in (
+        (db_index, db_only, "db"),
+        (expect_index, expected_only, "expected"),
+    ):
+        if len(positions) > 0:
+            frames.append(
+                _diff_frame(
+                    _key_values(key_columns, index, positions),
+                    pd.NA,
+                    pd.NA,
+                    pd.NA,
+                    diff,
+                )
+            )
+
+    if frames:
+        diff_df = pd.concat(frames, ignore_index=True)
+    else:
+        diff_df = pd.DataFrame(columns=[*key_columns, *DIFF_COLUMNS], dtype=object)
+    # missing values are empty strings in the canonical values
+    diff_df = diff_df.astype(object).replace("", pd.NA)
+    return KeyDiff(diff_df, changed_count, len(db_only), len(expected_only))
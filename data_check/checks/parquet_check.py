@@ -0,0 +1,50 @@
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Union
+
+import pandas as pd
+
+from ..file_ops import read_parquet, read_parquet_chunks
+from ..result import DataCheckResult, ResultType
+from .csv_check import CSVCheck
+
+
+class ParquetCheck(CSVCheck):
+    @staticmethod
+    def is_check_path(path: Path):
+        return (
+            path.suffix.lower() == ".sql" and path.with_suffix(".parquet").exists()
+        ) or (path.suffix.lower() == ".parquet" and path.with_suffix(".sql").exists())
+
+    def get_expect_file(self, sql_file: Path) -> Path:
+        return sql_file.with_suffix(".parquet")
+
+    # The values in Parquet files are typed, they are compared
+    # with the query result without converting them into strings.
+    def use_fingerprint(self) -> bool:
+        return False
+
+    def use_server_side_diff(self) -> bool:
+        return False
+
+    def iter_expect_chunks(
+        self, expect_file: Path, string_columns: list[str], date_columns: list[str]
+    ) -> Iterator[pd.DataFrame]:
+        return read_parquet_chunks(
+            expect_file, chunk_size=self.data_check.config.sort_merge_chunk_size
+        )
+
+    def read_shape_expectation(self, expect_file: Path) -> pd.DataFrame:
+        return read_parquet(expect_file)
+
+    def read_expect_file(
+        self, expect_file: Path, string_columns: list[str]
+    ) -> Union[DataCheckResult, pd.DataFrame]:
+        try:
+            return read_parquet(expect_file)
+        except Exception as exc_parquet:
+            return self.data_check.output.prepare_result(
+                ResultType.FAILED_WITH_EXCEPTION,
+                source=expect_file,
+                exception=exc_parquet,
+            )
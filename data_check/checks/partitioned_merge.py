@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import (
+    infer_dtype,
+    is_bool_dtype,
+    is_datetime64_any_dtype,
+    is_integer_dtype,
+    is_object_dtype,
+)
+
+# smaller results are merged in the process of the check
+PARTITION_MIN_ROWS = 100_000
+# missing values are hashed like this value, so they are in the same partition
+MISSING_HASH_VALUE = "\x00"
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _process_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Returns the pool that is shared by all checks. The processes are spawned,
+    forking is not safe while the checks run in threads.
+    """
+    global _pool, _pool_workers  # noqa: PLW0603
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown()
+            _pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            _pool_workers = workers
+        return _pool
+
+
+def shutdown_pool():
+    """Shuts down the process pool, a new pool is created on the next call."""
+    global _pool  # noqa: PLW0603
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+
+def _is_hash_column(col_1: pd.Series, col_2: pd.Series) -> bool:
+    """
+    Returns whether values that are equal in merge also have the same hash:
+    columns of the same integer, boolean or datetime type and columns of text.
+    Floats are left out, 0.0 and -0.0 are equal but have different hashes.
+    """
+    if is_object_dtype(col_1.dtype) and is_object_dtype(col_2.dtype):
+        return {
+            infer_dtype(col_1, skipna=True),
+            infer_dtype(col_2, skipna=True),
+        } <= {"string", "empty"}
+    return col_1.dtype == col_2.dtype and (
+        is_integer_dtype(col_1.dtype)
+        or is_bool_dtype(col_1.dtype)
+        or is_datetime64_any_dtype(col_1.dtype)
+    )
+
+
+def _row_partitions(
+    df: pd.DataFrame, columns: list[str], partitions: int
+) -> np.ndarray:
+    """Returns the partition of each row by the hash of the columns."""
+    hashed = df[columns].copy()
+    for c in columns:
+        if is_object_dtype(hashed[c].dtype):
+            hashed[c] = hashed[c].where(hashed[c].notna(), MISSING_HASH_VALUE)
+    row_hash = pd.util.hash_pandas_object(hashed, index=False).to_numpy()
+    return row_hash % np.uint64(partitions)
+
+
+def merge_partition(left: pd.DataFrame, right: pd.DataFrame) -> pd.DataFrame:
+    """Merges the rows of a partition, like merge_results without conversions."""
+    return left.merge(right, indicator=True, how="outer")
+
+
+def partitioned_merge(
+    left: pd.DataFrame, right: pd.DataFrame, partitions: int
+) -> Optional[pd.DataFrame]:
+    """
+    Splits both results by the hash of their rows and merges the partitions
+    in a process pool. Equal rows have the same hash, so they are merged
+    in the same partition. The merged partitions are sorted like the result
+    of a single merge.
+
+    Returns None if the results are too small or have no columns that can be
+    hashed, or if a partition cannot be merged, e.g. because the columns must
+    be converted first. They must be merged in a single merge then.
+    """
+    if partitions <= 1 or len(left) + len(right) < PARTITION_MIN_ROWS:
+        return None
+    if not (left.columns.is_unique and right.columns.is_unique):
+        return None
+    columns = [c for c in left.columns if c in right.columns]
+    hash_columns = [c for c in columns if _is_hash_column(left[c], right[c])]
+    if not hash_columns:
+        return None
+
+    left_partitions = _row_partitions(left, hash_columns, partitions)
+    right_partitions = _row_partitions(right, hash_columns, partitions)
+    pool = _process_pool(partitions)
+    futures = []
+    for p in range(partitions):
+        left_part = left.iloc[np.flatnonzero(left_partitions == p)]
+        right_part = right.iloc[np.flatnonzero(right_partitions == p)]
+        if len(left_part) > 0 or len(right_part) > 0:
+            futures.append(pool.submit(merge_partition, left_part, right_part))
+    try:
+        merged = [f.result() for f in futures]
+    except Exception:
+        # the single merge converts the columns or reports the error
+        return None
+
+    df_merged = pd.concat(merged, ignore_index=True)
+    try:
+        return df_merged.sort_values(by=columns, kind="stable", ignore_index=True)
+    except TypeError:
+        # values of different types cannot be sorted, the order doesn't matter then
+        return df_merged
@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import datetime
+import heapq
+import pickle
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from decimal import Decimal
+from itertools import chain, groupby
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import (
+    infer_dtype,
+    is_bool_dtype,
+    is_datetime64_any_dtype,
+    is_float_dtype,
+    is_integer_dtype,
+)
+
+Row = tuple[str, ...]
+
+# number of rows that are written into a run file at once
+RUN_BLOCK_SIZE = 10000
+# maximum number of run files that are merged at once
+MAX_OPEN_RUNS = 64
+
+MERGE_CATEGORIES = ["left_only", "right_only", "both"]
+# format of dates, the same for Timestamp and datetime values
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+# kinds of values that are converted back from their canonical strings in the diff
+VALUE_KINDS = {
+    "integer": "number",
+    "floating": "number",
+    "mixed-integer-float": "number",
+    "decimal": "number",
+    "boolean": "bool",
+    "datetime64": "date",
+    "datetime": "date",
+    "date": "date",
+}
+
+
+def _canonical_float(value: float) -> str:
+    if np.isnan(value):
+        return ""
+    # integral floats are equal to integers, like in pandas.merge
+    if value.is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def canonical_value(value: Any) -> str:
+    """
+    Returns the string that represents the value in the comparison.
+    Missing values and empty strings are the same, like in normalize_result.
+    """
+    if value is None or value is pd.NA or value is pd.NaT:
+        return ""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (bool, np.bool_, int, np.integer)):
+        return str(value)
+    if isinstance(value, (float, np.floating, Decimal)):
+        return _canonical_float(float(value))
+    # dates are compared as timestamps without time zone, like in merge_results
+    if isinstance(value, np.datetime64):
+        value = pd.Timestamp(value)
+    elif isinstance(value, datetime.date) and not isinstance(value, datetime.datetime):
+        value = datetime.datetime(value.year, value.month, value.day)
+    if isinstance(value, datetime.datetime):
+        return value.replace(tzinfo=None).strftime(DATE_FORMAT)
+    return str(value)
+
+
+def canonical_column(column: pd.Series) -> list[str]:
+    """Converts the values of a column with canonical_value, typed columns at once."""
+    if is_datetime64_any_dtype(column):
+        values = column.dt.tz_localize(None) if column.dt.tz else column
+        return values.dt.strftime(DATE_FORMAT).fillna("").tolist()
+    if is_integer_dtype(column) and not column.hasnans:
+        return column.astype(str).tolist()
+    if is_bool_dtype(column) and not column.hasnans:
+        return column.astype(str).tolist()
+    if is_float_dtype(column):
+        values = column.astype("float64")
+        result = values.astype(str)
+        integral = values.notna() & (values % 1 == 0)
+        in_int_range = integral & (values.abs() < 2.0**63)
+        result[in_int_range] = values[in_int_range].astype("int64").astype(str)
+        result[values.isna()] = ""
+        for i in np.flatnonzero(integral & ~in_int_range):
+            result.iloc[int(i)] = _canonical_float(values.iloc[int(i)])
+        return result.tolist()
+    return [canonical_value(v) for v in column.tolist()]
+
+
+def canonical_rows(df: pd.DataFrame, columns: list[str]) -> list[Row]:
+    """Returns the rows of the columns as tuples of canonical values."""
+    return list(zip(*(canonical_column(df[c]) for c in columns)))
+
+
+def value_kind(column: pd.Series) -> Optional[str]:
+    """Returns the kind of the values in the column, None if it has no values."""
+    inferred = infer_dtype(column, skipna=True)
+    if inferred == "empty":
+        return None
+    return VALUE_KINDS.get(inferred, "string")
+
+
+def typed_column(values: pd.Series, kinds: set[str]) -> pd.Series:
+    """
+    Converts the canonical values of a column in the diff back into numbers,
+    booleans or dates, if all values on both sides were of this kind.
+    Other columns are kept as strings.
+    """
+    try:
+        if kinds == {"number"}:
+            return pd.to_numeric(values)
+        if kinds == {"bool"}:
+            return values.map({"True": True, "False": False}, na_action="ignore")
+        if kinds == {"date"}:
+            return pd.to_datetime(values, format=DATE_FORMAT)
+    except (ValueError, TypeError):
+        # e.g. dates that are out of bounds for Timestamp
+        pass
+    return values
+
+
+class SortedRuns:
+    """
+    Sorts rows that don't fit into memory. Each batch of rows is sorted
+    and written into its own run file, iterating merges the sorted runs.
+    Only a block of rows of each run is in memory at once.
+    """
+
+    def __init__(self, directory: Path, name: str) -> None:
+        self.directory = directory
+        self.name = name
+        self.row_count = 0
+        self._runs: list[Path] = []
+        self._run_count = 0
+
+    def _write_run(self, rows: Iterable[Row]) -> Path:
+        run_path = self.directory / f"{self.name}_{self._run_count}.run"
+        self._run_count += 1
+        with run_path.open("wb") as f:
+            block: list[Row] = []
+            for row in rows:
+                block.append(row)
+                if len(block) == RUN_BLOCK_SIZE:
+                    pickle.dump(block, f, protocol=pickle.HIGHEST_PROTOCOL)
+                    block = []
+            if block:
+                pickle.dump(block, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return run_path
+
+    @staticmethod
+    def _read_run(run_path: Path) -> Iterator[Row]:
+        with run_path.open("rb") as f:
+            while True:
+                try:
+                    block: list[Row] = pickle.load(f)
+                except EOFError:
+                    break
+                yield from block
+        run_path.unlink()
+
+    def add(self, rows: list[Row]):
+        """Sorts the rows and writes them into a new run."""
+        rows.sort()
+        self.row_count += len(rows)
+        self._runs.append(self._write_run(rows))
+
+    def __iter__(self) -> Iterator[Row]:
+        runs = self._runs
+        self._runs = []
+        # merges the runs in several passes, so not too many files are open
+        while len(runs) > MAX_OPEN_RUNS:
+            merged: list[Path] = []
+            for i in range(0, len(runs), MAX_OPEN_RUNS):
+                group = [self._read_run(r) for r in runs[i : i + MAX_OPEN_RUNS]]
+                merged.append(self._write_run(heapq.merge(*group)))
+            runs = merged
+        return heapq.merge(*(self._read_run(r) for r in runs))
+
+
+@dataclass
+class SortMergeDiff:
+    """Result of comparing two sorted sides row by row."""
+
+    diff: pd.DataFrame
+    """Rows that are only on one side, with the _merge column like pandas.merge."""
+    left_row_count: int
+    right_row_count: int
+
+
+def _diff_rows(left: Iterator[Row], right: Iterator[Row]) -> Iterator[tuple[Row, str]]:
+    """
+    Joins the sorted rows. Equal rows are grouped: a group is only different
+    if the other side has no equal row. All rows of the group are returned then,
+    like pandas.merge returns all duplicates.
+    """
+    left_groups, right_groups = groupby(left), groupby(right)
+    left_group, right_group = next(left_groups, None), next(right_groups, None)
+    while left_group is not None or right_group is not None:
+        if right_group is None or (
+            left_group is not None and left_group[0] < right_group[0]
+        ):
+            assert left_group is not None
+            yield from ((row, "left_only") for row in left_group[1])
+            left_group = next(left_groups, None)
+        elif left_group is None or right_group[0] < left_group[0]:
+            yield from ((row, "right_only") for row in right_group[1])
+            right_group = next(right_groups, None)
+        else:
+            left_group, right_group = next(left_groups, None), next(right_groups, None)
+
+
+def _first_chunk(
+    chunks: Iterator[pd.DataFrame],
+) -> tuple[Optional[pd.DataFrame], Iterator[pd.DataFrame]]:
+    first = next(chunks, None)
+    if first is None:
+        return None, chunks
+    return first, chain([first], chunks)
+
+
+def sort_merge_diff(
+    left_chunks: Iterator[pd.DataFrame], right_chunks: Iterator[pd.DataFrame]
+) -> SortMergeDiff:
+    """
+    Compares two results that are given in chunks, without keeping them in memory.
+    The rows of both sides are sorted on disk and joined on all common columns,
+    like pandas.merge with indicator=True. Values are compared by canonical_value
+    and converted back into numbers, booleans or dates in the diff.
+    """
+    left_first, left_chunks = _first_chunk(left_chunks)
+    right_first, right_chunks = _first_chunk(right_chunks)
+    left_columns = [] if left_first is None else [str(c) for c in left_first.columns]
+    right_columns = [] if right_first is None else [str(c) for c in right_first.columns]
+    columns = [c for c in left_columns if c in right_columns]
+    if not (pd.Index(left_columns).is_unique and pd.Index(right_columns).is_unique):
+        # like pandas.merge
+        raise pd.errors.MergeError(
+            f"Data columns not unique: {pd.Index(columns).unique()!r}"
+        )
+    if not columns:
+        raise pd.errors.MergeError(
+            "No common columns to perform merge on. "
+            f"Merge options: left_on={left_columns}, right_on={right_columns}"
+        )
+
+    kinds: dict[str, set[str]] = {c: set() for c in columns}
+    with TemporaryDirectory(prefix="data_check_") as tmp_dir:
+        left = SortedRuns(Path(tmp_dir), "left")
+        right = SortedRuns(Path(tmp_dir), "right")
+        for runs, side_chunks in ((left, left_chunks), (right, right_chunks)):
+            for chunk in side_chunks:
+                runs.add(canonical_rows(chunk, columns))
+                for c in columns:
+                    kind = value_kind(chunk[c])
+                    if kind is not None:
+                        kinds[c].add(kind)
+        diff_rows = list(_diff_rows(iter(left), iter(right)))
+
+    diff = pd.DataFrame(
+        [row for row, _ in diff_rows], columns=pd.Index(columns, dtype=object)
+    )
+    diff = diff.astype(object).replace("", pd.NA)
+    for c in columns:
+        diff[c] = typed_column(diff[c], kinds[c])
+    diff["_merge"] = pd.Categorical(
+        [merge for _, merge in diff_rows], categories=MERGE_CATEGORIES
+    )
+    return SortMergeDiff(diff, left.row_count, right.row_count)
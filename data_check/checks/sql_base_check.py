@@ -4,12 +4,30 @@ from typing import Union, cast
 
 import numpy as np
 import pandas as pd
+from pandas.api.types import infer_dtype, is_object_dtype
 
 from data_check.sql.query_result import QueryResult
 
 from ..file_ops import read_sql_file
 from ..result import DataCheckResult, ResultType
 from .base_check import BaseCheck
+from .partitioned_merge import partitioned_merge
+
+# kinds of infer_dtype for columns that contain only str, int or float values
+STRING_KINDS = {"string", "empty"}
+NUMERIC_KINDS = {"integer", "floating", "mixed-integer-float", "empty"}
+# kinds that can contain str mixed with int or float
+MIXED_KINDS = {"mixed-integer", "mixed"}
+# types that are converted to str if they are mixed
+MIXED_TYPES = ({str, int}, {str, float}, {str, int, float})
+# types of the values in object columns of the kinds of infer_dtype
+KIND_TYPES: dict[str, set[type]] = {
+    "string": {str},
+    "integer": {int},
+    "floating": {float},
+    "mixed-integer-float": {int, float},
+    "empty": set(),
+}
 
 
 class SQLBaseCheck(BaseCheck):
@@ -20,6 +38,12 @@ class SQLBaseCheck(BaseCheck):
     def get_sql_result(self) -> Union[DataCheckResult, QueryResult]:
         return self.read_sql_file(sql_file=self.check_path)
 
+    def get_query(self) -> str:
+        """Returns the query of the check."""
+        return read_sql_file(
+            sql_file=self.check_path, template_data=self.data_check.template_data
+        )
+
     def read_sql_file(self, sql_file: Path) -> Union[DataCheckResult, QueryResult]:
         try:
             query = read_sql_file(
@@ -35,15 +59,20 @@ class SQLBaseCheck(BaseCheck):
 
     @staticmethod
     def merge_results(
-        sql_result: pd.DataFrame, expect_result: pd.DataFrame
+        sql_result: pd.DataFrame, expect_result: pd.DataFrame, partitions: int = 1
     ) -> pd.DataFrame:
         """
         Merges the results of a SQL query and the expected results.
+        Large results are merged in the given number of partitions concurrently.
         Returns the merged DataFrame.
         """
         SQLBaseCheck.convert_mixed_object_columns(sql_result, expect_result)
         SQLBaseCheck.convert_mixed_tzinfo_columns(sql_result, expect_result)
 
+        df_partitioned = partitioned_merge(sql_result, expect_result, partitions)
+        if df_partitioned is not None:
+            return df_partitioned
+
         try:
             df_merged = sql_result.merge(expect_result, indicator=True, how="outer")
         except pd.errors.MergeError as e:
@@ -61,6 +90,40 @@ class SQLBaseCheck(BaseCheck):
             df_merged = sql_result.merge(expect_result, indicator=True, how="outer")
         return df_merged
 
+    @staticmethod
+    def value_types(col: pd.Series) -> set[type]:
+        """
+        Returns the types of the values in the column. For typed columns,
+        only the type of the first value is returned, it is never str.
+        """
+        if isinstance(col.dtype, pd.StringDtype):
+            return {str, type(pd.NA)} if col.hasnans else {str}
+        if not is_object_dtype(col.dtype):
+            return {type(el) for el in col.array[:1]}
+        values = col.to_numpy()
+        missing = pd.isna(values)
+        kind = infer_dtype(values, skipna=True)
+        if kind in KIND_TYPES:
+            types = set(KIND_TYPES[kind])
+        else:
+            types = set(pd.unique(col[~missing].map(type)))
+        if missing.any():
+            # missing values can be None, NaN, NaT or pd.NA
+            types.update(pd.unique(col[missing].map(type)))
+        return types
+
+    @staticmethod
+    def is_mixed_column(col_1: pd.Series, col_2: pd.Series) -> bool:
+        """Returns whether both columns together contain str mixed with int or float."""
+        kinds = {infer_dtype(col_1, skipna=False), infer_dtype(col_2, skipna=False)}
+        # only str or only numbers are not mixed, other kinds contain other types
+        if kinds <= STRING_KINDS or kinds <= NUMERIC_KINDS:
+            return False
+        if not kinds <= STRING_KINDS | NUMERIC_KINDS | MIXED_KINDS:
+            return False
+        both_types = SQLBaseCheck.value_types(col_1) | SQLBaseCheck.value_types(col_2)
+        return both_types in MIXED_TYPES
+
     @staticmethod
     def convert_mixed_object_columns(df_1: pd.DataFrame, df_2: pd.DataFrame):
         # If we have object columns, convert them to string
@@ -68,19 +131,15 @@ class SQLBaseCheck(BaseCheck):
         object_columns = set(df_1.columns[df_1.dtypes == "object"])
         object_columns.update(set(df_2.columns[df_2.dtypes == "object"]))
         for o_col in object_columns:
-            if o_col in df_1.columns and o_col in df_2.columns:
-                df_1_types = {type(el) for el in df_1[o_col].array}
-                df_2_types = {type(el) for el in df_2[o_col].array}
-                both_types = df_1_types.union(df_2_types)
-                if both_types in (
-                    {str, int},
-                    {str, float},
-                    {str, int, float},
-                ):
-                    # convert only if str is mixed with a numeric type
-                    df_1[o_col], df_2[o_col] = SQLBaseCheck.convert_dtypes(
-                        df_1[o_col], df_2[o_col]
-                    )
+            if (
+                o_col in df_1.columns
+                and o_col in df_2.columns
+                and SQLBaseCheck.is_mixed_column(df_1[o_col], df_2[o_col])
+            ):
+                # convert only if str is mixed with a numeric type
+                df_1[o_col], df_2[o_col] = SQLBaseCheck.convert_dtypes(
+                    df_1[o_col], df_2[o_col]
+                )
 
     @staticmethod
     def convert_dtypes(
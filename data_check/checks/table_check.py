@@ -3,11 +3,15 @@ from __future__ import annotations
 from pathlib import Path
 from typing import TYPE_CHECKING, Union, cast
 
+import pandas as pd
+
 from data_check.sql.query_result import QueryResult
 
+from ..file_ops import file_stem, is_csv_file, replace_suffix
 from ..result import DataCheckResult, ResultType
 from .csv_check import CSVCheck
 from .excel_check import ExcelCheck
+from .parquet_check import ParquetCheck
 from .sql_base_check import SQLBaseCheck
 
 if TYPE_CHECKING:
@@ -17,34 +21,48 @@ if TYPE_CHECKING:
 class TableCheck(SQLBaseCheck):
     def __init__(self, data_check: DataCheck, check_path: Path) -> None:
         super().__init__(data_check, check_path)
-        self.check_path_sql = self.check_path.with_suffix(".sql")
+        self.check_path_sql = replace_suffix(self.check_path, ".sql")
         self.check_instance = self.get_check_instance()
         self.check_instance.get_sql_result = self.get_sql_result  # type: ignore
+        self.check_instance.get_query = self.get_query  # type: ignore
 
     @staticmethod
     def is_check_path(path: Path):
         return (
-            path.suffix.lower() in (".csv", ".xlsx")
-            and not path.with_suffix(".sql").exists()
-        )
+            is_csv_file(path) or path.suffix.lower() in (".xlsx", ".parquet")
+        ) and not replace_suffix(path, ".sql").exists()
 
-    def get_check_instance(self) -> Union[CSVCheck, ExcelCheck]:
-        if self.check_path.suffix.lower() == ".csv":
+    def get_check_instance(self) -> Union[CSVCheck, ExcelCheck, ParquetCheck]:
+        if is_csv_file(self.check_path):
             return CSVCheck(self.data_check, self.check_path_sql)
         elif self.check_path.suffix.lower() == ".xlsx":
             return ExcelCheck(self.data_check, self.check_path_sql)
+        elif self.check_path.suffix.lower() == ".parquet":
+            return ParquetCheck(self.data_check, self.check_path_sql)
         else:
             raise Exception(f"unsupported table check file: {self.check_path}")
 
-    def get_sql_result(self) -> Union[DataCheckResult, QueryResult]:
-        expect_result = self.check_instance.read_expect_file(
+    def _read_expect_file(self) -> Union[DataCheckResult, pd.DataFrame]:
+        return self.check_instance.read_expect_file(
             self.check_instance.get_expect_file(self.check_path_sql), string_columns=[]
         )
+
+    def _query_for_columns(self, expect_result: pd.DataFrame) -> str:
+        column_list: list[str] = cast(list[str], expect_result.columns.tolist())
+        table_name = file_stem(self.check_path)
+        return f"select {','.join(column_list)} from {table_name}"
+
+    def get_query(self) -> str:
+        expect_result = self._read_expect_file()
+        if isinstance(expect_result, DataCheckResult):
+            raise cast(Exception, expect_result.exception)
+        return self._query_for_columns(expect_result)
+
+    def get_sql_result(self) -> Union[DataCheckResult, QueryResult]:
+        expect_result = self._read_expect_file()
         if isinstance(expect_result, DataCheckResult):
             return expect_result
-        column_list: list[str] = cast(list[str], expect_result.columns.tolist())
-        table_name = self.check_path.stem
-        query = f"select {','.join(column_list)} from {table_name}"
+        query = self._query_for_columns(expect_result)
         try:
             return self.data_check.sql.run_query_with_result(
                 query, params=self.data_check.sql_params
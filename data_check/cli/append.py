@@ -16,6 +16,11 @@ from .load import load_cmd
     type=str,
     help="table name to load data into",
 )
+@click.option(
+    "--refresh-metadata",
+    is_flag=True,
+    help="reflect the tables again instead of using the metadata cache",
+)
 @click.argument("files", nargs=-1, type=click.Path())
 @click.pass_context
 def append(  # noqa: PLR0913
@@ -30,6 +35,7 @@ def append(  # noqa: PLR0913
     log: Optional[Union[str, Path]] = None,
     table: Optional[str] = None,
     files: Optional[list[Union[str, Path]]] = None,
+    refresh_metadata: bool = False,
 ):
     """Append data from files into tables."""
     if files is None:
@@ -47,4 +53,5 @@ def append(  # noqa: PLR0913
         table,
         mode="append",
         files=files,
+        refresh_metadata=refresh_metadata,
     )
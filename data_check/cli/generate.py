@@ -4,6 +4,7 @@ from typing import Optional, Union
 import click
 
 from data_check.config import DataCheckConfig
+from data_check.file_ops import CSV_SUFFIXES
 
 from .common import common_options, get_data_check
 
@@ -15,6 +16,15 @@ from .common import common_options, get_data_check
     is_flag=True,
     help="overwrite existing files",
 )
+@click.option(
+    "--format",
+    "generate_format",
+    type=click.Choice(
+        [s.lstrip(".") for s in CSV_SUFFIXES] + ["parquet"], case_sensitive=False
+    ),
+    default="csv",
+    help="file format of new expectation files; default: csv",
+)
 @click.argument("files", nargs=-1, type=click.Path())
 @click.pass_context
 def gen(  # noqa: PLR0913
@@ -28,9 +38,10 @@ def gen(  # noqa: PLR0913
     quiet: bool = False,
     log: Optional[Union[str, Path]] = None,
     force: bool = False,
+    generate_format: str = "csv",
     files: Optional[list[Union[str, Path]]] = None,
 ):
-    """Generate CSV files from query files."""
+    """Generate CSV, compressed CSV or Parquet files from query files."""
     if files is None:
         files = []
     dc = get_data_check(
@@ -47,6 +58,7 @@ def gen(  # noqa: PLR0913
 
     dc.config.generate_mode = True
     dc.config.force = force
+    dc.config.generate_format = generate_format.lower()
 
     if not files:
         files = [dc.config.checks_path]  # use default checks path if nothing is given
@@ -21,6 +21,7 @@ def load_cmd(  # noqa: PLR0913
     table: Optional[str] = None,
     mode: str = "truncate",
     files: Optional[list[Union[str, Path]]] = None,
+    refresh_metadata: bool = False,
 ):
     if files is None:
         files = []
@@ -35,6 +36,8 @@ def load_cmd(  # noqa: PLR0913
         quiet=quiet,
         log=log,
     )
+    if refresh_metadata:
+        dc.sql.metadata.clear()
 
     if table:
         if len(files) != 1:
@@ -69,6 +72,11 @@ def load_cmd(  # noqa: PLR0913
     default="truncate",
     help="how to load the table: truncate (default), append, replace or upsert",
 )
+@click.option(
+    "--refresh-metadata",
+    is_flag=True,
+    help="reflect the tables again instead of using the metadata cache",
+)
 @click.argument("files", nargs=-1, type=click.Path())
 @click.pass_context
 def load(  # noqa: PLR0913
@@ -84,6 +92,7 @@ def load(  # noqa: PLR0913
     table: Optional[str] = None,
     mode: str = "truncate",
     files: Optional[list[Union[str, Path]]] = None,
+    refresh_metadata: bool = False,
 ):
     """Load data from files into tables."""
     if files is None:
@@ -101,4 +110,5 @@ def load(  # noqa: PLR0913
         table,
         mode,
         files,
+        refresh_metadata,
     )
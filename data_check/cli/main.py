@@ -13,6 +13,7 @@ from .fake import fake
 from .generate import gen
 from .init import init
 from .load import load
+from .merge import merge
 from .ping import ping
 from .run import run
 from .sql import sql
@@ -54,3 +55,4 @@ cli.add_command(load)
 cli.add_command(append)
 cli.add_command(fake)
 cli.add_command(init)
+cli.add_command(merge)
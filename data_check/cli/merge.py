@@ -0,0 +1,67 @@
+from pathlib import Path
+from typing import Optional, Union
+
+import click
+import colorama
+
+from data_check.config import DataCheckConfig
+from data_check.durations import CheckDurations
+from data_check.exceptions import DataCheckError
+from data_check.output import DataCheckOutput
+from data_check.result import DataCheckResult
+from data_check.shard import read_result_durations, read_result_file
+
+
+def _durations_path(durations_file: Optional[Union[str, Path]]) -> Optional[Path]:
+    # without an explicit file, the durations file of the project is used
+    if durations_file:
+        return Path(durations_file)
+    try:
+        return DataCheckConfig().load_config().durations_path
+    except FileNotFoundError:
+        return None
+
+
+@click.command()
+@click.option("--quiet", is_flag=True, help="do not print any output")
+@click.option(
+    "--durations-file",
+    type=click.Path(),
+    help="merge the durations into this file instead of the project's durations",
+)
+@click.argument("files", nargs=-1, type=click.Path())
+@click.pass_context
+def merge(
+    ctx: click.Context,
+    quiet: bool = False,
+    durations_file: Optional[Union[str, Path]] = None,
+    files: Optional[list[Union[str, Path]]] = None,
+):
+    """Merge result files from 'run --result-file' into one summary."""
+    colorama.init()
+    if not files:
+        click.echo(merge.get_help(ctx))
+        ctx.exit(0)
+    output = DataCheckOutput()
+    output.configure_output(
+        verbose=False, traceback=False, quiet=quiet, printer=click.echo
+    )
+    results: list[DataCheckResult] = []
+    durations: dict[str, float] = {}
+    try:
+        for f in files:
+            results.extend(read_result_file(Path(f), output))
+            durations.update(read_result_durations(Path(f)))
+    except DataCheckError as e:
+        click.echo(e)
+        ctx.exit(1)
+    durations_path = _durations_path(durations_file)
+    if durations_path is not None:
+        check_durations = CheckDurations(durations_path, durations_path.parent)
+        check_durations.add(durations)
+        check_durations.save()
+    for result in sorted(results, key=lambda r: str(r.source)):
+        output.print(result)
+    output.pprint_result_summary(results)
+    if not all(results):
+        ctx.exit(1)
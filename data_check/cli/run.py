@@ -4,6 +4,8 @@ from typing import Optional, Union
 import click
 
 from data_check.config import DataCheckConfig
+from data_check.exceptions import DataCheckError
+from data_check.shard import select_shard, write_result_file
 
 from .common import common_options, get_data_check
 
@@ -32,6 +34,26 @@ from .common import common_options, get_data_check
     is_flag=True,
     help="print only the different columns for failed results",
 )
+@click.option(
+    "--shard",
+    type=str,
+    help="run only shard i of n (e.g. 3/8), partitioned by the hash of the paths",
+)
+@click.option(
+    "--shard-durations",
+    type=click.Path(),
+    help="balance the shards by the durations in this file, the same on all nodes",
+)
+@click.option(
+    "--result-file",
+    type=click.Path(),
+    help="write the results to a JSON file that can be merged with 'merge'",
+)
+@click.option(
+    "--refresh-metadata",
+    is_flag=True,
+    help="reflect the tables again instead of using the metadata cache",
+)
 @click.argument("files", nargs=-1, type=click.Path())
 @click.pass_context
 def run(  # noqa: PLR0913
@@ -48,7 +70,11 @@ def run(  # noqa: PLR0913
     print_format: str = DataCheckConfig.default_print_format,
     print_json: bool = False,
     print_diffed: bool = False,
+    shard: Optional[str] = None,
+    shard_durations: Optional[Union[str, Path]] = None,
+    result_file: Optional[Union[str, Path]] = None,
     files: Optional[list[Union[str, Path]]] = None,
+    refresh_metadata: bool = False,
 ):
     """Run checks (default command)."""
     if files is None:
@@ -64,6 +90,8 @@ def run(  # noqa: PLR0913
         quiet=quiet,
         log=log,
     )
+    if refresh_metadata:
+        dc.sql.metadata.clear()
 
     if print_json:
         print_failed = True
@@ -83,9 +111,31 @@ def run(  # noqa: PLR0913
     path_list = [Path(f) for f in files]
 
     all_checks = dc.collect_checks(path_list)
+    if shard:
+        try:
+            all_checks = select_shard(
+                all_checks,
+                shard,
+                dc.config.project_path,
+                Path(shard_durations) if shard_durations else None,
+            )
+        except DataCheckError as e:
+            click.echo(e)
+            ctx.exit(1)
     result = dc.run_checks(all_checks)
+    # saved once, the nested runs of pipelines only update the durations
+    dc.check_durations.save()
+    if result_file:
+        write_result_file(
+            Path(result_file),
+            result,
+            shard=shard,
+            durations=dc.check_durations.of_checks(all_checks),
+        )
     overall_result = dc.get_overall_result(
         result, print_overall=False, print_summary=True
     )
+    if dc.output.verbose:
+        dc.output.pprint_pool_statistics(dc.sql.pool_statistics.as_dict())
     if not overall_result:
         ctx.exit(1)
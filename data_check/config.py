@@ -11,6 +11,18 @@ from .file_ops import read_yaml
 TEMPLATE_FILE = "template.yml"
 CHECKS_PATH = "checks"
 LOOKUPS_PATH = "lookups"
+# folder in the project for the durations and the caches
+CACHE_PATH = ".data_check"
+DURATIONS_FILE = "durations.json"
+FINGERPRINTS_PATH = "fingerprints"
+METADATA_PATH = "metadata"
+EXPECTATIONS_PATH = "expectations"
+# maximum size of the expectation cache in MB
+EXPECTATION_CACHE_SIZE = 1024
+LOAD_CHUNK_SIZE = 100000
+SORT_MERGE_CHUNK_SIZE = 100000
+# counts of the shape check must differ by this factor to fail the check early
+SHAPE_CHECK_RATIO = 10
 
 
 class DataCheckConfig:
@@ -36,6 +48,7 @@ class DataCheckConfig:
         self.base_path = Path().absolute()
 
         self.generate_mode = False
+        self.generate_format = "csv"
         self.force = False
         self.log_path: Optional[Path] = None
 
@@ -65,6 +78,102 @@ class DataCheckConfig:
     def lookups_path(self) -> Path:
         return self.project_path / LOOKUPS_PATH
 
+    @property
+    def cache_path(self) -> Path:
+        """Folder to store the durations and the caches of the project."""
+        return self.project_path / CACHE_PATH
+
+    @property
+    def durations_path(self) -> Path:
+        """File to store the durations of the checks from previous runs."""
+        if "durations_file" not in self.config:
+            return self.cache_path / DURATIONS_FILE
+        durations_path = Path(self.config["durations_file"])
+        if not durations_path.is_absolute():
+            durations_path = self.project_path / durations_path
+        return durations_path
+
+    @property
+    def fingerprint_check(self) -> bool:
+        """Compare the fingerprints of the results before fetching them."""
+        return bool(self.config.get("fingerprint_check", False))
+
+    @property
+    def fingerprints_path(self) -> Path:
+        """Folder to cache the fingerprints of the expectation files."""
+        return self.cache_path / FINGERPRINTS_PATH
+
+    @property
+    def expectation_cache_path(self) -> Path:
+        """Folder to cache the parsed expectation files."""
+        return self.cache_path / EXPECTATIONS_PATH
+
+    @property
+    def expectation_cache_size(self) -> int:
+        """Maximum size of the expectation cache in bytes, 0 disables the cache."""
+        size_mb = float(
+            self.config.get("expectation_cache_size", EXPECTATION_CACHE_SIZE)
+        )
+        return int(size_mb * 1024 * 1024)
+
+    @property
+    def metadata_cache(self) -> bool:
+        """Cache the reflected metadata of the tables, also for the next runs."""
+        return bool(self.config.get("metadata_cache", False))
+
+    @property
+    def metadata_path(self) -> Path:
+        """Folder to cache the reflected metadata of the tables."""
+        return self.cache_path / METADATA_PATH
+
+    @property
+    def load_chunk_size(self) -> int:
+        """Number of rows of a CSV file that are read and loaded at once."""
+        return int(self.config.get("load_chunk_size", LOAD_CHUNK_SIZE))
+
+    @property
+    def load_partitions(self) -> int:
+        """Number of partitions of a CSV file that are loaded concurrently."""
+        return int(self.config.get("load_partitions", 1))
+
+    @property
+    def compare_partitions(self) -> int:
+        """Number of processes that compare the partitions of a large check."""
+        return int(self.config.get("compare_partitions", 1))
+
+    @property
+    def comparison_backend(self) -> str:
+        """Returns the backend that compares the results of CSV checks."""
+        return str(self.config.get("comparison_backend", "pandas"))
+
+    @property
+    def shape_check(self) -> str:
+        """Returns the shape check mode for checks that don't declare their own."""
+        shape_check = self.config.get("shape_check", "off")
+        if isinstance(shape_check, bool):
+            # YAML reads off and on as booleans
+            return "rows" if shape_check else "off"
+        return str(shape_check)
+
+    @property
+    def shape_check_ratio(self) -> float:
+        return float(self.config.get("shape_check_ratio", SHAPE_CHECK_RATIO))
+
+    @property
+    def server_side_diff(self) -> bool:
+        """Compare the results of CSV checks inside the database, if supported."""
+        return bool(self.config.get("server_side_diff", False))
+
+    @property
+    def sort_merge_diff(self) -> bool:
+        """Compare the results of CSV checks in sorted chunks on disk."""
+        return bool(self.config.get("sort_merge_diff", False))
+
+    @property
+    def sort_merge_chunk_size(self) -> int:
+        """Number of rows of each side that are sorted in memory at once."""
+        return int(self.config.get("sort_merge_chunk_size", SORT_MERGE_CHUNK_SIZE))
+
     def find_config(self, base_path: Path) -> Path:
         abs_base_path = base_path.absolute()
         config_path = abs_base_path / self.config_path
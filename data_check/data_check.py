@@ -1,5 +1,6 @@
 from functools import partial
 from pathlib import Path
+from time import perf_counter
 from typing import Any, Optional, Union, cast
 
 from data_check.checks.base_check import BaseCheck
@@ -9,17 +10,21 @@ from .checks import (
     DataCheckGenerator,
     EmptySetCheck,
     ExcelCheck,
+    ParquetCheck,
     PathNotExists,
     PipelineCheck,
     TableCheck,
 )
 from .config import DataCheckConfig
+from .durations import CheckDurations
 from .exceptions import ValidationError
+from .expectation_cache import ExpectationCache
 from .file_ops import expand_files, parse_template, read_sql_file, read_yaml
 from .output import DataCheckOutput
 from .result import DataCheckResult
 from .runner import DataCheckRunner
 from .sql import get_sql
+from .sql.fingerprint import FingerprintCache
 from .utils.lookup_loader import load_lookups_from_path
 
 
@@ -46,8 +51,16 @@ class DataCheck:
         )
         self.template_data: dict[str, Any] = {}
         self.lookup_data: dict[str, Any] = {}
+        self.check_durations = CheckDurations(
+            config.durations_path, config.project_path, lock=self.runner.lock
+        )
+        self.fingerprint_cache = FingerprintCache(config.fingerprints_path)
+        self.expectation_cache = ExpectationCache(
+            config.expectation_cache_path, config.expectation_cache_size
+        )
 
     def __del__(self):
+        self.runner.shutdown(wait=False)
         self.sql.disconnect()
 
     @property
@@ -61,7 +74,9 @@ class DataCheck:
     def delegate_test(
         self, check: BaseCheck, do_cleanup: bool = True
     ) -> DataCheckResult:
+        start = perf_counter()
         result = check.run_test()
+        result.duration = perf_counter() - start
         if do_cleanup:
             check.cleanup()
             del check
@@ -82,6 +97,9 @@ class DataCheck:
             check = EmptySetCheck(self, check_path)
         elif ExcelCheck.is_check_path(check_path):
             check = ExcelCheck(self, check_path)
+        elif ParquetCheck.is_check_path(check_path):
+            parquet_check = ParquetCheck(self, check_path)
+            check = self._get_check_or_generator(check_path, parquet_check)
         elif CSVCheck.is_check_path(check_path):
             csv_check = CSVCheck(self, check_path)
             check = self._get_check_or_generator(check_path, csv_check)
@@ -142,8 +160,13 @@ class DataCheck:
             )
             self.output.print(result)
             return [result]
+        if self.runner.workers > 1:
+            # Run the longest checks first, so they don't delay the end of the run.
+            all_checks = self.check_durations.longest_first(all_checks)
         delegate = partial(self.delegate_test, do_cleanup=do_cleanup)
         results = self.runner.run_checks(delegate, all_checks)
+        if len(results) == len(all_checks):
+            self.check_durations.update(all_checks, results)
         return results
 
     def get_overall_result(
@@ -1,4 +1,6 @@
+from collections.abc import Iterable
 from contextlib import suppress
+from typing import Optional
 
 import pandas as pd
 
@@ -9,19 +11,23 @@ def is_possible_date_column(column: pd.Series) -> bool:
     """For a column to be a possible date it must have some non-empty values
     that are at least 10 characters long.
     """
-    not_null = column.dropna()
-    non_empty = not_null[not_null.astype(str).str.len() > 0]
-    min_len_10 = non_empty[non_empty.astype(str).str.len() >= DATE_STRING_LENGTH]
-    return len(min_len_10) > 0
+    lengths = column.dropna().astype(str).str.len()
+    return bool((lengths >= DATE_STRING_LENGTH).any())
 
 
-def parse_date_columns(df: pd.DataFrame) -> tuple[list[str], pd.DataFrame]:
+def parse_date_columns(
+    df: pd.DataFrame, columns: Optional[Iterable[str]] = None
+) -> tuple[list[str], pd.DataFrame]:
     """Tries to parse each column as a date.
+    If columns is given, only these columns are tried.
     Returns a tuple with the list of the column names that were parsed as dates
     and the DataFrame with these columns replaced as Timestamp.
     """
+    candidates = None if columns is None else set(columns)
     _date_columns: list[str] = []
     for column_name, column in df.items():
+        if candidates is not None and column_name not in candidates:
+            continue
         if is_possible_date_column(column):
             try:
                 _col = pd.to_datetime(column, errors="raise", format="ISO8601")
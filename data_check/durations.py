@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from contextlib import suppress
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from .checks.base_check import BaseCheck
+    from .result import DataCheckResult
+
+
+class CheckDurations:
+    """
+    Durations of the checks from previous runs, stored in a JSON file.
+    The checks are identified by their path relative to the project path.
+    The durations are guarded by the given lock, e.g. the lock of the runner that
+    runs the checks concurrently.
+    """
+
+    def __init__(
+        self,
+        durations_path: Path,
+        project_path: Path,
+        lock: Optional[threading.Lock] = None,
+    ) -> None:
+        self.durations_path = durations_path
+        self.project_path = project_path
+        self._durations: Optional[dict[str, float]] = None
+        self._lock = lock or threading.Lock()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict[str, float]:
+        try:
+            data = json.loads(self.durations_path.read_text(encoding="UTF-8"))
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        return {str(k): float(v) for k, v in data.items()}
+
+    def _loaded(self) -> dict[str, float]:
+        # must be called with the lock held
+        if self._durations is None:
+            self._durations = self._load()
+        return self._durations
+
+    @property
+    def durations(self) -> dict[str, float]:
+        with self._lock:
+            return self._loaded()
+
+    @staticmethod
+    def relative_key(check_path: Path, project_path: Path) -> str:
+        try:
+            return check_path.absolute().relative_to(project_path).as_posix()
+        except ValueError:
+            return check_path.absolute().as_posix()
+
+    def key(self, check_path: Path) -> str:
+        return self.relative_key(check_path, self.project_path)
+
+    def get(self, check_path: Path) -> Optional[float]:
+        key = self.key(check_path)
+        with self._lock:
+            return self._loaded().get(key)
+
+    def longest_first(self, checks: list[BaseCheck]) -> list[BaseCheck]:
+        """
+        Returns the checks ordered by their expected duration, longest first.
+        Checks without a known duration might be long, so they are run first.
+        The order of checks with the same duration is kept.
+        """
+
+        def sort_key(check: BaseCheck) -> tuple[bool, float]:
+            duration = self.get(check.check_path)
+            if duration is None:
+                return (False, 0.0)
+            return (True, -duration)
+
+        return sorted(checks, key=sort_key)
+
+    def update(self, checks: list[BaseCheck], results: list[DataCheckResult]):
+        with self._lock:
+            durations = self._loaded()
+            for check, result in zip(checks, results):
+                if result.duration is not None:
+                    durations[self.key(check.check_path)] = result.duration
+
+    def of_checks(self, checks: list[BaseCheck]) -> dict[str, float]:
+        """Returns the known durations of the given checks."""
+        keys = [self.key(check.check_path) for check in checks]
+        with self._lock:
+            durations = self._loaded()
+            return {k: durations[k] for k in keys if k in durations}
+
+    def add(self, durations: dict[str, float]):
+        """Adds durations, e.g. from the result files of other nodes."""
+        with self._lock:
+            self._loaded().update(durations)
+
+    def save(self):
+        """Writes the durations to the file. Errors while writing are ignored,
+        as the durations are only used to optimize the order of the checks.
+        """
+        with self._lock:
+            if self._durations is None:
+                return
+            data = json.dumps(self._durations, indent=2, sort_keys=True)
+            with suppress(OSError):
+                self.durations_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.durations_path.with_name(
+                    f"{self.durations_path.name}.{os.getpid()}.tmp"
+                )
+                tmp_path.write_text(data, encoding="UTF-8")
+                tmp_path.replace(self.durations_path)
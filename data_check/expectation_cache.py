@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from contextlib import suppress
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import pandas as pd
+from pandas.api.types import is_object_dtype
+
+# incremented when the format of the cached DataFrames changes
+CACHE_VERSION = 1
+# size of the blocks that are read to hash a file
+HASH_BLOCK_SIZE = 1 << 20
+
+
+def _tmp_path(path: Path) -> Path:
+    return path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+class ExpectationCache:
+    """
+    Caches the parsed DataFrames of expectation files as Feather files,
+    so they don't need to be parsed again in the next runs.
+
+    The entries are addressed by the hash of the file content and the options
+    that were used to read the file. The hash of each file is stored together
+    with its size and modification time, so unchanged files are not hashed again.
+    If the cache grows larger than max_size bytes, the least recently used
+    entries are removed. The cache is only used if pyarrow is installed.
+    """
+
+    def __init__(self, cache_path: Path, max_size: int) -> None:
+        self.cache_path = cache_path
+        self.max_size = max_size
+        self.enabled = max_size > 0 and find_spec("pyarrow") is not None
+
+    @property
+    def _data_path(self) -> Path:
+        return self.cache_path / "data"
+
+    @property
+    def _hashes_path(self) -> Path:
+        return self.cache_path / "hashes"
+
+    @staticmethod
+    def _file_state(expect_file: Path) -> dict[str, Any]:
+        stat = expect_file.stat()
+        return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+    def content_hash(self, expect_file: Path) -> str:
+        """Returns the SHA-1 hash of the file, stored until the file is changed."""
+        state = self._file_state(expect_file)
+        path_key = hashlib.sha1(
+            str(expect_file.absolute()).encode("UTF-8"), usedforsecurity=False
+        ).hexdigest()
+        hash_path = self._hashes_path / f"{path_key}.json"
+        with suppress(OSError, ValueError, KeyError, TypeError):
+            entry = json.loads(hash_path.read_text("UTF-8"))
+            if entry["file"] == state:
+                return entry["sha1"]
+        digest = hashlib.sha1(usedforsecurity=False)
+        with expect_file.open("rb") as f:
+            while block := f.read(HASH_BLOCK_SIZE):
+                digest.update(block)
+        content_hash = digest.hexdigest()
+        with suppress(OSError):
+            hash_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = _tmp_path(hash_path)
+            tmp_path.write_text(
+                json.dumps({"file": state, "sha1": content_hash}), encoding="UTF-8"
+            )
+            tmp_path.replace(hash_path)
+        return content_hash
+
+    def _entry_path(self, expect_file: Path, options: dict[str, Any]) -> Path:
+        key = json.dumps(
+            {
+                "version": CACHE_VERSION,
+                "pandas": pd.__version__,
+                "sha1": self.content_hash(expect_file),
+                "suffix": expect_file.suffix.lower(),
+                "options": options,
+            },
+            sort_keys=True,
+        )
+        name = hashlib.sha1(key.encode("UTF-8"), usedforsecurity=False).hexdigest()
+        return self._data_path / f"{name}.feather"
+
+    def read(
+        self,
+        expect_file: Path,
+        read_file: Callable[[], pd.DataFrame],
+        **options: Any,
+    ) -> pd.DataFrame:
+        """
+        Returns the DataFrame of the file from the cache. If it is not cached yet,
+        read_file is called and its result is stored.
+        options are all arguments of read_file that change the DataFrame.
+        """
+        if not self.enabled:
+            return read_file()
+        try:
+            entry_path = self._entry_path(expect_file, options)
+        except OSError:
+            return read_file()
+        df = self._load(entry_path)
+        if df is not None:
+            return df
+        df = read_file()
+        self._store(entry_path, df)
+        return df
+
+    @staticmethod
+    def _load(entry_path: Path) -> Optional[pd.DataFrame]:
+        from pyarrow import feather  # type: ignore
+
+        try:
+            table = feather.read_table(str(entry_path), memory_map=True)
+            df = table.to_pandas()
+            object_columns = json.loads(table.schema.metadata[b"object_columns"])
+        except Exception:
+            return None
+        # the columns are converted into the same types as before they were stored
+        for i in object_columns:
+            df.isetitem(i, df.iloc[:, i].astype(object))
+        # the entry was used, so it is the last one to be evicted
+        with suppress(OSError):
+            os.utime(entry_path)
+        return df
+
+    def _store(self, entry_path: Path, df: pd.DataFrame):
+        """Stores the DataFrame. DataFrames that Arrow cannot convert are skipped."""
+        import pyarrow as pa  # type: ignore
+        from pyarrow import feather  # type: ignore
+
+        object_columns = [
+            i for i, dtype in enumerate(df.dtypes) if is_object_dtype(dtype)
+        ]
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            table = table.replace_schema_metadata(
+                {
+                    **(table.schema.metadata or {}),
+                    b"object_columns": json.dumps(object_columns).encode("UTF-8"),
+                }
+            )
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = _tmp_path(entry_path)
+            feather.write_feather(table, str(tmp_path), compression="uncompressed")
+            tmp_path.replace(entry_path)
+        except (OSError, pa.ArrowException, ValueError, TypeError):
+            return
+        self.evict()
+
+    def evict(self):
+        """Removes the least recently used entries while the cache is too large."""
+        with suppress(OSError):
+            entries = [
+                (stat.st_mtime_ns, stat.st_size, p)
+                for p in self._data_path.glob("*.feather")
+                for stat in [p.stat()]
+            ]
+            total_size = sum(size for _, size, _ in entries)
+            for _, size, entry_path in sorted(entries, key=lambda e: e[0]):
+                if total_size <= self.max_size:
+                    break
+                entry_path.unlink(missing_ok=True)
+                total_size -= size
@@ -1,7 +1,13 @@
 from __future__ import annotations
 
+import bz2
+import gzip
+import io
+import re
+from collections.abc import Iterator
+from importlib.util import find_spec
 from pathlib import Path
-from typing import Any, Optional, Union
+from typing import IO, TYPE_CHECKING, Any, Optional, Union, cast
 
 import pandas as pd
 import yaml
@@ -12,6 +18,51 @@ from pandas.core.frame import DataFrame
 from .date import parse_date_columns
 from .exceptions import DataCheckError
 
+if TYPE_CHECKING:
+    import pyarrow as pa  # type: ignore
+
+# options of pandas.read_csv for all CSV files
+CSV_OPTIONS: dict[str, Any] = {
+    "na_values": [""],  # use empty string as nan
+    "keep_default_na": False,
+    "comment": "#",
+    "escapechar": "\\",
+    "quotechar": '"',
+    "quoting": 0,
+    "engine": "c",
+}
+
+# comment in the header of a SQL file that declares the key columns of the check
+CHECK_OPTION_PATTERN = re.compile(r"^--\s*(\w+)\s*:(.*)$")
+
+# suffixes of CSV files, pandas decompresses the compressed files while reading
+CSV_SUFFIXES = [".csv", ".csv.gz", ".csv.zst", ".csv.bz2"]
+COMPRESSION_SUFFIXES = (".gz", ".zst", ".bz2")
+
+
+def csv_suffix(path: Path) -> str:
+    """Returns the CSV suffix of the file, e.g. ".csv.gz", or "" for other files."""
+    name = path.name.lower()
+    return next(
+        (s for s in sorted(CSV_SUFFIXES, key=len, reverse=True) if name.endswith(s)),
+        "",
+    )
+
+
+def is_csv_file(path: Path) -> bool:
+    return csv_suffix(path) != ""
+
+
+def file_stem(path: Path) -> str:
+    """Returns the file name without its suffix, e.g. "table" for "table.csv.gz"."""
+    suffix = csv_suffix(path)
+    return path.name[: -len(suffix)] if suffix else path.stem
+
+
+def replace_suffix(path: Path, suffix: str) -> Path:
+    """Like Path.with_suffix, but replaces the suffixes of compressed CSV files."""
+    return path.with_name(file_stem(path) + suffix)
+
 
 def expand_files(
     files: list[Path],
@@ -53,9 +104,41 @@ def read_sql_file(
         raise DataCheckError(f"Failed to read {sql_file}: {e}") from e
 
 
+def read_check_option(
+    sql_file: Path, name: str, encoding: str = "UTF-8"
+) -> Optional[str]:
+    """
+    Returns the value of an option that is declared in the comment lines
+    at the start of the SQL file, e.g. "-- key_columns: id, name".
+    Errors while decoding the file are reported when the query is read.
+    """
+    if not sql_file.is_file():
+        return None
+    with sql_file.open(encoding=encoding, errors="replace") as f:
+        for line in f:
+            stripped = line.strip()
+            if not stripped:
+                continue
+            if not stripped.startswith("--"):
+                break
+            match = CHECK_OPTION_PATTERN.match(stripped)
+            if match and match.group(1).lower() == name:
+                return match.group(2).strip()
+    return None
+
+
+def read_key_columns(sql_file: Path, encoding: str = "UTF-8") -> list[str]:
+    """Returns the key columns that are declared in the SQL file."""
+    key_columns = read_check_option(sql_file, "key_columns", encoding)
+    if key_columns is None:
+        return []
+    return [c.strip() for c in key_columns.split(",") if c.strip()]
+
+
 def get_expect_file(sql_file: Path) -> Path:
     """
     Returns the csv file with the expected results for a sql file.
+    A compressed CSV file is returned if it exists and the CSV file doesn't.
     """
     if "" in (
         str(sql_file),
@@ -63,41 +146,155 @@ def get_expect_file(sql_file: Path) -> Path:
         sql_file.suffix,
     ) or sql_file.suffix.lower() not in (".sql"):
         return Path()
+    for suffix in CSV_SUFFIXES:
+        expect_file = sql_file.parent / (sql_file.stem + suffix)
+        if expect_file.exists():
+            return expect_file
     return sql_file.parent / (sql_file.stem + ".csv")
 
 
+def _check_zstandard(path: Path):
+    """Raises a DataCheckError if the file is a .zst file and zstandard is missing."""
+    if path.suffix.lower() == ".zst" and find_spec("zstandard") is None:
+        raise DataCheckError(
+            "zstandard must be installed for .zst files, install data-check[zstd]"
+        )
+
+
 def read_csv(
     csv_file: Path,
     string_columns: Optional[list[str]] = None,
+    as_strings: bool = False,
 ) -> pd.DataFrame:
     """Reads a CSV file and returns a DataFrame with the data from the file.
 
     string_columns holds a list of all columns that should be treated as strings,
     without any conversion.
+    If as_strings is True, all columns are read as strings and no dates are parsed.
     """
     if string_columns is None:
         string_columns = []
-    dtypes: DtypeArg = dict.fromkeys(string_columns, "object")
+    dtypes: DtypeArg = (
+        "object" if as_strings else dict.fromkeys(string_columns, "object")
+    )
+    _check_zstandard(csv_file)
 
     try:
-        df = pd.read_csv(
-            csv_file,
-            dtype=dtypes,
-            na_values=[""],  # use empty string as nan
-            keep_default_na=False,
-            comment="#",
-            escapechar="\\",
-            quotechar='"',
-            quoting=0,
-            engine="c",
-        )
+        df = pd.read_csv(csv_file, dtype=dtypes, **CSV_OPTIONS)
     except Exception as e:
         raise DataCheckError(f"Failed to read {csv_file}: {e}") from e
 
-    _, df = parse_date_columns(df)
+    if not as_strings:
+        _, df = parse_date_columns(df)
     return df
 
 
+def _csv_data_start(csv_file: IO[bytes]) -> int:
+    """Returns the position after the header line, skipping comment lines."""
+    csv_file.seek(0)
+    while line := csv_file.readline():
+        if line.strip() and not line.startswith(b"#"):
+            break
+    return csv_file.tell()
+
+
+def csv_partitions(csv_file: Path, partitions: int) -> list[tuple[int, int]]:
+    """
+    Splits the rows of a CSV file into byte ranges of about the same size.
+    The ranges start and end at line breaks and don't include the header.
+    Values with line breaks inside quotes are not supported.
+    """
+    size = csv_file.stat().st_size
+    with csv_file.open("rb") as f:
+        data_start = _csv_data_start(f)
+        bounds = [data_start]
+        for i in range(1, partitions):
+            position = data_start + (size - data_start) * i // partitions
+            if position <= bounds[-1]:
+                continue
+            # move to the start of the next line
+            f.seek(position - 1)
+            f.readline()
+            bounds.append(f.tell())
+        bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+
+class CSVPartition(io.RawIOBase):
+    """
+    Binary file with the header of a CSV file and the rows
+    in a byte range of csv_partitions.
+    """
+
+    def __init__(self, csv_file: Path, start: int, end: int) -> None:
+        super().__init__()
+        self._file = csv_file.open("rb")
+        # ranges of the file that are still to be read
+        self._ranges = [(0, _csv_data_start(self._file)), (start, end)]
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:  # type: ignore[override]
+        while self._ranges:
+            position, end = self._ranges[0]
+            self._file.seek(position)
+            count = self._file.readinto(memoryview(buffer)[: end - position])
+            if not count:
+                self._ranges.pop(0)
+                continue
+            self._ranges[0] = (position + count, end)
+            return count
+        return 0
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+def read_csv_chunks(
+    csv_file: Path,
+    chunk_size: int,
+    string_columns: Optional[list[str]] = None,
+    date_columns: Optional[list[str]] = None,
+    byte_range: Optional[tuple[int, int]] = None,
+) -> Iterator[pd.DataFrame]:
+    """Reads a CSV file like read_csv, but in DataFrames of chunk_size rows.
+
+    The date columns are detected in the first chunk. These columns,
+    date_columns and the columns without any values so far are parsed
+    as dates in all following chunks, so the other columns are not tried again.
+    If byte_range is given, only the rows of this partition are read,
+    see csv_partitions.
+    """
+    _check_zstandard(csv_file)
+    dtypes: DtypeArg = dict.fromkeys(string_columns or [], "object")
+    date_candidates: Optional[set[str]] = None
+    empty_columns: set[str] = set()
+    source: Union[Path, IO[bytes]] = csv_file
+    if byte_range is not None:
+        source = io.BufferedReader(CSVPartition(csv_file, *byte_range))
+    try:
+        with pd.read_csv(
+            source, dtype=dtypes, chunksize=chunk_size, **CSV_OPTIONS
+        ) as reader:
+            for chunk in reader:
+                candidates = (
+                    None if date_candidates is None else date_candidates | empty_columns
+                )
+                detected, df = parse_date_columns(chunk, candidates)
+                if date_candidates is None:
+                    date_candidates = set(detected).union(date_columns or [])
+                    empty_columns = {str(c) for c in df.columns}
+                date_candidates.update(detected)
+                empty_columns.difference_update(
+                    str(c) for c, column in df.items() if column.notna().any()
+                )
+                yield df
+    except Exception as e:
+        raise DataCheckError(f"Failed to read {csv_file}: {e}") from e
+
+
 def print_csv(df: DataFrame, print_method):
     print_method(df.to_csv(index=False))
 
@@ -114,7 +311,111 @@ def write_csv(
         result = df.to_csv(index=False, lineterminator="\n")
         # escape # in strings that would otherwise be treated as the start of a comment
         result = result.replace("#", "\\#")
-        Path(base_path / output).write_text(result, encoding="utf8")
+        output_path = Path(base_path / output)
+        if output_path.suffix.lower() in COMPRESSION_SUFFIXES:
+            with _open_compressed(output_path) as f:
+                f.write(result.encode("utf8"))
+        else:
+            output_path.write_text(result, encoding="utf8")
+
+
+def _open_compressed(path: Path) -> IO[bytes]:
+    """Opens a file for writing, compressed by the suffix of the file."""
+    suffix = path.suffix.lower()
+    if suffix == ".gz":
+        # without a timestamp, the same content always results in the same file
+        return cast(IO[bytes], gzip.GzipFile(path, "wb", mtime=0))
+    if suffix == ".bz2":
+        return cast(IO[bytes], bz2.open(path, "wb"))
+    _check_zstandard(path)
+    import zstandard  # type: ignore
+
+    return zstandard.open(path, "wb")
+
+
+def write_parquet(
+    df: DataFrame,
+    output: Union[str, Path] = "",
+    base_path: Path = Path(),
+    sort_output: bool = False,
+):
+    """Writes the DataFrame with the types of its columns into a Parquet file."""
+    if output:
+        if sort_output:
+            df = df.sort_values(by=list(df.columns), axis=0)
+        _pyarrow_parquet()
+        try:
+            df.to_parquet(Path(base_path / output), index=False)
+        except Exception as e:
+            raise DataCheckError(f"Failed to write {output}: {e}") from e
+
+
+def write_file(
+    df: DataFrame,
+    output: Union[str, Path] = "",
+    base_path: Path = Path(),
+    sort_output: bool = False,
+):
+    """Writes the DataFrame into a Parquet file or otherwise into a CSV file."""
+    if Path(output).suffix.lower() == ".parquet":
+        write_parquet(df, output=output, base_path=base_path, sort_output=sort_output)
+    else:
+        write_csv(df, output=output, base_path=base_path, sort_output=sort_output)
+
+
+def parquet_to_frame(table: pa.Table) -> pd.DataFrame:
+    """
+    Converts a table from a Parquet file into a DataFrame with the same types
+    as a query result. The types are taken from the file, so no types
+    are inferred and only the date columns are converted to Timestamp.
+    """
+    import pyarrow.types as pat  # type: ignore
+
+    from .sql.query_result import arrow_to_frame
+
+    df = arrow_to_frame(table)
+    for i, field in enumerate(table.schema):
+        if pat.is_date(field.type):
+            df.isetitem(i, pd.to_datetime(df.iloc[:, i]).to_numpy())
+    return df
+
+
+def _pyarrow_parquet() -> Any:
+    try:
+        import pyarrow.parquet as pq  # type: ignore
+    except ImportError as e:
+        raise DataCheckError(
+            "pyarrow must be installed for Parquet files, install data-check[arrow]"
+        ) from e
+    return pq
+
+
+def read_parquet(parquet_file: Path) -> pd.DataFrame:
+    """Reads a Parquet file into a DataFrame with the types from the file."""
+    pq = _pyarrow_parquet()
+    try:
+        table = pq.read_table(parquet_file)
+    except Exception as e:
+        raise DataCheckError(f"Failed to read {parquet_file}: {e}") from e
+    return parquet_to_frame(table)
+
+
+def read_parquet_chunks(parquet_file: Path, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Reads a Parquet file like read_parquet, but in DataFrames of chunk_size rows."""
+    pq = _pyarrow_parquet()
+    import pyarrow as pa  # type: ignore
+
+    try:
+        reader = pq.ParquetFile(parquet_file)
+    except Exception as e:
+        raise DataCheckError(f"Failed to read {parquet_file}: {e}") from e
+    with reader:
+        empty = True
+        for batch in reader.iter_batches(batch_size=chunk_size):
+            empty = False
+            yield parquet_to_frame(pa.Table.from_batches([batch]))
+        if empty:
+            yield parquet_to_frame(reader.schema_arrow.empty_table())
 
 
 def read_yaml(
@@ -1,42 +1,125 @@
 import itertools
+import time
+from typing import Optional
 
+import numpy as np
 import pandas as pd
 
 from data_check.result import DataCheckResult
 
+# up to this number of removable columns, all combinations are searched
+EXACT_SEARCH_COLUMNS = 8
+# seconds after which the search gives up and all columns are kept
+TIME_BUDGET = 5.0
+# all columns are kept if more columns are needed to tell the rows apart
+MAX_KEPT_COLUMNS = 20
 
-def _df_same_uniques(df: pd.DataFrame, columns: list[str]) -> bool:
-    return len(df.drop_duplicates()) == len(df[columns].drop_duplicates())
 
+def _combine(groups: np.ndarray, codes: np.ndarray) -> np.ndarray:
+    """Splits the groups of rows by the codes of another column."""
+    combined = groups * (int(codes.max()) + 2) + codes + 1
+    return pd.factorize(combined)[0]
 
-def get_diffed_df(df: pd.DataFrame, result: DataCheckResult):
+
+def _group_count(groups: np.ndarray) -> int:
+    return int(groups.max()) + 1 if len(groups) else 0
+
+
+def _distinct_count(codes: dict[str, np.ndarray], columns: list[str]) -> int:
+    """Returns the number of distinct rows of the columns, like drop_duplicates."""
+    groups = np.zeros(len(codes[columns[0]]), dtype=np.int64)
+    for c in columns:
+        groups = _combine(groups, codes[c])
+    return _group_count(groups)
+
+
+def _exact_search(
+    codes: dict[str, np.ndarray], columns: list[str], target: int, deadline: float
+) -> Optional[list[str]]:
+    """
+    Searches the combination with the most removed columns,
+    in the same order as itertools.combinations.
+    """
+    can_remove = columns[1:]
+    for size in range(len(can_remove), 0, -1):
+        for removed in itertools.combinations(can_remove, size):
+            if time.monotonic() > deadline:
+                return None
+            kept = [c for c in columns if c not in removed]
+            if _distinct_count(codes, kept) == target:
+                return kept
+    return columns
+
+
+def _greedy_search(
+    codes: dict[str, np.ndarray],
+    columns: list[str],
+    target: int,
+    deadline: float,
+    max_columns: int,
+) -> Optional[list[str]]:
+    """
+    Adds the column that tells most rows apart until all rows are distinct,
+    then removes the columns that are no longer needed.
+    Returns None if the budget is exceeded.
+    """
+    kept = columns[:1]
+    groups = _combine(np.zeros(len(codes[kept[0]]), dtype=np.int64), codes[kept[0]])
+    candidates = columns[1:]
+    while _group_count(groups) < target:
+        if len(kept) >= max_columns:
+            return None
+        best_column, best_groups = None, groups
+        for c in candidates:
+            if time.monotonic() > deadline:
+                return None
+            split_groups = _combine(groups, codes[c])
+            if _group_count(split_groups) > _group_count(best_groups):
+                best_column, best_groups = c, split_groups
+        if best_column is None:
+            # no column tells the remaining rows apart
+            return None
+        kept.append(best_column)
+        candidates.remove(best_column)
+        groups = best_groups
+    for c in kept[1:]:
+        others = [k for k in kept if k != c]
+        if _distinct_count(codes, others) == target:
+            kept = others
+    return [c for c in columns if c in kept]
+
+
+def get_diffed_df(
+    df: pd.DataFrame,
+    result: DataCheckResult,
+    time_budget: float = TIME_BUDGET,
+    max_columns: int = MAX_KEPT_COLUMNS,
+):
     """Tries to remove columns from df, while preserving uniqueness
     across result.full_result. The first column is always preserved.
+
+    Narrow results are searched for the most columns that can be removed.
+    For wider results, the columns that tell the rows apart are selected greedily.
+    If the search takes longer than time_budget seconds or needs more than
+    max_columns columns, all columns are kept.
     """
-    if result.full_result is None:
+    if result.full_result is None or len(result.full_result) == 0:
         return df
     full_df = result.full_result
     columns: list[str] = list(full_df.columns)
     # remove _merge from checking and append it at the end
     columns.remove("_merge")
-    can_remove = columns[1:]  # always keep the first column
-    # construct all possible combinations of columns
-    can_remove_combinations = [
-        comb
-        for iter_len in range(1, len(can_remove) + 1)
-        for comb in itertools.combinations(can_remove, iter_len)
-    ]
-    columns_to_remove: list[str] = []
-    # check which combinations keep the DataFrame of same size,
-    # and remove the combination with the most columns
-    for _cols in sorted(can_remove_combinations, key=len, reverse=True):
-        _column_part = list(set(columns) - set(_cols))
-        if _df_same_uniques(full_df, _column_part):
-            columns_to_remove = list(_cols)
-            break
-
-    for col in columns_to_remove:
-        columns.remove(col)
-    columns.append("_merge")
-
-    return df[columns]
+    # the rows are compared by the codes of their values
+    codes = {c: pd.factorize(full_df[c])[0] for c in full_df.columns}
+    target = _distinct_count(codes, list(full_df.columns))
+
+    start = time.monotonic()
+    kept: Optional[list[str]] = None
+    if len(columns) - 1 <= EXACT_SEARCH_COLUMNS:
+        kept = _exact_search(codes, columns, target, start + time_budget / 2)
+    if kept is None:
+        kept = _greedy_search(codes, columns, target, start + time_budget, max_columns)
+    if kept is None:
+        kept = columns
+
+    return df[[*kept, "_merge"]]
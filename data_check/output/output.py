@@ -149,6 +149,14 @@ class DataCheckOutput:
             else:
                 raise DataCheckError(f"unknown print format: {self.print_format}")
 
+    def pprint_pool_statistics(self, statistics: dict[str, float]) -> None:
+        """Prints the counters of the connection pool."""
+        self.print(
+            f"connection pool: {statistics['connects']} connects, "
+            f"{statistics['checkouts']} checkouts, {statistics['waits']} waits "
+            f"({statistics['wait_time']:.2f} s), {statistics['reconnects']} reconnects"
+        )
+
     @staticmethod
     def str_pass(string: str) -> str:
         return Fore.GREEN + string + Style.RESET_ALL
@@ -188,6 +196,8 @@ class DataCheckOutput:
             source_message = self.str_warn("NO EXPECTED RESULTS FILE")
         elif result_type == ResultType.FAILED_DIFFERENT_LENGTH:
             extra_message = "same data but the length differs"
+        elif result_type == ResultType.FAILED_DIFFERENT_SHAPE:
+            extra_message = "the shape differs"
         elif result_type == ResultType.FAILED_PATH_NOT_EXISTS:
             source_message = self.str_warn("PATH DOESN'T EXIST")
 
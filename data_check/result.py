@@ -15,6 +15,7 @@ class ResultType(Enum):
     NO_EXPECTED_RESULTS_FILE = 4
     FAILED_DIFFERENT_LENGTH = 5
     FAILED_PATH_NOT_EXISTS = 6
+    FAILED_DIFFERENT_SHAPE = 7
 
 
 @dataclass
@@ -52,6 +53,9 @@ class DataCheckResult:
 
     result_type: Optional[ResultType] = None
 
+    duration: Optional[float] = None
+    """Seconds it took to run the check."""
+
     def __bool__(self):
         return self.passed
 
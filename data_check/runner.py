@@ -1,18 +1,30 @@
-import multiprocessing as mp
+import itertools
 import threading
 from concurrent.futures import (
+    FIRST_COMPLETED,
     Executor,
     Future,
     ProcessPoolExecutor,
     ThreadPoolExecutor,
     as_completed,
+    wait,
 )
+from functools import partial
+from graphlib import TopologicalSorter
 from typing import Any, Callable, Optional
 
 from .checks.base_check import BaseCheck
 from .output import DataCheckOutput
 from .result import DataCheckResult
 
+# Marks the threads of the shared pools with the key of their runner.
+_worker_thread = threading.local()
+_runner_keys = itertools.count()
+
+
+def _init_worker_thread(runner_key: int):
+    _worker_thread.runner_key = runner_key
+
 
 class NoPoolExecutor(Executor):
     def submit(  # type: ignore
@@ -28,7 +40,40 @@ class NoPoolExecutor(Executor):
         return f
 
 
+class ClaimableTask:
+    """
+    A task that runs only once, either in a worker of the pool
+    or in the thread that waits for its result, whichever claims it first.
+    """
+
+    def __init__(self, fn: Callable[[], Any]) -> None:
+        self.fn = fn
+        self.future: Future[Any] = Future()
+        self._claimed = False
+        self._lock = threading.Lock()
+
+    def run(self):
+        with self._lock:
+            if self._claimed:
+                return
+            self._claimed = True
+        if not self.future.set_running_or_notify_cancel():
+            return
+        try:
+            result = self.fn()
+        except BaseException as e:
+            self.future.set_exception(e)
+        else:
+            self.future.set_result(result)
+
+
 class DataCheckRunner:
+    """
+    Runs tasks on a pool that is shared by all calls of the runner.
+    The pool is created once with the number of workers, so nested calls
+    (e.g. checks inside a pipeline) do not run more than "workers" tasks at once.
+    """
+
     def __init__(
         self, workers: int, output: Optional[DataCheckOutput] = None, use_process=False
     ) -> None:
@@ -37,29 +82,84 @@ class DataCheckRunner:
             output = DataCheckOutput()
         self.output = output
         self.use_process = use_process
+        # called once in each worker process when use_process is set
+        self.process_initializer: Optional[Callable[[], None]] = None
+        self._executor: Optional[Executor] = None
+        self._executor_lock = threading.Lock()
+        # guards the state that the nested calls of the runner share,
+        # e.g. the durations of the checks
+        self.lock = threading.Lock()
+        self._key = next(_runner_keys)
+        self._in_worker_process = False
 
-    def _max_new_workers(self, task_count):
-        if self.use_process:
-            max_new_workers = self.workers - len(mp.get_context().active_children())
-        else:
-            # threading.active_count() also counts the current thread,
-            # which is not needed here
-            max_new_workers = self.workers - threading.active_count() + 1
-        max_new_workers = min(max_new_workers, task_count)
-        return max_new_workers
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        state["_executor"] = None
+        del state["_executor_lock"]
+        del state["lock"]
+        return state
 
-    def executor(self, task_list: list[Any]) -> Executor:
-        max_new_workers = self._max_new_workers(len(task_list))
+    def __setstate__(self, state: dict[str, Any]):
+        self.__dict__.update(state)
+        self._executor_lock = threading.Lock()
+        self.lock = threading.Lock()
+        # The runner was sent to a worker process. This process already counts
+        # against the workers, so nested tasks run in the process itself.
+        self._in_worker_process = True
+
+    @property
+    def in_worker_process(self) -> bool:
+        return self._in_worker_process
+
+    @property
+    def in_worker_thread(self) -> bool:
+        return getattr(_worker_thread, "runner_key", None) == self._key
 
-        # Makes no sense to create a single worker
+    def _shared_executor(self) -> Executor:
+        with self._executor_lock:
+            if self._executor is None:
+                if self.use_process:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        initializer=self.process_initializer,
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers,
+                        initializer=_init_worker_thread,
+                        initargs=(self._key,),
+                    )
+            return self._executor
+
+    def executor(self, task_list: list[Any]) -> Executor:
+        # Makes no sense to use the pool for a single task
         # if we can process the work in this thread/process:
-        if max_new_workers > 1:
-            if self.use_process:
-                return ProcessPoolExecutor(max_workers=max_new_workers)
-            else:
-                return ThreadPoolExecutor(max_workers=max_new_workers)
+        if self.workers > 1 and len(task_list) > 1 and not self._in_worker_process:
+            return self._shared_executor()
         return NoPoolExecutor()
 
+    def shutdown(self, wait: bool = True):
+        """Shuts down the shared pool. A new pool is created on the next call."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait, cancel_futures=not wait)
+                self._executor = None
+
+    def _submit_all(
+        self, executor: Executor, tasks: list[Callable[[], Any]]
+    ) -> list[Future[Any]]:
+        if self.in_worker_thread and isinstance(executor, ThreadPoolExecutor):
+            # Nested call from a worker of the pool: the tasks are queued in the pool,
+            # but this thread runs all tasks that no other worker has started yet.
+            # Otherwise all workers could wait for tasks that are never started.
+            claimable_tasks = [ClaimableTask(t) for t in tasks]
+            for ct in claimable_tasks:
+                executor.submit(ct.run)
+            for ct in claimable_tasks:
+                ct.run()
+            return [ct.future for ct in claimable_tasks]
+        return [executor.submit(t) for t in tasks]
+
     def run_checks(
         self,
         run_method: Callable[[BaseCheck], DataCheckResult],
@@ -70,31 +170,74 @@ class DataCheckRunner:
         Returns a list of the results
         """
         executor = self.executor(all_checks)
-        result_futures = [executor.submit(run_method, f) for f in all_checks]
-        return self._run(executor, result_futures, completed_hook=self.output.print)
+        result_futures = self._submit_all(
+            executor, [partial(run_method, f) for f in all_checks]
+        )
+        return self._run(result_futures, completed_hook=self.output.print)
 
     def run_any(
         self, run_method: Callable[..., Any], parameters: list[dict[str, Any]]
     ) -> list[Any]:
         executor = self.executor(parameters)
-        result_futures = [executor.submit(run_method, **p) for p in parameters]
-        return self._run(executor, result_futures)
+        result_futures = self._submit_all(
+            executor, [partial(run_method, **p) for p in parameters]
+        )
+        return self._run(result_futures)
+
+    def run_graph(
+        self,
+        run_method: Callable[..., Any],
+        parameters: list[dict[str, Any]],
+        dependencies: dict[int, set[int]],
+    ) -> list[Any]:
+        """
+        Like run_any, but the task for parameters[i] starts only after the tasks
+        in dependencies[i] are finished. Independent tasks run in parallel.
+        Raises graphlib.CycleError if the dependencies contain a cycle.
+        """
+        graph = TopologicalSorter(
+            {i: dependencies.get(i, set()) for i in range(len(parameters))}
+        )
+        graph.prepare()
+        executor = self.executor(parameters)
+        running: dict[Future[Any], int] = {}
+        results: dict[int, Any] = {}
+        try:
+            while graph.is_active():
+                ready = graph.get_ready()
+                futures = self._submit_all(
+                    executor, [partial(run_method, **parameters[i]) for i in ready]
+                )
+                running.update(zip(futures, ready))
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i = running.pop(future)
+                    results[i] = future.result()
+                    graph.done(i)
+        except KeyboardInterrupt:
+            for f in running:
+                f.cancel()
+            self.shutdown(wait=False)
+        return [results[i] for i in range(len(parameters)) if i in results]
 
     def _run(
         self,
-        executor: Executor,
         result_futures: list[Future[Any]],
         completed_hook: Optional[Callable[..., None]] = None,
     ) -> list[Any]:
-        results: list[Any] = []
+        """
+        Waits for all futures. completed_hook is called in the order of completion,
+        but the results are returned in the order of result_futures.
+        """
+        results: dict[Future[Any], Any] = {}
         try:
             for future in as_completed(result_futures):
                 dc_result = future.result()
-                results.append(dc_result)
+                results[future] = dc_result
                 if completed_hook:
                     completed_hook(dc_result)
         except KeyboardInterrupt:
-            executor.shutdown(wait=False)
             for f in result_futures:
                 f.cancel()
-        return results
+            self.shutdown(wait=False)
+        return [results[f] for f in result_futures if f in results]
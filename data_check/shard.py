@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import json
+import zlib
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional
+
+from .durations import CheckDurations
+from .exceptions import DataCheckError
+from .result import DataCheckResult, ResultType
+
+if TYPE_CHECKING:
+    from .checks.base_check import BaseCheck
+    from .output import DataCheckOutput
+
+
+def parse_shard(shard: str) -> tuple[int, int]:
+    """
+    Parses a shard in the format "i/n" and returns (i, n).
+    i is 1-based and must not be greater than n.
+    """
+    try:
+        index_str, count_str = shard.split("/", maxsplit=1)
+        index, count = int(index_str), int(count_str)
+    except ValueError as e:
+        raise DataCheckError(f"invalid shard: {shard}, expected i/n") from e
+    if count < 1 or not 1 <= index <= count:
+        raise DataCheckError(f"invalid shard: {shard}, expected 1 <= i <= n")
+    return index, count
+
+
+def _hash_partition(keys: list[str], count: int) -> list[int]:
+    # crc32 is stable between runs and machines, unlike hash()
+    return [zlib.crc32(k.encode("UTF-8")) % count for k in keys]
+
+
+def _duration_partition(
+    keys: list[str], durations: list[Optional[float]], count: int
+) -> list[int]:
+    # Checks without a duration are estimated with the mean duration of the others.
+    known = [d for d in durations if d is not None]
+    mean = sum(known) / len(known)
+    estimated = [mean if d is None else d for d in durations]
+
+    # Assign the longest check to the shard with the least work so far.
+    loads = [0.0] * count
+    partition = [0] * len(keys)
+    for i in sorted(range(len(keys)), key=lambda i: (-estimated[i], keys[i])):
+        shard = loads.index(min(loads))
+        partition[i] = shard
+        loads[shard] += estimated[i]
+    return partition
+
+
+def select_shard(
+    checks: list[BaseCheck],
+    shard: str,
+    project_path: Path,
+    shard_durations: Optional[Path] = None,
+) -> list[BaseCheck]:
+    """
+    Returns the checks that belong to the shard "i/n".
+    The checks are partitioned by the hash of their path relative to the project.
+    If a durations file is given, the checks are balanced by its durations instead.
+    All nodes must use the same file, the local durations of each node
+    can differ and would lead to different partitions.
+    """
+    index, count = parse_shard(shard)
+    keys = [CheckDurations.relative_key(c.check_path, project_path) for c in checks]
+    durations: list[Optional[float]] = [None] * len(checks)
+    if shard_durations is not None:
+        snapshot = CheckDurations(shard_durations, project_path).durations
+        durations = [snapshot.get(k) for k in keys]
+    if any(d is not None for d in durations):
+        partition = _duration_partition(keys, durations, count)
+    else:
+        partition = _hash_partition(keys, count)
+    return [c for c, p in zip(checks, partition) if p == index - 1]
+
+
+def write_result_file(
+    result_file: Path,
+    results: list[DataCheckResult],
+    shard: Optional[str] = None,
+    durations: Optional[dict[str, float]] = None,
+):
+    """
+    Writes the results to a JSON file that can be merged with other result files.
+    The durations of the checks are stored to be merged into the durations file.
+    """
+    data: dict[str, Any] = {
+        "shard": shard,
+        "durations": durations or {},
+        "results": [
+            {
+                "source": str(r.source),
+                "passed": r.passed,
+                "result_type": r.result_type.name if r.result_type else None,
+                "duration": r.duration,
+                "exception": str(r.exception) if r.exception else None,
+            }
+            for r in results
+        ],
+    }
+    result_file.write_text(json.dumps(data, indent=2), encoding="UTF-8")
+
+
+def read_result_file(
+    result_file: Path, output: DataCheckOutput
+) -> list[DataCheckResult]:
+    try:
+        data = json.loads(result_file.read_text(encoding="UTF-8"))
+        results: list[DataCheckResult] = []
+        for r in data["results"]:
+            if r["result_type"]:
+                result_type = ResultType[r["result_type"]]
+            else:
+                result_type = DataCheckResult.passed_to_result_type(r["passed"])
+            exception = DataCheckError(r["exception"]) if r["exception"] else None
+            result = output.prepare_result(
+                result_type, source=Path(r["source"]), exception=exception
+            )
+            result.duration = r["duration"]
+            results.append(result)
+        return results
+    except Exception as e:
+        raise DataCheckError(f"Failed to read {result_file}: {e}") from e
+
+
+def read_result_durations(result_file: Path) -> dict[str, float]:
+    """Returns the durations of the checks that are stored in a result file."""
+    try:
+        data = json.loads(result_file.read_text(encoding="UTF-8"))
+        return {str(k): float(v) for k, v in data.get("durations", {}).items()}
+    except Exception as e:
+        raise DataCheckError(f"Failed to read {result_file}: {e}") from e
@@ -1,12 +1,33 @@
 from collections.abc import Sequence
-from typing import Union
+from functools import cached_property
+from typing import Optional, Union
 
 from sqlalchemy import Row
+from sqlalchemy import Table as SQLTable
+from sqlalchemy.sql.expression import Executable
 
 from data_check.sql import DataCheckSql
+from data_check.sql.table import Table
+from data_check.sql.table_loader import TableLoader
+
+
+class TableLoaderDatabricks(TableLoader):
+    # Databricks has no temporary tables,
+    # the staging table is dropped after the upsert
+    temporary_staging_table = False
+
+    def upsert_statement(self, table: Table, staging: SQLTable) -> Optional[Executable]:
+        return self.merge_upsert_statement(table, staging)
 
 
 class DataCheckSqlDatabricks(DataCheckSql):
+    @cached_property
+    def table_loader(self) -> TableLoader:
+        return TableLoaderDatabricks(self, self.output, self.config.default_load_mode)
+
+    def string_cast_type(self) -> str:
+        return "STRING"
+
     def use_parameters(self) -> bool:
         # cannot use bindparams due to https://github.com/databricks/databricks-sql-python/pull/267
         return False
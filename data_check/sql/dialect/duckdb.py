@@ -1,5 +1,111 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from functools import cached_property
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Any, Optional
+from uuid import uuid4
+
+import pandas as pd
+from pandas.api.types import infer_dtype, is_object_dtype
+from sqlalchemy.engine import Connection
+from sqlalchemy.engine.cursor import CursorResult
+
 from data_check.sql import DataCheckSql
+from data_check.sql.table import Table
+from data_check.sql.table_loader import InsertMethod, TableLoader
+
+if TYPE_CHECKING:
+    import pyarrow as pa  # type: ignore
+
+
+# Types that are converted from Arrow into the same pandas types
+# as the Python values that are returned row by row.
+ARROW_TYPES = {
+    "BOOLEAN",
+    "TINYINT",
+    "SMALLINT",
+    "INTEGER",
+    "BIGINT",
+    "UTINYINT",
+    "USMALLINT",
+    "UINTEGER",
+    "FLOAT",
+    "DOUBLE",
+    "VARCHAR",
+    "DATE",
+    "TIMESTAMP",
+    '"NULL"',
+}
+
+
+class TableLoaderDuckDB(TableLoader):
+    # DuckDB already inserts a DataFrame with multiple threads
+    parallel_load = False
+
+    def insert_method(self, table: Table, data: pd.DataFrame) -> Optional[InsertMethod]:
+        # DuckDB reads object columns only if they have a single type
+        if all(
+            not is_object_dtype(column)
+            or infer_dtype(column, skipna=True) in ("string", "empty")
+            for _, column in data.items()
+        ):
+            return self.dataframe_insert
+        return None
+
+    def dataframe_insert(
+        self,
+        pd_table: Any,
+        connection: Connection,
+        keys: list[str],
+        data_iter: Iterable[tuple],
+    ) -> int:
+        """
+        Insert method for DataFrame.to_sql that lets DuckDB read the DataFrame
+        directly. to_sql must be called without a chunksize,
+        as the whole DataFrame is inserted at once.
+        """
+        _ = data_iter
+        preparer = connection.dialect.identifier_preparer
+        column_names = ", ".join(preparer.quote(k) for k in keys)
+        view_name = f"dc_load_{uuid4().hex[:12]}"
+        duckdb_connection: Any = connection.connection.driver_connection
+        duckdb_connection.register(view_name, pd_table.frame)
+        try:
+            duckdb_connection.execute(
+                f"INSERT INTO {preparer.format_table(pd_table.table)} "
+                f"({column_names}) SELECT {column_names} FROM {view_name}"
+            )
+        finally:
+            duckdb_connection.unregister(view_name)
+        return len(pd_table.frame)
 
 
 class DataCheckSqlDuckDB(DataCheckSql):
-    pass
+    @cached_property
+    def table_loader(self) -> TableLoader:
+        return TableLoaderDuckDB(self, self.output, self.config.default_load_mode)
+
+    def supports_fingerprint(self) -> bool:
+        return True
+
+    def supports_server_side_diff(self) -> bool:
+        return True
+
+    def date_expression(self, expression: str) -> str:
+        return f"TRY_CAST({expression} AS TIMESTAMP)"
+
+    def supports_arrow(self) -> bool:
+        # DuckDB returns Arrow tables only if pyarrow is installed
+        return find_spec("pyarrow") is not None
+
+    def fetch_arrow(self, result: CursorResult) -> Optional[pa.Table]:
+        cursor = result.cursor
+        column_types = [str(d[1]) for d in cursor.description or []]
+        if not all(t in ARROW_TYPES or t.startswith("DECIMAL") for t in column_types):
+            return None
+        # fetch_arrow_table is deprecated in newer DuckDB versions
+        to_arrow_table = getattr(cursor, "to_arrow_table", None)
+        if to_arrow_table is None:
+            return cursor.fetch_arrow_table()
+        return to_arrow_table()
@@ -1,14 +1,25 @@
 from functools import cached_property
+from os import path
+from typing import Any, Optional
 
+import pandas as pd
+from sqlalchemy import Table as SQLTable
 from sqlalchemy.engine import Connection
+from sqlalchemy.engine.url import make_url
 from sqlalchemy.sql import text
+from sqlalchemy.sql.expression import Executable
 
 from data_check.sql import DataCheckSql
 from data_check.sql.table import Table
-from data_check.sql.table_loader import TableLoader
+from data_check.sql.table_loader import InsertMethod, TableLoader
 
 
 class TableLoaderMSSQL(TableLoader):
+    # temporary tables in SQL Server are prefixed with "#"
+    # instead of being created with CREATE TEMPORARY TABLE
+    staging_table_prefix = "#"
+    temporary_staging_table = False
+
     def pre_insert(self, connection: Connection, table: Table):
         # When appending/upserting data into a table with identity columns,
         # we need to enable IDENTITY_INSERT to allow inserting explicit values
@@ -16,8 +27,25 @@ class TableLoaderMSSQL(TableLoader):
         if table.exists() and table.sql_table.primary_key:
             connection.execute(text(f"SET IDENTITY_INSERT {table} ON"))
 
+    def insert_method(self, table: Table, data: pd.DataFrame) -> Optional[InsertMethod]:
+        return self.executemany_insert
+
+    def upsert_statement(self, table: Table, staging: SQLTable) -> Optional[Executable]:
+        # MERGE must be terminated by a semicolon in SQL Server
+        return self.merge_upsert_statement(table, staging, terminator=";")
+
 
 class DataCheckSqlMSSQL(DataCheckSql):
+    def get_db_params(self) -> dict[str, Any]:
+        # pyodbc sends all rows of executemany in a single batch
+        if make_url(path.expandvars(self.connection)).get_driver_name() == "pyodbc":
+            return {"fast_executemany": True}
+        return {}
+
     @cached_property
     def table_loader(self) -> TableLoader:
         return TableLoaderMSSQL(self, self.output, self.config.default_load_mode)
+
+    def string_cast_type(self) -> str:
+        # VARCHAR without a length is only 30 characters long in CAST
+        return "NVARCHAR(MAX)"
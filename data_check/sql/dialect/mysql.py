@@ -1,5 +1,33 @@
+from functools import cached_property
+from typing import Optional
+
+from sqlalchemy import Table as SQLTable
+from sqlalchemy import select
+from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.sql.expression import Executable
+
 from data_check.sql import DataCheckSql
+from data_check.sql.table import Table
+from data_check.sql.table_loader import TableLoader
+
+
+class TableLoaderMySQL(TableLoader):
+    def upsert_statement(self, table: Table, staging: SQLTable) -> Optional[Executable]:
+        columns = [c.name for c in staging.columns]
+        stmt = insert(table.sql_table).from_select(columns, select(staging))
+        # MySQL has no "do nothing", updating a key to itself has the same effect
+        update_columns = [c for c in columns if c not in table.primary_keys] or [
+            table.primary_keys[0]
+        ]
+        return stmt.on_duplicate_key_update(
+            {c: stmt.inserted[c] for c in update_columns}
+        )
 
 
 class DataCheckSqlMySQL(DataCheckSql):
-    pass
+    @cached_property
+    def table_loader(self) -> TableLoader:
+        return TableLoaderMySQL(self, self.output, self.config.default_load_mode)
+
+    def string_cast_type(self) -> str:
+        return "CHAR"
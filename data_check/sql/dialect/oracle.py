@@ -2,15 +2,21 @@ from functools import cached_property
 from typing import Any, Optional
 
 import pandas as pd
+from sqlalchemy import Table as SQLTable
 from sqlalchemy import event
 from sqlalchemy.engine import Engine
+from sqlalchemy.sql.expression import Executable
 
 from data_check.sql import DataCheckSql
 from data_check.sql.table import Table
-from data_check.sql.table_loader import TableLoader
+from data_check.sql.table_loader import InsertMethod, TableLoader
 
 
 class TableLoaderOracle(TableLoader):
+    # private temporary tables need Oracle 18c and a special name,
+    # so a regular table is used that is dropped after the upsert
+    temporary_staging_table = False
+
     def prepare_dtypes(
         self, data: pd.DataFrame, table: Table, dtype
     ) -> Optional[dict[str, Any]]:
@@ -33,12 +39,23 @@ class TableLoaderOracle(TableLoader):
 
         return super().prepare_dtypes(data, table, dtype)
 
+    def insert_method(self, table: Table, data: pd.DataFrame) -> Optional[InsertMethod]:
+        # executemany of the Oracle driver uses array DML
+        return self.executemany_insert
+
+    def upsert_statement(self, table: Table, staging: SQLTable) -> Optional[Executable]:
+        return self.merge_upsert_statement(table, staging)
+
 
 class DataCheckSqlOracle(DataCheckSql):
     @cached_property
     def table_loader(self) -> TableLoader:
         return TableLoaderOracle(self, self.output, self.config.default_load_mode)
 
+    def value_count_expression(self, column: str) -> str:
+        # empty strings are NULL in Oracle
+        return f"COUNT({column})"
+
     def post_get_engine_hook(self, engine: Engine):
         self.register_setinputsizes_event(engine)
 
@@ -1,5 +1,72 @@
+from collections.abc import Iterable
+from functools import cached_property
+from io import StringIO
+from typing import Any, Optional
+
+import pandas as pd
+from sqlalchemy import Table as SQLTable
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql.expression import Executable
+
 from data_check.sql import DataCheckSql
+from data_check.sql.table import Table
+from data_check.sql.table_loader import InsertMethod, TableLoader
+
+# COPY in text format marks NULL with \N, so it differs from an empty string
+COPY_NULL = "\\N"
+COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\n": "\\n", "\r": "\\r", "\t": "\\t"})
+
+
+def copy_text_row(row: tuple) -> str:
+    """Returns a line for COPY FROM STDIN in text format."""
+    values = (COPY_NULL if v is None else str(v).translate(COPY_ESCAPES) for v in row)
+    return "\t".join(values) + "\n"
+
+
+class TableLoaderPostgreSQL(TableLoader):
+    def insert_method(self, table: Table, data: pd.DataFrame) -> Optional[InsertMethod]:
+        return self.copy_insert
+
+    def copy_insert(
+        self,
+        pd_table: Any,
+        connection: Connection,
+        keys: list[str],
+        data_iter: Iterable[tuple],
+    ) -> int:
+        """Insert method for DataFrame.to_sql that uses COPY FROM STDIN."""
+        preparer = connection.dialect.identifier_preparer
+        buffer = StringIO()
+        buffer.writelines(copy_text_row(row) for row in data_iter)
+        buffer.seek(0)
+        statement = (
+            f"COPY {preparer.format_table(pd_table.table)} "
+            f"({', '.join(preparer.quote(k) for k in keys)}) "
+            f"FROM STDIN WITH (FORMAT text, NULL '{COPY_NULL}')"
+        )
+        cursor = connection.connection.cursor()
+        try:
+            if hasattr(cursor, "copy_expert"):
+                # psycopg2
+                cursor.copy_expert(sql=statement, file=buffer)
+            else:
+                # psycopg 3
+                with cursor.copy(statement) as copy:
+                    copy.write(buffer.getvalue())
+            return cursor.rowcount
+        finally:
+            cursor.close()
+
+    def upsert_statement(self, table: Table, staging: SQLTable) -> Optional[Executable]:
+        return self.on_conflict_upsert_statement(insert, table, staging)
+
+    def truncate_statements(self, tables: list[Table]) -> list[str]:
+        # tables that refer to each other can be truncated together
+        return [f"TRUNCATE TABLE {', '.join(t.full_name for t in tables)}"]
 
 
 class DataCheckSqlPostgreSQL(DataCheckSql):
-    pass
+    @cached_property
+    def table_loader(self) -> TableLoader:
+        return TableLoaderPostgreSQL(self, self.output, self.config.default_load_mode)
@@ -1,6 +1,104 @@
+from functools import cached_property
+from typing import Optional
+
+import pandas as pd
+from sqlalchemy import Table as SQLTable
+from sqlalchemy import event
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.sql import text
+from sqlalchemy.sql.expression import Executable
+
 from data_check.sql import DataCheckSql
+from data_check.sql.fingerprint import row_hash
+from data_check.sql.table import Table
+from data_check.sql.table_loader import InsertMethod, TableLoader
+
+
+class HashSum:
+    """Aggregate function for the sum of the row hashes.
+    The sum is returned as text, as it doesn't fit into an SQLite integer.
+    """
+
+    def __init__(self) -> None:
+        self.total = 0
+
+    def step(self, *values):
+        self.total += row_hash(*values)
+
+    def finalize(self) -> str:
+        return str(self.total)
+
+
+class TableLoaderSQLite(TableLoader):
+    # SQLite allows only a single writer at a time
+    parallel_load = False
+
+    def insert_method(self, table: Table, data: pd.DataFrame) -> Optional[InsertMethod]:
+        return self.executemany_insert
+
+    def upsert_statement(self, table: Table, staging: SQLTable) -> Optional[Executable]:
+        return self.on_conflict_upsert_statement(insert, table, staging)
 
 
 class DataCheckSqlSQLite(DataCheckSql):
+    @cached_property
+    def table_loader(self) -> TableLoader:
+        return TableLoaderSQLite(self, self.output, self.config.default_load_mode)
+
     def get_truncate_table_statement(self, table_name: str) -> str:
         return f"DELETE FROM {table_name}"
+
+    def post_get_engine_hook(self, engine: Engine):
+        @event.listens_for(engine, "connect")
+        def _register_functions(dbapi_connection, connection_record):
+            _ = connection_record
+            dbapi_connection.create_aggregate("dc_hash_sum", -1, HashSum)
+
+    def supports_fingerprint(self) -> bool:
+        return True
+
+    def hash_sum_expression(self, columns: list[str]) -> str:
+        return f"dc_hash_sum({', '.join(columns)})"
+
+    def supports_server_side_diff(self) -> bool:
+        return True
+
+    def value_count_expression(self, column: str) -> str:
+        # values of other types are never equal to a string in SQLite
+        return f"COUNT(NULLIF({column}, ''))"
+
+    def null_safe_equal(self, left: str, right: str) -> str:
+        return f"{left} IS {right}"
+
+    def date_expression(self, expression: str) -> str:
+        return f"strftime('%Y-%m-%d %H:%M:%f', {expression})"
+
+    def diff_column_types(
+        self, connection: Connection, table_name: str, columns: list[str]
+    ) -> Optional[list[str]]:
+        # Columns of "CREATE TABLE AS SELECT" have no type affinity in SQLite,
+        # so the strings of the expectation would never equal numbers.
+        # The affinity is taken from the first value of each query column instead.
+        if not columns:
+            return []
+        type_queries = ", ".join(
+            f"(SELECT typeof({c}) FROM {table_name} WHERE {c} IS NOT NULL LIMIT 1)"
+            for c in columns
+        )
+        value_types = connection.execute(text(f"SELECT {type_queries}")).one()
+        affinities = {"integer": "NUMERIC", "real": "NUMERIC", "text": "TEXT"}
+        return [affinities.get(str(t), "") for t in value_types]
+
+    def prepare_diff_table(
+        self, connection: Connection, table_name: str, columns: list[str]
+    ):
+        # SQLite can use an index for "IS" comparisons,
+        # otherwise NOT EXISTS would scan the whole table for each row.
+        if columns:
+            connection.execute(
+                text(
+                    f"CREATE INDEX {table_name}_idx ON {table_name} "
+                    f"({', '.join(columns)})"
+                )
+            )
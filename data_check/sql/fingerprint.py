@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from contextlib import suppress
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+import pandas as pd
+
+# Values of a row are joined with the unit separator,
+# NULL and empty strings are replaced by the record separator.
+VALUE_SEPARATOR = "\x1f"
+NULL_VALUE = "\x1e"
+# number of hex digits of the MD5 hash that are used for a row,
+# 15 digits fit into a signed 64 bit integer in the database
+HASH_DIGITS = 15
+
+
+@dataclass(frozen=True)
+class Fingerprint:
+    """
+    Order independent fingerprint of a result: the number of rows
+    and the sum of the hashes of all rows.
+    """
+
+    row_count: int
+    hash_sum: int
+
+
+def row_text(values: tuple[Any, ...]) -> str:
+    return VALUE_SEPARATOR.join(
+        NULL_VALUE if v is None or v == "" else str(v) for v in values
+    )
+
+
+def row_hash(*values: Any) -> int:
+    """Hash of a single row, the same as DataCheckSql.row_hash_expression."""
+    digest = hashlib.md5(row_text(values).encode("UTF-8"), usedforsecurity=False)
+    return int(digest.hexdigest()[:HASH_DIGITS], 16)
+
+
+def dataframe_fingerprint(df: pd.DataFrame) -> Fingerprint:
+    """
+    Fingerprint of a DataFrame with the values as strings,
+    e.g. read with read_csv(as_strings=True).
+    """
+    values = df.astype(object).where(df.notna(), None)
+    return Fingerprint(
+        row_count=len(df),
+        hash_sum=sum(row_hash(*row) for row in values.itertuples(index=False)),
+    )
+
+
+class FingerprintCache:
+    """
+    Caches the fingerprints of expectation files. Each file has its own entry
+    that is valid as long as the modification time and the size of the file
+    don't change, so the cache can be used from multiple processes.
+    """
+
+    def __init__(self, cache_path: Path) -> None:
+        self.cache_path = cache_path
+
+    def _entry_path(self, expect_file: Path) -> Path:
+        key = hashlib.sha1(
+            str(expect_file.absolute()).encode("UTF-8"), usedforsecurity=False
+        ).hexdigest()
+        return self.cache_path / f"{key}.json"
+
+    @staticmethod
+    def _file_state(expect_file: Path) -> dict[str, Any]:
+        stat = expect_file.stat()
+        return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+    def get(self, expect_file: Path) -> Optional[tuple[list[str], Fingerprint]]:
+        """Returns the columns and the fingerprint of the file, if cached."""
+        try:
+            entry = json.loads(self._entry_path(expect_file).read_text("UTF-8"))
+            if entry["file"] != self._file_state(expect_file):
+                return None
+            return entry["columns"], Fingerprint(**entry["fingerprint"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def set(self, expect_file: Path, columns: list[str], fingerprint: Fingerprint):
+        """Stores the fingerprint. Errors while writing are ignored."""
+        with suppress(OSError):
+            entry = {
+                "file": self._file_state(expect_file),
+                "columns": columns,
+                "fingerprint": asdict(fingerprint),
+            }
+            entry_path = self._entry_path(expect_file)
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = entry_path.with_name(f"{entry_path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(entry), encoding="UTF-8")
+            tmp_path.replace(entry_path)
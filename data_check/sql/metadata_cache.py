@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import re
+import shutil
+import threading
+from contextlib import suppress
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from sqlalchemy.engine.reflection import Inspector
+from sqlalchemy.types import TypeEngine
+
+if TYPE_CHECKING:
+    from .sql import DataCheckSql
+
+TableKey = tuple[Optional[str], str]
+
+# statements that can change the tables of the database
+DDL_PATTERN = re.compile(r"\b(create|drop|alter|rename)\b", re.IGNORECASE)
+
+
+# marks a stored column type in the cache files
+TYPE_KEY = "__type__"
+JSON_SCALARS = (str, int, float, bool, type(None))
+
+
+def is_ddl(statement: str) -> bool:
+    return bool(DDL_PATTERN.search(statement))
+
+
+def _decode_type(encoded: dict[str, Any]) -> TypeEngine:
+    """
+    Creates a column type from a cache file. Only SQLAlchemy types with
+    plain arguments are created, the files must not run any other code.
+    """
+    module_name, _, class_name = str(encoded[TYPE_KEY]).partition(":")
+    if module_name != "sqlalchemy" and not module_name.startswith("sqlalchemy."):
+        raise ValueError(f"not a SQLAlchemy type: {encoded[TYPE_KEY]}")
+    type_class = getattr(importlib.import_module(module_name), class_name)
+    if not (isinstance(type_class, type) and issubclass(type_class, TypeEngine)):
+        raise ValueError(f"not a SQLAlchemy type: {encoded[TYPE_KEY]}")
+    arguments = encoded.get("arguments", {})
+    if not all(isinstance(v, JSON_SCALARS) for v in arguments.values()):
+        raise ValueError(f"invalid arguments for {encoded[TYPE_KEY]}")
+    return type_class(**arguments)
+
+
+def _encode_type(column_type: TypeEngine) -> dict[str, Any]:
+    """
+    Stores a column type by its class and its plain arguments.
+    Raises TypeError if the type cannot be created again from them.
+    """
+    type_class = type(column_type)
+    arguments = {
+        name: getattr(column_type, name)
+        for name, parameter in inspect.signature(type_class).parameters.items()
+        if parameter.kind
+        in (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)
+        and hasattr(column_type, name)
+        and isinstance(getattr(column_type, name), JSON_SCALARS)
+    }
+    encoded = {
+        TYPE_KEY: f"{type_class.__module__}:{type_class.__qualname__}",
+        "arguments": arguments,
+    }
+    try:
+        decoded = _decode_type(encoded)
+    except (ValueError, TypeError, ImportError, AttributeError) as e:
+        raise TypeError(f"cannot store type {column_type!r}") from e
+    if repr(decoded) != repr(column_type):
+        raise TypeError(f"cannot store type {column_type!r}")
+    return encoded
+
+
+def to_json(value: Any) -> Any:
+    """Converts reflected metadata into JSON data. Raises TypeError for other data."""
+    if isinstance(value, TypeEngine):
+        return _encode_type(value)
+    if isinstance(value, dict):
+        if not all(isinstance(k, str) for k in value):
+            raise TypeError("only string keys can be stored")
+        return {k: to_json(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json(v) for v in value]
+    if isinstance(value, JSON_SCALARS):
+        return value
+    raise TypeError(f"cannot store {type(value).__name__}")
+
+
+def from_json(value: Any) -> Any:
+    """Converts JSON data from to_json back into reflected metadata."""
+    if isinstance(value, dict):
+        if TYPE_KEY in value:
+            return _decode_type(value)
+        return {k: from_json(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [from_json(v) for v in value]
+    return value
+
+
+class MetadataCache:
+    """
+    Caches the reflected metadata of tables: whether a table exists,
+    its columns, its primary key and its foreign keys.
+    The methods have the same arguments as the methods of the Inspector.
+    Missing tables are not cached, they are often created outside of data_check.
+
+    If the cache is not enabled, the metadata is reflected on each call,
+    so tables that are changed outside of data_check are never stale.
+    If cache_path is set, each table is also stored in its own JSON file,
+    so the metadata can be reused by the next run and by worker processes.
+    Tables with metadata that cannot be stored as JSON are only cached in memory.
+    Tables must be invalidated after their definition changed.
+    """
+
+    def __init__(
+        self,
+        sql: DataCheckSql,
+        cache_path: Optional[Path] = None,
+        enabled: bool = True,
+    ) -> None:
+        self.sql = sql
+        self.cache_path = cache_path
+        self.enabled = enabled
+        self._tables: dict[TableKey, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _entry_path(self, key: TableKey) -> Optional[Path]:
+        if self.cache_path is None:
+            return None
+        name = hashlib.sha1(
+            repr(key).encode("UTF-8"), usedforsecurity=False
+        ).hexdigest()
+        return self.cache_path / f"{name}.json"
+
+    def _read_entry(self, key: TableKey) -> dict[str, Any]:
+        entry_path = self._entry_path(key)
+        if entry_path is None:
+            return {}
+        try:
+            with entry_path.open(encoding="UTF-8") as f:
+                entry = from_json(json.load(f))
+        except (OSError, ValueError, TypeError, ImportError, AttributeError):
+            return {}
+        return entry if isinstance(entry, dict) else {}
+
+    def _write_entry(self, key: TableKey, entry: dict[str, Any]):
+        """Stores the entry. Errors while writing are ignored."""
+        entry_path = self._entry_path(key)
+        if entry_path is None:
+            return
+        with suppress(OSError, TypeError, ValueError):
+            content = json.dumps(to_json(entry))
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = entry_path.with_name(
+                f"{entry_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+            )
+            tmp_path.write_text(content, encoding="UTF-8")
+            tmp_path.replace(entry_path)
+
+    def _get(
+        self,
+        table_name: str,
+        schema: Optional[str],
+        kind: str,
+        reflect: Callable[[Inspector], Any],
+    ) -> Any:
+        if not self.enabled:
+            return reflect(self.sql.inspector)
+        key = (schema, table_name)
+        with self._lock:
+            entry = self._tables.get(key)
+            if entry is None:
+                entry = self._tables[key] = self._read_entry(key)
+            if kind in entry:
+                return entry[kind]
+        # errors, e.g. NoSuchTableError, are raised and not cached
+        value = reflect(self.sql.inspector)
+        if kind == "exists" and not value:
+            return value
+        with self._lock:
+            entry = self._tables.setdefault(key, {})
+            entry[kind] = value
+            self._write_entry(key, entry)
+        return value
+
+    def has_table(self, table_name: str, schema: Optional[str] = None) -> bool:
+        return self._get(
+            table_name,
+            schema,
+            "exists",
+            lambda i: i.has_table(table_name=table_name, schema=schema),
+        )
+
+    def get_columns(self, table_name: str, schema: Optional[str] = None) -> Any:
+        return self._get(
+            table_name,
+            schema,
+            "columns",
+            lambda i: i.get_columns(table_name, schema=schema),
+        )
+
+    def get_pk_constraint(self, table_name: str, schema: Optional[str] = None) -> Any:
+        return self._get(
+            table_name,
+            schema,
+            "pk_constraint",
+            lambda i: i.get_pk_constraint(table_name=table_name, schema=schema),
+        )
+
+    def get_foreign_keys(self, table_name: str, schema: Optional[str] = None) -> Any:
+        return self._get(
+            table_name,
+            schema,
+            "foreign_keys",
+            lambda i: i.get_foreign_keys(table_name, schema=schema),
+        )
+
+    def invalidate(self, table_name: str, schema: Optional[str] = None):
+        """Removes a table from the cache, e.g. after it was created or dropped."""
+        key = (schema, table_name)
+        with self._lock:
+            self._tables.pop(key, None)
+            entry_path = self._entry_path(key)
+            if entry_path is not None:
+                entry_path.unlink(missing_ok=True)
+
+    def clear(self):
+        """Removes all tables from the cache."""
+        with self._lock:
+            self._tables.clear()
+            if self.cache_path is not None:
+                shutil.rmtree(self.cache_path, ignore_errors=True)
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+@dataclass
+class PoolStatistics:
+    """
+    Counters for the connection pool of an engine.
+    """
+
+    connects: int = 0
+    """Number of new DBAPI connections opened by the pool."""
+    checkouts: int = 0
+    """Number of connections handed out by the pool."""
+    waits: int = 0
+    """Number of checkouts while all connections of the pool were in use."""
+    wait_time: float = 0.0
+    """Seconds spent waiting for a connection from the pool."""
+    reconnects: int = 0
+    """Number of invalidated connections that had to be replaced."""
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def register(self, engine: Engine):
+        """Listens to the pool events of the engine to update the counters."""
+
+        @event.listens_for(engine, "connect")
+        def _connect(dbapi_connection, connection_record):
+            _ = dbapi_connection
+            _ = connection_record
+            self.increment("connects")
+
+        @event.listens_for(engine, "checkout")
+        def _checkout(dbapi_connection, connection_record, connection_proxy):
+            _ = dbapi_connection
+            _ = connection_record
+            _ = connection_proxy
+            self.increment("checkouts")
+
+        @event.listens_for(engine, "invalidate")
+        def _invalidate(dbapi_connection, connection_record, exception):
+            _ = dbapi_connection
+            _ = connection_record
+            _ = exception
+            self.increment("reconnects")
+
+    def increment(self, counter: str, value=1):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + value)
+
+    def record_wait(self, seconds: float):
+        with self._lock:
+            self.waits += 1
+            self.wait_time += seconds
+
+    def as_dict(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "wait_time": self.wait_time,
+                "reconnects": self.reconnects,
+            }
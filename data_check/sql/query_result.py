@@ -1,24 +1,210 @@
-from typing import Optional, cast
+from collections.abc import Iterator, Sequence
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, Optional, cast
 
 import pandas as pd
-from pandas.api.types import is_string_dtype
+from pandas.api.types import (
+    infer_dtype,
+    is_datetime64_any_dtype,
+    is_object_dtype,
+    is_string_dtype,
+)
 from sqlalchemy.engine.cursor import CursorResult
-from sqlalchemy.engine.row import Row
 
 from ..date import parse_date_columns
 
+if TYPE_CHECKING:
+    import pyarrow as pa  # type: ignore
+
+# number of rows that are fetched from the database at once
+CHUNK_SIZE = 10000
+
+
+def iter_batches(
+    result: CursorResult, chunk_size: int = CHUNK_SIZE
+) -> Iterator[Sequence[Any]]:
+    """Fetches the rows of the result in batches of chunk_size rows."""
+    while rows := result.fetchmany(chunk_size):
+        yield rows
+
+
+def _convert_column(values: list[Any]) -> pd.Series:
+    # infers the same types as DataFrame.from_records with coerce_float=True
+    column = pd.Series(values, dtype=object).infer_objects()
+    if column.dtype != object:
+        return column
+    inferred_type = infer_dtype(column, skipna=True)
+    if inferred_type == "decimal":
+        return column.astype("float64")
+    if inferred_type in (
+        "mixed",
+        "mixed-integer",
+        "mixed-integer-float",
+    ):
+        not_null = column.dropna()
+        if any(isinstance(v, Decimal) for v in not_null) and all(
+            isinstance(v, (Decimal, int, float)) and not isinstance(v, bool)
+            for v in not_null
+        ):
+            column = column.astype("float64")
+    return column
+
+
+def columns_to_frame(column_names: list[str], columns: list[list[Any]]) -> pd.DataFrame:
+    """
+    Builds a DataFrame from a list of values for each column.
+    The lists are emptied while the DataFrame is built to free the values.
+    """
+    converted: dict[int, pd.Series] = {}
+    for i, values in enumerate(columns):
+        converted[i] = _convert_column(values)
+        values.clear()
+    frame = pd.DataFrame(converted, copy=False)
+    frame.columns = pd.Index(column_names, dtype=object)
+    return frame
+
+
+def rows_to_frame(column_names: list[str], rows: Sequence[Any]) -> pd.DataFrame:
+    """Builds a DataFrame from the rows, column by column."""
+    return columns_to_frame(
+        column_names, [list(c) for c in zip(*rows)] or [[] for _ in column_names]
+    )
+
+
+# range of datetime64[ns] in microseconds, like datetime values from the database
+MIN_TIMESTAMP = pd.Timestamp.min.ceil("us").to_pydatetime()
+MAX_TIMESTAMP = pd.Timestamp.max.floor("us").to_pydatetime()
+
+
+def _in_timestamp_range(column: "pa.ChunkedArray") -> bool:
+    import pyarrow.compute as pc  # type: ignore
+
+    min_max = pc.min_max(column)
+    low, high = min_max["min"].as_py(), min_max["max"].as_py()
+    return (low is None or low >= MIN_TIMESTAMP) and (
+        high is None or high <= MAX_TIMESTAMP
+    )
+
+
+def _convert_arrow_column(column: "pa.ChunkedArray") -> pd.Series:
+    """
+    Converts an Arrow column into the same type as _convert_column
+    would return for the Python values of the column.
+    Types without a matching conversion are converted through Python values.
+    """
+    import pyarrow as pa  # type: ignore
+    import pyarrow.types as pat  # type: ignore
+
+    data_type = column.type
+    if len(column) == column.null_count:
+        return pd.Series([None] * len(column), dtype=object)
+    if pat.is_integer(data_type) and not pat.is_uint64(data_type):
+        column = column.cast(pa.int64())
+    elif pat.is_floating(data_type) or pat.is_decimal(data_type):
+        column = column.cast(pa.float64())
+    elif pat.is_timestamp(data_type) and data_type.tz is None:
+        if not _in_timestamp_range(column):
+            return _convert_column(column.to_pylist())
+    elif not (
+        pat.is_boolean(data_type)
+        or pat.is_string(data_type)
+        or pat.is_large_string(data_type)
+        or pat.is_date(data_type)
+    ):
+        return _convert_column(column.to_pylist())
+    return column.to_pandas(coerce_temporal_nanoseconds=True)
+
+
+def arrow_to_frame(table: "pa.Table") -> pd.DataFrame:
+    """
+    Converts an Arrow table into a DataFrame with the same types as
+    for a result that is fetched row by row.
+    """
+    if table.num_rows == 0:
+        return columns_to_frame(table.column_names, [[] for _ in table.column_names])
+    converted = {
+        i: _convert_arrow_column(table.column(i)) for i in range(table.num_columns)
+    }
+    frame = pd.DataFrame(converted, copy=False)
+    frame.columns = pd.Index(table.column_names, dtype=object)
+    return frame
+
+
+def parse_result_dates(df: pd.DataFrame) -> tuple[list[str], pd.DataFrame]:
+    """
+    Converts the date columns of a query result to Timestamp.
+    The types of the fetched values decide about most columns:
+    datetime columns are dates, numeric and boolean columns are not.
+    Only untyped columns, e.g. text or date values, are parsed
+    like the dates in an expectation file.
+    Returns the date columns and the DataFrame, like parse_date_columns.
+    """
+    typed_dates: list[str] = []
+    untyped: list[str] = []
+    for column_name, column in df.items():
+        if is_datetime64_any_dtype(column):
+            if column.notna().any():
+                typed_dates.append(str(column_name))
+        elif is_object_dtype(column):
+            untyped.append(str(column_name))
+    parsed_dates, df = parse_date_columns(df, untyped)
+    date_columns = set(typed_dates + parsed_dates)
+    return [str(c) for c in df.columns if c in date_columns], df
+
 
 class QueryResult:
-    def __init__(self, query: str, result: Optional[CursorResult]):
+    """
+    Result of a query as a DataFrame.
+    The rows are fetched in chunks and stored by column, so the rows
+    don't need to be kept in memory while the DataFrame is built.
+    """
+
+    def __init__(
+        self,
+        query: str,
+        result: Optional[CursorResult],
+        chunk_size: int = CHUNK_SIZE,
+    ):
         self.query = query
-        self.data: list[Row] = []
         self.columns: list[str] = []
+        self._column_values: list[list[Any]] = []
+        self._arrow_table: Optional[pa.Table] = None
         self._df: Optional[pd.DataFrame] = None
         self._date_columns: list[str] = []
 
         if result is not None:
-            self.data = cast(list[Row], result.fetchall())
-            self.columns = cast(list[str], result.keys())
+            self.columns = cast(list[str], list(result.keys()))
+            self._column_values = [[] for _ in self.columns]
+            for rows in iter_batches(result, chunk_size):
+                for values, column in zip(self._column_values, zip(*rows)):
+                    values.extend(column)
+
+    @classmethod
+    def from_arrow(cls, query: str, table: "pa.Table") -> "QueryResult":
+        """Returns a QueryResult for a result that was fetched as an Arrow table."""
+        query_result = cls(query, None)
+        query_result.columns = cast(list[str], table.column_names)
+        query_result._arrow_table = table
+        return query_result
+
+    @staticmethod
+    def iter_chunks(
+        result: CursorResult, chunk_size: int = CHUNK_SIZE
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Returns the result as DataFrames with at most chunk_size rows.
+        The types and dates are inferred for each chunk,
+        like for a complete QueryResult.
+        An empty result returns a single empty DataFrame with the columns.
+        """
+        columns = cast(list[str], list(result.keys()))
+        empty = True
+        for rows in iter_batches(result, chunk_size):
+            empty = False
+            _, df = parse_result_dates(rows_to_frame(columns, rows))
+            yield df
+        if empty:
+            yield rows_to_frame(columns, [])
 
     @property
     def date_columns(self) -> list[str]:
@@ -35,11 +221,13 @@ class QueryResult:
         ]
 
     def _load_df(self):
-        # use coerce_float=True as it is used in pandas by default
-        frame = pd.DataFrame.from_records(
-            self.data, columns=self.columns, coerce_float=True
-        )
-        date_cols, df = parse_date_columns(frame)
+        if self._arrow_table is not None:
+            frame = arrow_to_frame(self._arrow_table)
+            self._arrow_table = None
+        else:
+            frame = columns_to_frame(self.columns, self._column_values)
+            self._column_values = []
+        date_cols, df = parse_result_dates(frame)
         self._date_columns = date_cols
         self._df = df
 
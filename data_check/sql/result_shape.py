@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+import pandas as pd
+from pandas.api.types import is_object_dtype, is_string_dtype
+
+# the shape check compares the columns and the number of rows,
+# "nulls" also compares the number of values in each column
+SHAPE_CHECK_MODES = ("off", "rows", "nulls")
+
+
+@dataclass(frozen=True)
+class ResultShape:
+    """
+    Shape of a result: the columns, the number of rows and optionally
+    the number of values in each column that are not NULL.
+    """
+
+    columns: tuple[str, ...]
+    row_count: int
+    value_counts: Optional[tuple[int, ...]] = None
+
+
+def dataframe_shape(df: pd.DataFrame, value_counts: bool = False) -> ResultShape:
+    """
+    Shape of a DataFrame, e.g. read from an expectation file.
+    Empty strings are not counted as values, like in the comparison.
+    """
+    counts: Optional[tuple[int, ...]] = None
+    if value_counts:
+        counts = tuple(
+            int((column.notna() & (column != "")).sum())
+            if is_object_dtype(column.dtype) or is_string_dtype(column.dtype)
+            else int(column.notna().sum())
+            for _, column in df.items()
+        )
+    return ResultShape(
+        columns=tuple(str(c) for c in df.columns),
+        row_count=len(df),
+        value_counts=counts,
+    )
+
+
+def is_far_apart(count_1: int, count_2: int, ratio: float) -> bool:
+    """Returns whether the larger count is at least ratio times the smaller one."""
+    return max(count_1, count_2) >= ratio * max(min(count_1, count_2), 1)
+
+
+def shape_differences(
+    query_shape: ResultShape, expected_shape: ResultShape, ratio: float
+) -> list[str]:
+    """
+    Returns the obvious differences between both shapes: different columns
+    and counts that differ by at least the ratio. The results must be
+    compared as usual if there are no such differences.
+    """
+    differences: list[str] = []
+    query_only = [c for c in query_shape.columns if c not in expected_shape.columns]
+    expected_only = [c for c in expected_shape.columns if c not in query_shape.columns]
+    if query_only:
+        differences.append(f"columns only in the query: {', '.join(query_only)}")
+    if expected_only:
+        differences.append(
+            f"columns only in the expectation: {', '.join(expected_only)}"
+        )
+    if is_far_apart(query_shape.row_count, expected_shape.row_count, ratio):
+        differences.append(
+            f"{query_shape.row_count} rows in the query, "
+            f"{expected_shape.row_count} expected"
+        )
+    if query_shape.value_counts is None or expected_shape.value_counts is None:
+        return differences
+    expected_counts = dict(zip(expected_shape.columns, expected_shape.value_counts))
+    for column, count in zip(query_shape.columns, query_shape.value_counts):
+        expected_count = expected_counts.get(column)
+        if expected_count is not None and is_far_apart(count, expected_count, ratio):
+            differences.append(
+                f"{count} values in column {column} in the query, "
+                f"{expected_count} expected"
+            )
+    return differences
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Optional, cast
+from uuid import uuid4
+
+import pandas as pd
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import text
+
+from .query_result import QueryResult
+
+if TYPE_CHECKING:
+    from .sql import DataCheckSql
+
+ROW_COLUMN = "_dc_row"
+
+
+@dataclass
+class ServerSideDiff:
+    """
+    Result of comparing a query with an expectation inside the database.
+    """
+
+    db_only: QueryResult
+    """Rows of the query that are not in the expectation."""
+    expected_only: list[int]
+    """Positions of the rows of the expectation that are not in the query result."""
+    db_row_count: int
+    """Number of rows returned by the query."""
+
+
+def _expectation_parameters(
+    expect_df: pd.DataFrame, param_names: list[str]
+) -> list[dict[str, Any]]:
+    values = expect_df.astype(object).where(expect_df.notna(), None)
+    return [
+        {**dict(zip(param_names, row)), ROW_COLUMN: i}
+        for i, row in enumerate(values.itertuples(index=False, name=None))
+    ]
+
+
+class ServerSideDiffRunner:
+    """
+    Compares a query with an expectation DataFrame inside the database.
+    The expectation is loaded into a temporary table and only the rows
+    that differ are fetched.
+
+    Rows are compared like pandas.merge does: a row is only different
+    if no row with the same values exists on the other side.
+    All statements run on a single connection, as temporary tables
+    are only visible to the connection that created them.
+    """
+
+    def __init__(self, sql: DataCheckSql) -> None:
+        self.sql = sql
+
+    def _match_condition(
+        self, columns: list[str], date_columns: list[str], left: str, right: str
+    ) -> str:
+        if not columns:
+            return "1 = 1"
+        conditions: list[str] = []
+        for c in columns:
+            left_column, right_column = f"{left}.{c}", f"{right}.{c}"
+            if c in date_columns:
+                # dates are compared as timestamps, like in the client side comparison
+                conditions.append(
+                    self.sql.null_safe_equal(
+                        self.sql.date_expression(left_column),
+                        self.sql.date_expression(right_column),
+                    )
+                    + f" AND ({left_column} IS NULL) = ({right_column} IS NULL)"
+                )
+            else:
+                conditions.append(self.sql.null_safe_equal(left_column, right_column))
+        return " AND ".join(f"({c})" for c in conditions)
+
+    def _empty_strings_to_null(
+        self, connection: Connection, table: str, columns: list[str]
+    ):
+        # same as for the client side comparison: empty strings are treated as NULL
+        string_type = self.sql.string_cast_type()
+        assignments = ", ".join(
+            f"{c} = CASE WHEN CAST({c} AS {string_type}) = '' THEN NULL ELSE {c} END"
+            for c in columns
+        )
+        connection.execute(text(f"UPDATE {table} SET {assignments}"))
+
+    def _create_query_table(
+        self, connection: Connection, table: str, query: str, params: dict[str, Any]
+    ) -> list[str]:
+        """Stores the query result in a table and returns its columns."""
+        self.sql.execute_query(
+            connection,
+            self.sql.create_temp_table_statement(
+                table, f"SELECT * FROM {self.sql.as_subquery(query)} q"
+            ),
+            params,
+        )
+        result = connection.execute(text(f"SELECT * FROM {table} WHERE 1 = 0"))
+        return cast(list[str], list(result.keys()))
+
+    def _create_expect_table(
+        self,
+        connection: Connection,
+        table: str,
+        query_table: str,
+        expect_df: pd.DataFrame,
+    ):
+        """Loads the expectation into a table with the same columns as the query
+        and an additional column for the position of the row.
+        """
+        preparer = connection.dialect.identifier_preparer
+        columns = [preparer.quote(str(col)) for col in expect_df.columns]
+        column_types = self.sql.diff_column_types(connection, query_table, columns)
+        if column_types is None:
+            statement = self.sql.create_temp_table_statement(
+                table,
+                f"SELECT q.*, 0 AS {ROW_COLUMN} FROM {query_table} q WHERE 1 = 0",
+            )
+        else:
+            column_definitions = ", ".join(
+                f"{c} {t}" for c, t in zip(columns, column_types)
+            )
+            statement = (
+                f"CREATE TEMPORARY TABLE {table} "
+                f"({column_definitions}, {ROW_COLUMN} INTEGER)"
+            )
+        connection.execute(text(statement))
+        param_names = [f"p{i}" for i in range(len(columns))]
+        insert_columns = ", ".join([*columns, ROW_COLUMN])
+        insert_values = ", ".join(f":{p}" for p in [*param_names, ROW_COLUMN])
+        parameters = _expectation_parameters(expect_df, param_names)
+        if parameters:
+            connection.execute(
+                text(
+                    f"INSERT INTO {table} ({insert_columns}) VALUES ({insert_values})"
+                ),
+                parameters,
+            )
+
+    def _diff(
+        self,
+        connection: Connection,
+        query_table: str,
+        expect_table: str,
+        columns: list[str],
+        date_columns: list[str],
+    ) -> ServerSideDiff:
+        match_condition = self._match_condition(columns, date_columns, "q", "e")
+        db_row_count = connection.execute(
+            text(f"SELECT COUNT(*) FROM {query_table}")
+        ).scalar()
+        db_only_query = (
+            f"SELECT q.* FROM {query_table} q WHERE NOT EXISTS "
+            f"(SELECT 1 FROM {expect_table} e WHERE {match_condition})"
+        )
+        db_only = QueryResult(db_only_query, connection.execute(text(db_only_query)))
+        expected_only = connection.execute(
+            text(
+                f"SELECT e.{ROW_COLUMN} FROM {expect_table} e WHERE NOT EXISTS "
+                f"(SELECT 1 FROM {query_table} q WHERE {match_condition}) "
+                f"ORDER BY e.{ROW_COLUMN}"
+            )
+        ).fetchall()
+        return ServerSideDiff(
+            db_only=db_only,
+            expected_only=[int(r[0]) for r in expected_only],
+            db_row_count=int(cast(int, db_row_count)),
+        )
+
+    def run(
+        self,
+        query: str,
+        params: dict[str, Any],
+        expect_df: pd.DataFrame,
+        date_columns: list[str],
+    ) -> Optional[ServerSideDiff]:
+        """
+        Returns None if the columns of the query and the expectation differ.
+        The values of expect_df should be strings, so the database
+        converts them into the types of the query columns.
+        date_columns are compared as timestamps.
+        """
+        suffix = uuid4().hex[:12]
+        query_table = f"dc_q_{suffix}"
+        expect_table = f"dc_e_{suffix}"
+        created: list[str] = []
+        with self.sql.conn() as c:
+            try:
+                query_columns = self._create_query_table(c, query_table, query, params)
+                created.append(query_table)
+                if sorted(query_columns) != sorted(map(str, expect_df.columns)):
+                    return None
+                self._create_expect_table(c, expect_table, query_table, expect_df)
+                created.append(expect_table)
+
+                preparer = c.dialect.identifier_preparer
+                columns = [preparer.quote(col) for col in query_columns]
+                if columns:
+                    self._empty_strings_to_null(c, query_table, columns)
+                self.sql.prepare_diff_table(c, query_table, columns)
+                self.sql.prepare_diff_table(c, expect_table, columns)
+                return self._diff(
+                    c,
+                    query_table,
+                    expect_table,
+                    columns,
+                    [preparer.quote(col) for col in date_columns],
+                )
+            finally:
+                for table in reversed(created):
+                    c.execute(text(self.sql.get_drop_table_statement(table)))
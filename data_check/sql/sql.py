@@ -1,19 +1,24 @@
-from collections.abc import Iterator, Sequence
+import hashlib
+import threading
+from collections.abc import Generator, Iterator, Sequence
 from contextlib import contextmanager, suppress
 from functools import cached_property
 from os import path
 from pathlib import Path
-from time import sleep, time
-from typing import Any, Optional, Union, cast
+from time import perf_counter, sleep, time
+from typing import TYPE_CHECKING, Any, Optional, Union, cast
+from uuid import uuid4
 
 import pandas as pd
 from sqlalchemy import create_engine, inspect
 from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.engine.cursor import CursorResult
+from sqlalchemy.engine.default import DefaultDialect
 from sqlalchemy.engine.reflection import Inspector
 from sqlalchemy.engine.row import Row
+from sqlalchemy.engine.url import make_url
 from sqlalchemy.exc import ProgrammingError
-from sqlalchemy.pool import SingletonThreadPool
+from sqlalchemy.pool import Pool, QueuePool, SingletonThreadPool
 from sqlalchemy.sql import text
 from sqlalchemy.sql.elements import TextClause
 from sqlalchemy.sql.expression import bindparam
@@ -21,12 +26,31 @@ from sqlalchemy.sql.expression import bindparam
 from data_check.config import DataCheckConfig
 
 from ..exceptions import DataCheckError
-from ..file_ops import print_csv, write_csv
+from ..file_ops import print_csv, write_file
 from ..output import DataCheckOutput
 from ..runner import DataCheckRunner
-from .query_result import QueryResult
+from .fingerprint import HASH_DIGITS, Fingerprint
+from .metadata_cache import MetadataCache, is_ddl
+from .pool_statistics import PoolStatistics
+from .query_result import (
+    CHUNK_SIZE,
+    QueryResult,
+    parse_result_dates,
+    rows_to_frame,
+)
+from .result_shape import ResultShape
+from .server_side_diff import ServerSideDiff, ServerSideDiffRunner
 from .table_loader import TableLoader
 
+if TYPE_CHECKING:
+    import pyarrow as pa  # type: ignore
+
+# Engines of DataCheckSql instances that were sent to a worker process.
+# Each task unpickles a new copy of the instance, so the engine is kept here
+# to create only a single engine per instance and process.
+_process_engines: dict[str, Engine] = {}
+_engine_lock = threading.Lock()
+
 
 class DataCheckSql:
     def __init__(
@@ -39,6 +63,11 @@ class DataCheckSql:
         self.connection = connection
         self.__connection: Optional[Connection] = None
         self.__engine: Optional[Engine] = None
+        self._engine_key = uuid4().hex
+        self._in_worker_process = False
+        self.pool_statistics = PoolStatistics()
+        # overflow connections of the shared engine, None if the pool has no overflow
+        self.max_overflow: Optional[int] = None
 
         if output is None:
             output = DataCheckOutput()
@@ -53,6 +82,29 @@ class DataCheckSql:
                 workers=1, output=self.output, use_process=self.config.use_process
             )
         self.runner = runner
+        if self.runner.use_process:
+            self.runner.process_initializer = self.init_worker_process
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Engines and connections cannot be pickled.
+        # Worker processes create their own engine instead.
+        state = self.__dict__.copy()
+        state["_DataCheckSql__connection"] = None
+        state["_DataCheckSql__engine"] = None
+        del state["pool_statistics"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]):
+        self.__dict__.update(state)
+        self._in_worker_process = True
+        self.pool_statistics = PoolStatistics()
+
+    def init_worker_process(self):
+        """
+        Initializer for worker processes to create the engine of the process
+        before the first task is run.
+        """
+        self.get_engine()
 
     @cached_property
     def table_loader(self) -> TableLoader:
@@ -61,49 +113,113 @@ class DataCheckSql:
         """
         return TableLoader(self, self.output, self.config.default_load_mode)
 
+    @cached_property
+    def metadata(self) -> MetadataCache:
+        """
+        Cache of the reflected tables. The cache is only used and stored
+        for the next runs if metadata_cache is set in the configuration.
+        """
+        cache_path = None
+        if self.config.metadata_cache:
+            key = hashlib.sha1(
+                path.expandvars(self.connection).encode("UTF-8"),
+                usedforsecurity=False,
+            ).hexdigest()
+            cache_path = self.config.metadata_path / key
+        return MetadataCache(self, cache_path, enabled=self.config.metadata_cache)
+
     def get_db_params(self) -> dict[str, Any]:
         """
         Return parameter specific to a database.
         """
         return {}  # no special parameters needed for now
 
-    def keep_connection(self):
-        # Do not keep the connection if runner has more than 1 workers.
-        # Cannot pickle otherwise.
-        return self.runner.workers == 1
+    def get_pool_params(self) -> dict[str, Any]:
+        """
+        Return the parameters for the connection pool of the engine.
+        The pool is sized to the number of parallel workers.
+        """
+        url = make_url(path.expandvars(self.connection))
+        dialect = cast(type[DefaultDialect], url.get_dialect())
+        pool_class = dialect.get_pool_class(url)
+        workers = max(self.runner.workers, 1)
+        if issubclass(pool_class, SingletonThreadPool):
+            # one connection per worker thread and the main thread
+            return {"poolclass": SingletonThreadPool, "pool_size": workers + 1}
+        if issubclass(pool_class, QueuePool):
+            # allow an additional connection per worker for nested calls,
+            # e.g. reflecting a table while loading it
+            return {
+                "poolclass": QueuePool,
+                "pool_size": workers,
+                "max_overflow": workers,
+            }
+        return {"poolclass": pool_class}
+
+    def _create_engine(self, extra_params: dict[str, Any]) -> Engine:
+        engine = create_engine(
+            path.expandvars(self.connection),
+            **{**self.get_pool_params(), **self.get_db_params(), **extra_params},
+        )
+        self.post_get_engine_hook(engine)
+        return engine
 
     def get_engine(self, extra_params: Optional[dict[str, Any]] = None) -> Engine:
         """
         Return the database engine for the connection.
+        The engine is created once per process and shared by all threads.
+        If extra_params are given, a new engine is returned that is not cached.
         """
         # ignore unclosed SSLSocket ResourceWarning for Databricks
         import warnings
 
-        if extra_params is None:
-            extra_params = {}
         warnings.filterwarnings(
             action="ignore", message="unclosed", category=ResourceWarning
         )
 
+        if extra_params:
+            return self._create_engine(extra_params)
+
         if self.__engine is None:
-            _engine = create_engine(
-                path.expandvars(self.connection),
-                **{**self.get_db_params(), **extra_params},
-                poolclass=SingletonThreadPool,
-            )
-            self.post_get_engine_hook(_engine)
-            if self.keep_connection():
-                self.__engine = _engine
-            else:
-                return _engine
-        return self.__engine
+            with _engine_lock:
+                self.max_overflow = self.get_pool_params().get("max_overflow")
+                if self._in_worker_process:
+                    engine = _process_engines.get(self._engine_key)
+                    if engine is None:
+                        engine = self._create_engine({})
+                        self.pool_statistics.register(engine)
+                        _process_engines[self._engine_key] = engine
+                    self.__engine = engine
+                elif self.__engine is None:
+                    engine = self._create_engine({})
+                    self.pool_statistics.register(engine)
+                    self.__engine = engine
+        return cast(Engine, self.__engine)
 
     def post_get_engine_hook(self, engine: Engine):
         pass
 
+    def pool_exhausted(self, pool: Pool) -> bool:
+        """
+        Returns whether all connections of the pool are in use, including
+        the overflow connections, so the next checkout has to wait.
+        """
+        if self.max_overflow is None or not isinstance(pool, QueuePool):
+            return False
+        return pool.checkedout() >= pool.size() + self.max_overflow
+
+    def _connect(self, engine: Engine) -> Connection:
+        pool = engine.pool
+        if self.pool_exhausted(pool):
+            start = perf_counter()
+            connection = engine.connect()
+            self.pool_statistics.record_wait(perf_counter() - start)
+            return connection
+        return engine.connect()
+
     @contextmanager
     def conn(self) -> Iterator[Connection]:
-        with self.get_engine().connect() as c:
+        with self._connect(self.get_engine()) as c:
             yield c
             c.commit()
 
@@ -113,8 +229,10 @@ class DataCheckSql:
                 self.__connection.close()
             self.__connection = None
         if self.__engine:
-            with suppress(ProgrammingError):
-                self.__engine.dispose(close=False)
+            # the engine of a worker process is shared by all tasks in the process
+            if not self._in_worker_process:
+                with suppress(ProgrammingError):
+                    self.__engine.dispose(close=False)
             self.__engine = None
 
     def __del__(self):
@@ -147,6 +265,32 @@ class DataCheckSql:
             sql = sql.bindparams(bindparam(bp, expanding=True))
         return sql
 
+    @staticmethod
+    def as_subquery(query: str) -> str:
+        """Returns the query in parentheses, to use it in a FROM clause."""
+        # a trailing semicolon is not allowed in a subquery
+        # and a trailing comment would comment out the closing parenthesis
+        return f"({query.strip().rstrip(';')}\n)"
+
+    def execute_query(
+        self,
+        connection: Connection,
+        query: str,
+        params: dict[str, Any],
+        chunk_size: Optional[int] = None,
+    ) -> CursorResult:
+        """
+        Executes the query with the parameters on the given connection.
+        If chunk_size is given, the rows are streamed from the database
+        in chunks, if the driver supports it.
+        """
+        sql = self._bindparams(query)
+        if chunk_size:
+            sql = sql.execution_options(yield_per=chunk_size)
+        if self.use_parameters():
+            return connection.execute(sql, parameters=params)
+        return connection.execute(sql)
+
     def run_query_with_result(
         self, query: str, params: Optional[dict[str, Any]] = None
     ) -> QueryResult:
@@ -154,13 +298,47 @@ class DataCheckSql:
             params = {}
         if not self.connection:
             raise DataCheckError(f"undefined connection: {self.connection}")
-        sql = self._bindparams(query)
         with self.conn() as c:
-            if self.use_parameters():
-                result = QueryResult(query, c.execute(sql, parameters=params))
-            else:
-                result = QueryResult(query, c.execute(sql))
-        return result
+            if self.supports_arrow():
+                cursor_result = self.execute_query(c, query, params)
+                arrow_table = self.fetch_arrow(cursor_result)
+                if arrow_table is not None:
+                    return QueryResult.from_arrow(query, arrow_table)
+                return QueryResult(query, cursor_result)
+            return QueryResult(
+                query, self.execute_query(c, query, params, chunk_size=CHUNK_SIZE)
+            )
+
+    def supports_arrow(self) -> bool:
+        """Whether the results of queries can be fetched as Arrow tables."""
+        return False
+
+    def fetch_arrow(self, result: CursorResult) -> Optional["pa.Table"]:
+        """
+        Fetches all rows of the result as an Arrow table.
+        Returns None without fetching any rows, if the result must be
+        fetched row by row instead, e.g. for unsupported column types.
+        """
+        return None
+
+    def run_query_chunks(
+        self,
+        query: str,
+        params: Optional[dict[str, Any]] = None,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> Generator[pd.DataFrame, None, None]:
+        """
+        Runs a query and returns the result as DataFrames with at most chunk_size
+        rows. The connection is used until all chunks are read
+        or the generator is closed.
+        """
+        if params is None:
+            params = {}
+        if not self.connection:
+            raise DataCheckError(f"undefined connection: {self.connection}")
+        with self.conn() as c:
+            result = self.execute_query(c, query, params, chunk_size=chunk_size)
+            yield from QueryResult.iter_chunks(result, chunk_size)
 
     def _try_connect(self, engine) -> bool:
         try:
@@ -223,12 +401,19 @@ class DataCheckSql:
                 )
             else:
                 result = connection.execute(sq_text.execution_options())
+        if is_ddl(query):
+            # the statement might have changed any table
+            self.metadata.clear()
         try:
             res: Sequence[Row] = result.fetchall()
             columns: list[str] = list(result.keys())
-            df = pd.DataFrame(data=res, columns=columns)
+            if output and Path(output).suffix.lower() == ".parquet":
+                # Parquet files keep the types, like the result of a check
+                _, df = parse_result_dates(rows_to_frame(columns, res))
+            else:
+                df = pd.DataFrame(data=res, columns=columns)
             if output:
-                write_csv(
+                write_file(
                     df, output=output, base_path=base_path, sort_output=sort_output
                 )
             else:
@@ -252,3 +437,131 @@ class DataCheckSql:
 
     def get_drop_table_statement(self, table_name: str) -> str:
         return f"DROP TABLE {table_name}"
+
+    def supports_fingerprint(self) -> bool:
+        """Whether query_fingerprint can be used with this database."""
+        return False
+
+    def hash_sum_expression(self, columns: list[str]) -> str:
+        """
+        Returns an aggregate expression for the sum of the hashes of all rows.
+        The hash of a row must be the same as fingerprint.row_hash.
+        """
+        values = ", ".join(
+            f"COALESCE(NULLIF(CAST({c} AS VARCHAR), ''), chr(30))" for c in columns
+        )
+        return (
+            f"SUM(CAST(('0x' || substr(md5(concat_ws(chr(31), {values})), "
+            f"1, {HASH_DIGITS})) AS BIGINT))"
+        )
+
+    def query_fingerprint(
+        self, query: str, params: dict[str, Any], columns: list[str]
+    ) -> Optional[Fingerprint]:
+        """
+        Computes the fingerprint of the query result in the database.
+        The hashes of the rows are computed with the values in the order of columns.
+        Returns None if the query doesn't have the same columns.
+        """
+        subquery = self.as_subquery(query)
+        with self.conn() as c:
+            query_columns = self.execute_query(
+                c, f"SELECT * FROM {subquery} q WHERE 1 = 0", params
+            ).keys()
+            if sorted(query_columns) != sorted(columns):
+                return None
+            preparer = c.dialect.identifier_preparer
+            hash_sum = self.hash_sum_expression(
+                [f"q.{preparer.quote(col)}" for col in columns]
+            )
+            row_count, row_hash_sum = self.execute_query(
+                c, f"SELECT COUNT(*), {hash_sum} FROM {subquery} q", params
+            ).one()
+        return Fingerprint(row_count=int(row_count), hash_sum=int(row_hash_sum or 0))
+
+    def query_shape(
+        self, query: str, params: dict[str, Any], value_counts: bool = False
+    ) -> ResultShape:
+        """
+        Returns the columns and the number of rows of the query result
+        without fetching it. With value_counts, the values that are not NULL
+        or empty strings are counted for each column.
+        """
+        subquery = self.as_subquery(query)
+        with self.conn() as c:
+            query_columns = self.execute_query(
+                c, f"SELECT * FROM {subquery} q WHERE 1 = 0", params
+            ).keys()
+            columns = [str(col) for col in query_columns]
+            preparer = c.dialect.identifier_preparer
+            counts = ["COUNT(*)"]
+            if value_counts:
+                counts.extend(
+                    self.value_count_expression(f"q.{preparer.quote(col)}")
+                    for col in columns
+                )
+            row = self.execute_query(
+                c, f"SELECT {', '.join(counts)} FROM {subquery} q", params
+            ).one()
+        return ResultShape(
+            columns=tuple(columns),
+            row_count=int(row[0]),
+            value_counts=tuple(int(v) for v in row[1:]) if value_counts else None,
+        )
+
+    def value_count_expression(self, column: str) -> str:
+        """
+        Returns an expression that counts the values of the column like the
+        comparison does: NULL and empty strings are not counted. Other types
+        are cast to strings, they are never empty then.
+        """
+        return f"COUNT(NULLIF(CAST({column} AS {self.string_cast_type()}), ''))"
+
+    def supports_server_side_diff(self) -> bool:
+        """Whether checks can be compared inside the database."""
+        return False
+
+    def server_side_diff(
+        self,
+        query: str,
+        params: dict[str, Any],
+        expect_df: pd.DataFrame,
+        date_columns: Optional[list[str]] = None,
+    ) -> Optional[ServerSideDiff]:
+        """
+        Compares the query with the expectation inside the database.
+        Returns None if the columns of the query and the expectation differ.
+        """
+        return ServerSideDiffRunner(self).run(
+            query, params, expect_df, date_columns or []
+        )
+
+    def null_safe_equal(self, left: str, right: str) -> str:
+        """Returns an expression that is true if both sides are equal or NULL."""
+        return f"{left} IS NOT DISTINCT FROM {right}"
+
+    def date_expression(self, expression: str) -> str:
+        """Returns an expression that converts a date or a string to a timestamp."""
+        return f"CAST({expression} AS TIMESTAMP)"
+
+    def diff_column_types(
+        self, connection: Connection, table_name: str, columns: list[str]
+    ) -> Optional[list[str]]:
+        """
+        Returns the column types for the expectation table of a server side diff.
+        If None is returned, the types of the query columns are used.
+        """
+        return None
+
+    def string_cast_type(self) -> str:
+        """Returns the type to cast any value to a string."""
+        return "VARCHAR"
+
+    def create_temp_table_statement(self, table_name: str, select: str) -> str:
+        return f"CREATE TEMPORARY TABLE {table_name} AS {select}"
+
+    def prepare_diff_table(
+        self, connection: Connection, table_name: str, columns: list[str]
+    ):
+        """This hook is executed for the temporary tables before they are compared."""
+        pass
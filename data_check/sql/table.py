@@ -5,8 +5,9 @@ from dataclasses import dataclass
 from functools import cached_property
 from typing import Any, Optional
 
-from sqlalchemy import MetaData, text
+from sqlalchemy import Column, Computed, DefaultClause, Identity, MetaData, text
 from sqlalchemy import Table as SQLTable
+from sqlalchemy.engine import Connection
 from sqlalchemy.exc import NoSuchTableError
 
 from data_check.sql.sql import DataCheckSql
@@ -33,9 +34,10 @@ class Table:
             drop_stmt = self.sql.get_drop_table_statement(self.full_name)
             with self.sql.conn() as connection:
                 connection.execute(text(drop_stmt))
+            self.sql.metadata.invalidate(self.name, self.schema)
 
     def exists(self) -> bool:
-        return self.sql.inspector.has_table(table_name=self.name, schema=self.schema)
+        return self.sql.metadata.has_table(table_name=self.name, schema=self.schema)
 
     @property
     def full_name(self) -> str:
@@ -49,10 +51,15 @@ class Table:
     def _truncate_statement(self) -> str:
         return self.sql.get_truncate_table_statement(self.full_name)
 
-    def truncate_if_exists(self):
-        if self.exists():
-            with self.sql.conn() as connection:
-                connection.execute(text(self._truncate_statement()))
+    def truncate_if_exists(self, connection: Optional[Connection] = None):
+        """Truncates the table, in the transaction of the connection if given."""
+        if not self.exists():
+            return
+        if connection is not None:
+            connection.execute(text(self._truncate_statement()))
+            return
+        with self.sql.conn() as c:
+            c.execute(text(self._truncate_statement()))
 
     @staticmethod
     def from_table_name(sql: DataCheckSql, table_name: str) -> Table:
@@ -64,26 +71,66 @@ class Table:
 
     @cached_property
     def primary_keys(self) -> list[str]:
-        pk_constraint = self.sql.inspector.get_pk_constraint(
+        pk_constraint = self.sql.metadata.get_pk_constraint(
             table_name=self.name, schema=self.schema
         )
         return pk_constraint["constrained_columns"]
 
     @cached_property
     def sql_table(self) -> SQLTable:
-        metadata = MetaData()
-        with self.sql.conn() as c:
-            table = SQLTable(
-                self.name,
-                metadata,
-                autoload_with=c,
-                schema=self.schema,
+        """The table with its columns and primary key from the reflected metadata."""
+        return SQLTable(
+            self.name,
+            MetaData(),
+            *[self.reflected_column(c) for c in self.columns],
+            schema=self.schema,
+        )
+
+    def reflected_column(self, column: dict[str, Any]) -> Column:
+        """
+        Creates the column from its reflection like the Inspector does,
+        keeping its default, identity and autoincrement.
+        """
+        column_args: list[Any] = []
+        if column.get("default") is not None:
+            column_args.append(DefaultClause(text(column["default"]), _reflected=True))
+        if "computed" in column:
+            column_args.append(Computed(**column["computed"]))
+        if "identity" in column:
+            column_args.append(Identity(**column["identity"]))
+        column_kw = {
+            k: column[k]
+            for k in ("nullable", "autoincrement", "comment")
+            if k in column
+        }
+        column_kw.update(column.get("dialect_options", {}))
+        return Column(
+            column["name"],
+            column["type"],
+            *column_args,
+            primary_key=column["name"] in self.primary_keys,
+            **column_kw,
+        )
+
+    @cached_property
+    def referred_tables(self) -> list[Table]:
+        """Tables that are referred to by the foreign keys of this table."""
+        try:
+            foreign_keys = self.sql.metadata.get_foreign_keys(self.name, self.schema)
+        except NoSuchTableError:
+            return []
+        return [
+            Table(
+                self.sql,
+                fk["referred_table"].lower(),
+                fk["referred_schema"].lower() if fk["referred_schema"] else None,
             )
-            return table
+            for fk in foreign_keys
+        ]
 
     @cached_property
     def columns(self):
-        return self.sql.inspector.get_columns(self.name, schema=self.schema)
+        return self.sql.metadata.get_columns(self.name, schema=self.schema)
 
     @cached_property
     def column_types(self):
@@ -1,19 +1,80 @@
 from __future__ import annotations
 
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from graphlib import CycleError, TopologicalSorter
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Literal, Optional, Union, cast
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Callable, Literal, Optional, Union, cast
+from uuid import uuid4
 
 import pandas as pd
+from sqlalchemy import (
+    Column,
+    MetaData,
+    and_,
+    exists,
+    func,
+    inspect,
+    select,
+    text,
+    true,
+)
+from sqlalchemy import Table as SQLTable
 from sqlalchemy.engine import Connection
-from sqlalchemy.sql.expression import bindparam
+from sqlalchemy.sql.expression import Executable, bindparam
 
 if TYPE_CHECKING:
     from data_check.output import DataCheckOutput
     from data_check.sql import ColumnInfo, DataCheckSql, Table
 
-from ..file_ops import expand_files, read_csv
+from ..file_ops import (
+    CSV_SUFFIXES,
+    csv_partitions,
+    expand_files,
+    file_stem,
+    is_csv_file,
+    read_csv,
+    read_csv_chunks,
+    read_parquet,
+    read_parquet_chunks,
+)
 from ..utils.deprecation import deprecated_method_argument
 from .load_mode import LoadMode
+from .query_result import CHUNK_SIZE
+
+# signature of the method argument of DataFrame.to_sql:
+# (pandas SQLTable, connection, column names, rows) -> number of inserted rows
+InsertMethod = Callable[[Any, Connection, list[str], Iterable[tuple]], Optional[int]]
+
+# positional placeholders for the paramstyles of DBAPI drivers
+PARAMSTYLE_PLACEHOLDERS = {"qmark": "?", "format": "%s", "pyformat": "%s"}
+
+
+@dataclass
+class UpsertResult:
+    """Number of rows that were inserted and updated by an upsert."""
+
+    inserted: int = 0
+    updated: int = 0
+
+    def add(self, other: UpsertResult):
+        self.inserted += other.inserted
+        self.updated += other.updated
+
+
+def read_ahead(chunks: Iterator[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+    """
+    Reads the next chunk in a background thread while the current chunk
+    is processed. At most two chunks are held in memory.
+    """
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        next_chunk = executor.submit(next, chunks, None)
+        while (chunk := next_chunk.result()) is not None:
+            next_chunk = executor.submit(next, chunks, None)
+            yield chunk
 
 
 class TableLoader:
@@ -21,6 +82,13 @@ class TableLoader:
     Helper class that implements the methods to load a table from a CSV file.
     """
 
+    # prefix of the name of the staging table for upserts
+    staging_table_prefix = ""
+    # regular staging tables are used if the database has no temporary tables
+    temporary_staging_table = True
+    # partitions of a file can be inserted concurrently into the same table
+    parallel_load = True
+
     def __init__(
         self, sql: DataCheckSql, output: DataCheckOutput, default_load_mode: LoadMode
     ):
@@ -57,7 +125,119 @@ class TableLoader:
             dtype = None
         return dtype
 
-    def upsert_data(self, data: pd.DataFrame, table: Table) -> bool:
+    def staging_table(self, table: Table, columns: list[str]) -> SQLTable:
+        """
+        Returns the table that the data is loaded into before it is upserted.
+        It has the given columns of the table and is dropped after the upsert.
+        """
+        return SQLTable(
+            f"{self.staging_table_prefix}dc_upsert_{uuid4().hex[:12]}",
+            MetaData(),
+            *[
+                Column(c.name, c.type)
+                for c in table.sql_table.columns
+                if c.name in columns
+            ],
+            prefixes=["TEMPORARY"] if self.temporary_staging_table else [],
+        )
+
+    def upsert_statement(self, table: Table, staging: SQLTable) -> Optional[Executable]:
+        """
+        Returns a single statement that inserts or updates the rows of the staging
+        table in the table, based on its primary keys.
+        If None is returned, the rows are upserted one by one.
+        """
+        _ = table
+        _ = staging
+        return None
+
+    @staticmethod
+    def on_conflict_upsert_statement(
+        insert, table: Table, staging: SQLTable
+    ) -> Executable:
+        """
+        INSERT ... ON CONFLICT statement for the insert function of
+        the SQLite or PostgreSQL dialect.
+        """
+        columns = [c.name for c in staging.columns]
+        # "WHERE true" avoids a parsing ambiguity of INSERT ... SELECT in SQLite
+        stmt = insert(table.sql_table).from_select(
+            columns, select(staging).where(true())
+        )
+        other_columns = [c for c in columns if c not in table.primary_keys]
+        if not other_columns:
+            return stmt.on_conflict_do_nothing(index_elements=table.primary_keys)
+        return stmt.on_conflict_do_update(
+            index_elements=table.primary_keys,
+            set_={c: stmt.excluded[c] for c in other_columns},
+        )
+
+    def merge_upsert_statement(
+        self, table: Table, staging: SQLTable, terminator: str = ""
+    ) -> Executable:
+        """MERGE statement for the databases that support it."""
+        preparer = self.sql.get_engine().dialect.identifier_preparer
+        columns = [preparer.quote(c.name) for c in staging.columns]
+        keys = [preparer.quote(p) for p in table.primary_keys]
+        on_condition = " AND ".join(f"t.{k} = s.{k}" for k in keys)
+        when_matched = ""
+        if other_columns := [c for c in columns if c not in keys]:
+            assignments = ", ".join(f"t.{c} = s.{c}" for c in other_columns)
+            when_matched = f" WHEN MATCHED THEN UPDATE SET {assignments}"
+        return text(
+            f"MERGE INTO {preparer.format_table(table.sql_table)} t "
+            f"USING {preparer.format_table(staging)} s ON ({on_condition})"
+            f"{when_matched} WHEN NOT MATCHED THEN INSERT ({', '.join(columns)}) "
+            f"VALUES ({', '.join(f's.{c}' for c in columns)}){terminator}"
+        )
+
+    @staticmethod
+    def _records(data: pd.DataFrame) -> list[dict[str, Any]]:
+        values = data.astype(object).where(data.notna(), None)
+        return cast(list[dict[str, Any]], values.to_dict("records"))
+
+    def _count_existing_rows(
+        self, connection: Connection, table: Table, staging: SQLTable
+    ) -> int:
+        sql_table = table.sql_table
+        key_matches = and_(
+            *[sql_table.c[p] == staging.c[p] for p in table.primary_keys]
+        )
+        existing = connection.execute(
+            select(func.count()).select_from(staging).where(exists().where(key_matches))
+        ).scalar()
+        return int(cast(int, existing))
+
+    def _bulk_upsert(
+        self,
+        connection: Connection,
+        data: pd.DataFrame,
+        table: Table,
+        staging: SQLTable,
+        statement: Executable,
+    ) -> UpsertResult:
+        # A key must only be once in the staging table for ON CONFLICT and MERGE.
+        # The last row wins, like when the rows are upserted one by one.
+        unique_data = data.drop_duplicates(subset=table.primary_keys, keep="last")
+        duplicates = len(data) - len(unique_data)
+        staging.create(connection)
+        try:
+            for start in range(0, len(unique_data), CHUNK_SIZE):
+                connection.execute(
+                    staging.insert(),
+                    self._records(unique_data.iloc[start : start + CHUNK_SIZE]),
+                )
+            existing = self._count_existing_rows(connection, table, staging)
+            connection.execute(statement)
+        finally:
+            staging.drop(connection)
+        return UpsertResult(
+            inserted=len(unique_data) - existing, updated=existing + duplicates
+        )
+
+    def _upsert_rows(
+        self, connection: Connection, data: pd.DataFrame, table: Table
+    ) -> UpsertResult:
         other_columns = [
             c for c in data.columns.to_list() if c not in table.primary_keys
         ]
@@ -70,41 +250,129 @@ class TableLoader:
             update_stmt = update_stmt.where(sql_table.c[p] == bindparam(f"_{p}"))
 
         update_stmt = update_stmt.values(**{oc: bindparam(oc) for oc in other_columns})
+        result = UpsertResult()
+        for _, row in data.iterrows():
+            row_as_dict = cast(dict[str, Any], row.to_dict())
+            for p in table.primary_keys:
+                row_as_dict[f"_{p}"] = row_as_dict.pop(p)
+            rows = connection.execute(update_stmt, parameters=row_as_dict)
+            if rows.rowcount == 0:
+                connection.execute(
+                    insert_stmt, parameters=cast(dict[str, Any], row.to_dict())
+                )
+                result.inserted += 1
+            else:
+                result.updated += 1
+        return result
+
+    def insert_method(self, table: Table, data: pd.DataFrame) -> Optional[InsertMethod]:
+        """
+        Returns the method that DataFrame.to_sql uses to insert the data.
+        Dialects return their fastest way to load data into a table here.
+        If None is returned, to_sql inserts the rows through SQLAlchemy.
+        """
+        _ = table
+        _ = data
+        return None
+
+    @staticmethod
+    def _placeholder(paramstyle: str, position: int) -> str:
+        # "named" and "numeric" drivers accept positional parameters as :1, :2, ...
+        return PARAMSTYLE_PLACEHOLDERS.get(paramstyle, f":{position + 1}")
+
+    def executemany_insert(
+        self,
+        pd_table: Any,
+        connection: Connection,
+        keys: list[str],
+        data_iter: Iterable[tuple],
+    ) -> int:
+        """
+        Insert method for DataFrame.to_sql that passes all rows at once
+        to executemany of the DBAPI driver.
+        The values are converted for the column types like SQLAlchemy does,
+        but column by column instead of row by row.
+        """
+        dialect = connection.dialect
+        preparer = dialect.identifier_preparer
+        columns = [list(c) for c in zip(*data_iter)]
+        if not columns:
+            return 0
+        for i, key in enumerate(keys):
+            column_type = pd_table.table.c[key].type.dialect_impl(dialect)
+            if processor := column_type.bind_processor(dialect):
+                columns[i] = [processor(v) for v in columns[i]]
+        column_names = ", ".join(preparer.quote(k) for k in keys)
+        placeholders = ", ".join(
+            self._placeholder(dialect.paramstyle, i) for i in range(len(keys))
+        )
+        connection.exec_driver_sql(
+            f"INSERT INTO {preparer.format_table(pd_table.table)} "
+            f"({column_names}) VALUES ({placeholders})",
+            list(zip(*columns)),
+        )
+        return len(columns[0])
+
+    def upsert_data(self, data: pd.DataFrame, table: Table) -> UpsertResult:
+        """
+        Inserts or updates the rows based on the primary keys of the table.
+        The data is loaded into a staging table and upserted with a single
+        statement. If the database has no such statement or the table
+        has no primary keys, the rows are upserted one by one.
+        """
         with self.sql.conn() as connection:
-            self.pre_insert(connection, table)
-
-            for _, row in data.iterrows():
-                row_as_dict = cast(dict[str, Any], row.to_dict())
-                for p in table.primary_keys:
-                    row_as_dict[f"_{p}"] = row_as_dict.pop(p)
-                rows = connection.execute(update_stmt, parameters=row_as_dict)
-                if rows.rowcount == 0:
-                    connection.execute(
-                        insert_stmt, parameters=cast(dict[str, Any], row.to_dict())
-                    )
-        return False
+            return self._upsert_data(connection, data, table)
+
+    def _upsert_data(
+        self, connection: Connection, data: pd.DataFrame, table: Table
+    ) -> UpsertResult:
+        staging = self.staging_table(table, [str(c) for c in data.columns])
+        statement = self.upsert_statement(table, staging)
+        self.pre_insert(connection, table)
+        if statement is None or not table.primary_keys:
+            return self._upsert_rows(connection, data, table)
+        return self._bulk_upsert(connection, data, table, staging, statement)
 
     def load_table(
         self, table: Table, data: pd.DataFrame, mode: LoadMode, dtype=None
     ) -> bool:
         self._prepare_table_for_load(table, mode)
-        if_exists = self._load_mode_to_pandas_if_exists(mode=mode)
         if mode == LoadMode.UPSERT:
-            return self.upsert_data(data, table)
+            self.upsert_data(data, table)
+            return True
         else:
-            dtype = self.prepare_dtypes(data, table, dtype)
             with self.sql.conn() as connection:
-                self.pre_insert(connection, table)
-                data.to_sql(
-                    name=table.name,
-                    schema=table.schema,
-                    con=connection,
-                    if_exists=if_exists,
-                    index=False,
-                    dtype=dtype,
-                )
+                self._insert_data(connection, table, data, mode, dtype)
             return True
 
+    def _insert_data(
+        self,
+        connection: Connection,
+        table: Table,
+        data: pd.DataFrame,
+        mode: LoadMode,
+        dtype=None,
+    ):
+        if_exists = self._load_mode_to_pandas_if_exists(mode=mode)
+        dtype = self.prepare_dtypes(data, table, dtype)
+        # to_sql creates the table if it doesn't exist or is replaced,
+        # the table is inspected in the transaction that might have truncated it
+        creates_table = mode == LoadMode.REPLACE or not inspect(connection).has_table(
+            table.name, schema=table.schema
+        )
+        self.pre_insert(connection, table)
+        data.to_sql(
+            name=table.name,
+            schema=table.schema,
+            con=connection,
+            if_exists=if_exists,
+            index=False,
+            dtype=dtype,
+            method=self.insert_method(table, data),
+        )
+        if creates_table:
+            self.sql.metadata.invalidate(table.name, table.schema)
+
     def get_load_mode(self, deprecated_load_mode, mode) -> LoadMode:
         if deprecated_load_mode is not None:
             if isinstance(deprecated_load_mode, str):
@@ -131,22 +399,154 @@ class TableLoader:
         mode = self.get_load_mode(load_mode, mode)
         rel_file = base_path / file
         _table = Table.from_table_name(self.sql, table)
-        data = self.load_df_from_file(rel_file, _table.column_info)
 
-        result = self.load_table(
-            table=_table,
-            data=data,
-            mode=mode,
-            dtype=_table.column_info.dtypes,
-        )
-        if result:
+        start = perf_counter()
+        upserted = UpsertResult()
+        if self.use_partitions(_table, rel_file, mode):
+            result, rows = self.load_partitions(_table, rel_file, mode)
+        else:
+            if self.use_chunks(_table, rel_file, mode):
+                chunks = self.iter_chunks_from_file(rel_file, _table.column_info)
+            else:
+                # the column types of a new table are derived from the whole file
+                chunks = iter([self.load_df_from_file(rel_file, _table.column_info)])
+            result, rows, upserted = self._load_chunks(_table, chunks, mode)
+        if mode == LoadMode.UPSERT:
+            self.output.print(
+                f"table {table} loaded from {rel_file}: "
+                f"{upserted.inserted} rows inserted, {upserted.updated} rows updated"
+            )
+        elif result:
             self.output.print(f"table {table} loaded from {rel_file}")
         else:
             self.output.print(f"loading table {table} from {rel_file} failed")
+        if result and self.output.verbose:
+            self.output.print(
+                self.load_rate_message(table, rows, perf_counter() - start)
+            )
         return result
 
+    def use_chunks(self, table: Table, file: Path, mode: LoadMode) -> bool:
+        """
+        Returns whether the file is loaded in chunks. The chunks of a CSV file
+        could have other types than the whole file, so the file is only loaded
+        in chunks into an existing table. Parquet files have fixed types.
+        """
+        if file.suffix.lower() == ".parquet":
+            return True
+        return mode != LoadMode.REPLACE and table.exists()
+
+    def _load_chunks(
+        self, table: Table, chunks: Iterator[pd.DataFrame], mode: LoadMode
+    ) -> tuple[bool, int, UpsertResult]:
+        """
+        Loads the chunks into the table, returns the result and the rows.
+        All chunks are loaded in a single transaction, so a failed load
+        doesn't leave a partially loaded table.
+        """
+        rows = 0
+        upserted = UpsertResult()
+        with self.sql.conn() as connection:
+            if mode == LoadMode.TRUNCATE:
+                table.truncate_if_exists(connection)
+            for i, data in enumerate(read_ahead(chunks)):
+                rows += len(data)
+                if mode == LoadMode.UPSERT:
+                    upserted.add(self._upsert_data(connection, data, table))
+                else:
+                    # only the first chunk replaces the table
+                    self._insert_data(
+                        connection,
+                        table,
+                        data,
+                        mode if i == 0 else LoadMode.APPEND,
+                        table.column_info.dtypes,
+                    )
+        return True, rows, upserted
+
+    @property
+    def partitions(self) -> int:
+        """Number of partitions of a CSV file that are loaded concurrently."""
+        return self.sql.config.load_partitions
+
+    def use_partitions(self, table: Table, file: Path, mode: LoadMode) -> bool:
+        """
+        Returns whether the file is loaded in partitions. This is only possible
+        for CSV files and existing tables that are truncated or appended to.
+        """
+        return (
+            self.parallel_load
+            and self.partitions > 1
+            and mode in (LoadMode.TRUNCATE, LoadMode.APPEND)
+            and file.suffix.lower() == ".csv"
+            and table.exists()
+        )
+
+    def load_partitions(
+        self, table: Table, file: Path, mode: LoadMode
+    ) -> tuple[bool, int]:
+        """
+        Splits the file at line breaks and loads the partitions concurrently.
+        The table is truncated once before the partitions are appended.
+        """
+        self._prepare_table_for_load(table, mode)
+        parameters = [
+            {"table": table.full_name, "file": file, "byte_range": byte_range}
+            for byte_range in csv_partitions(file, self.partitions)
+        ]
+        results = self.sql.runner.run_any(
+            run_method=self.load_partition, parameters=parameters
+        )
+        return all(r for r, _ in results), sum(rows for _, rows in results)
+
+    def load_partition(
+        self, table: str, file: Path, byte_range: tuple[int, int]
+    ) -> tuple[bool, int]:
+        """Appends the rows of a partition of csv_partitions to the table."""
+        from data_check.sql import Table
+
+        _table = Table.from_table_name(self.sql, table)
+        chunks = read_csv_chunks(
+            csv_file=file,
+            chunk_size=self.chunk_size,
+            string_columns=_table.column_info.string_column_names,
+            date_columns=_table.column_info.date_column_names,
+            byte_range=byte_range,
+        )
+        result, rows, _ = self._load_chunks(_table, chunks, LoadMode.APPEND)
+        return result, rows
+
+    @staticmethod
+    def load_rate_message(table: str, rows: int, seconds: float) -> str:
+        rate = rows / seconds if seconds > 0 else 0
+        return f"table {table}: {rows} rows in {seconds:.2f}s ({rate:.0f} rows/s)"
+
+    @property
+    def chunk_size(self) -> int:
+        """Number of rows of a CSV file that are read and loaded at once."""
+        return self.sql.config.load_chunk_size
+
+    def iter_chunks_from_file(
+        self, file: Path, column_info: ColumnInfo
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Returns the data of the file in chunks of chunk_size rows.
+        Excel files are limited to about a million rows and read at once.
+        Parquet files are read in batches and keep the types from the file.
+        """
+        if is_csv_file(file):
+            return read_csv_chunks(
+                csv_file=file,
+                chunk_size=self.chunk_size,
+                string_columns=column_info.string_column_names,
+                date_columns=column_info.date_column_names,
+            )
+        if file.suffix.lower() == ".parquet":
+            return read_parquet_chunks(parquet_file=file, chunk_size=self.chunk_size)
+        return iter([self.load_df_from_file(file, column_info)])
+
     def load_df_from_file(self, file: Path, column_info: ColumnInfo) -> pd.DataFrame:
-        if file.suffix.lower() == ".csv":
+        if is_csv_file(file):
             data = read_csv(
                 csv_file=file,
                 string_columns=column_info.string_column_names,
@@ -155,6 +555,8 @@ class TableLoader:
             data = pd.read_excel(
                 file, sheet_name=0, header=0, engine="openpyxl", dtype="object"
             )
+        elif file.suffix.lower() == ".parquet":
+            data = read_parquet(file)
         else:
             raise Exception(f"file type unsupported: {file.suffix.lower()}")
         return data
@@ -169,14 +571,85 @@ class TableLoader:
         deprecated_method_argument(load_mode, mode, LoadMode.DEFAULT)
         mode = self.get_load_mode(load_mode, mode)
         flat_files = expand_files(
-            files, extension=[".csv", ".xlsx"], base_path=base_path
+            files, extension=[*CSV_SUFFIXES, ".xlsx", ".parquet"], base_path=base_path
         )
-        parameters = [{"table": f.stem, "file": f, "mode": mode} for f in flat_files]
-        results = self.sql.runner.run_any(
-            run_method=self.load_table_from_file, parameters=parameters
+        table_names = [file_stem(f) for f in flat_files]
+        parameters = [
+            {"table": t, "file": f, "mode": mode}
+            for t, f in zip(table_names, flat_files)
+        ]
+        dependencies = self.load_dependencies(table_names)
+        if dependencies and mode == LoadMode.TRUNCATE:
+            self.truncate_tables(table_names, dependencies)
+            for p in parameters:
+                p["mode"] = LoadMode.APPEND
+        results = self.sql.runner.run_graph(
+            run_method=self.load_table_from_file,
+            parameters=parameters,
+            dependencies=dependencies,
         )
         return all(results)
 
+    def load_dependencies(self, table_names: list[str]) -> dict[int, set[int]]:
+        """
+        Returns the indexes of the tables that each table refers to
+        with a foreign key. Only the tables in table_names are used.
+        If the foreign keys form a cycle, the tables have no dependencies.
+        """
+        from data_check.sql import Table
+
+        tables = [Table.from_table_name(self.sql, t) for t in table_names]
+        indexes: dict[tuple[Optional[str], str], list[int]] = defaultdict(list)
+        for i, table in enumerate(tables):
+            indexes[table.schema, table.name].append(i)
+        dependencies: dict[int, set[int]] = {}
+        for i, table in enumerate(tables):
+            parents: set[int] = set()
+            for referred in table.referred_tables:
+                # without a schema, the table is in the schema of the foreign key
+                key = (referred.schema or table.schema, referred.name)
+                if key != (table.schema, table.name):
+                    parents.update(indexes.get(key, []))
+            if parents:
+                dependencies[i] = parents
+        try:
+            TopologicalSorter(dependencies).prepare()
+        except CycleError:
+            self.output.print(
+                "foreign keys of the tables form a cycle, "
+                "loading the tables without dependencies"
+            )
+            return {}
+        return dependencies
+
+    def truncate_tables(
+        self, table_names: list[str], dependencies: dict[int, set[int]]
+    ):
+        """Empties the tables, each table before the tables it refers to."""
+        from data_check.sql import Table
+
+        order = TopologicalSorter(
+            {i: dependencies.get(i, set()) for i in range(len(table_names))}
+        ).static_order()
+        tables = [
+            Table.from_table_name(self.sql, table_names[i])
+            for i in reversed(list(order))
+        ]
+        existing = [t for t in tables if t.exists()]
+        if not existing:
+            return
+        with self.sql.conn() as connection:
+            for statement in self.truncate_statements(existing):
+                connection.execute(text(statement))
+
+    def truncate_statements(self, tables: list[Table]) -> list[str]:
+        """
+        Returns the statements that empty the tables in the given order.
+        Most databases don't truncate tables that are referred to by foreign keys,
+        so the rows are deleted instead.
+        """
+        return [f"DELETE FROM {t.full_name}" for t in tables]
+
     @staticmethod
     def load_mode_from_string(lm_str: str) -> LoadMode:
         return LoadMode.from_string(lm_str)
@@ -4,6 +4,8 @@ from pathlib import Path
 from data_check.exceptions import DataCheckError
 
 SCAFFOLD_TEMPLATES = "scaffold_templates"
+# the durations and caches of the project are not versioned
+GITIGNORE_ENTRY = ".data_check/"
 
 
 def _create_dir(directory: Path):
@@ -20,6 +22,13 @@ def _copy_file(src: Path, dst: Path):
         raise DataCheckError(f"{dst.name} already exists")
 
 
+def _ignore_cache(project_path: Path):
+    gitignore = project_path / ".gitignore"
+    lines = gitignore.read_text().splitlines() if gitignore.exists() else []
+    if GITIGNORE_ENTRY not in lines:
+        gitignore.write_text("".join(f"{line}\n" for line in [*lines, GITIGNORE_ENTRY]))
+
+
 def create_project(project_path: Path):
     cur_folder = Path(__file__).parent
     conf_file = "data_check.yml"
@@ -34,6 +43,8 @@ def create_project(project_path: Path):
     checks_path = project_path / "checks"
     checks_path.mkdir(exist_ok=True)
 
+    _ignore_cache(project_path)
+
 
 def create_pipeline(pipeline_path: Path):
     cur_folder = Path(__file__).parent
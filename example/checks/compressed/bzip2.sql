@@ -0,0 +1,3 @@
+select 'check1' as check1, 1 as id {{from_dual}}
+union all
+select 'string with # and ,' as check1, 2 as id {{from_dual}}
@@ -0,0 +1,5 @@
+-- a check that compares the rows by two key columns
+-- key_columns: id, part
+select 1 as id, 'x' as part, 'first' as data
+union all
+select 1 as id, 'y' as part, 'second' as data
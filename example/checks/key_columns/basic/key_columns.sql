@@ -0,0 +1,4 @@
+-- key_columns: id
+select 1 as id, 'a' as name, 1.5 as amount
+union all
+select 2 as id, 'b' as name, null as amount
@@ -0,0 +1,6 @@
+-- key_columns: id
+select 1 as id, 'a' as name, 'x' as data
+union all
+select 2 as id, 'b' as name, 'y' as data
+union all
+select 3 as id, 'c' as name, 'z' as data
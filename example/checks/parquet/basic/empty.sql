@@ -0,0 +1,2 @@
+select 'check1' as check1 {{from_dual}}
+where 1=2
@@ -0,0 +1,3 @@
+select 'check1' as check1 {{from_dual}}
+union all
+select 'string with , colons' as check1 {{from_dual}}
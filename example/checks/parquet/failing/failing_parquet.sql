@@ -0,0 +1 @@
+select 'check1' as check1 {{from_dual}}
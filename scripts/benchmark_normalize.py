@@ -0,0 +1,111 @@
+"""
+Compares the normalization of CSV check results with the previous implementation,
+that replaced the values in every cell and collected the type of every value.
+
+Usage: python scripts/benchmark_normalize.py [rows]
+"""
+
+import sys
+import time
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from data_check.checks.csv_check import CSVCheck
+from data_check.checks.sql_base_check import SQLBaseCheck
+
+ROWS = 1_000_000
+REPEAT = 3
+# share of missing values in the columns with missing values
+MISSING_SHARE = 0.1
+
+
+def normalize_per_cell(df: pd.DataFrame):
+    df.fillna(value=pd.NA, inplace=True)
+    df.replace(r"^$", pd.NA, regex=True, inplace=True)
+    df.replace({pd.NaT: pd.NA}, inplace=True)
+
+
+def convert_mixed_per_value(df_1: pd.DataFrame, df_2: pd.DataFrame):
+    object_columns = set(df_1.columns[df_1.dtypes == "object"])
+    object_columns.update(set(df_2.columns[df_2.dtypes == "object"]))
+    for o_col in object_columns:
+        if o_col in df_1.columns and o_col in df_2.columns:
+            df_1_types = {type(el) for el in df_1[o_col].array}
+            df_2_types = {type(el) for el in df_2[o_col].array}
+            if df_1_types.union(df_2_types) in (
+                {str, int},
+                {str, float},
+                {str, int, float},
+            ):
+                df_1[o_col], df_2[o_col] = SQLBaseCheck.convert_dtypes(
+                    df_1[o_col], df_2[o_col]
+                )
+
+
+def normalize_vectorized(df: pd.DataFrame):
+    CSVCheck.normalize_result(df)
+
+
+def convert_mixed_vectorized(df_1: pd.DataFrame, df_2: pd.DataFrame):
+    SQLBaseCheck.convert_mixed_object_columns(df_1, df_2)
+
+
+def sample_frame(rows: int, seed: int) -> pd.DataFrame:
+    """A frame with 20 columns like a typical query result."""
+    rng = np.random.default_rng(seed)
+    words = np.array(["", "alpha", "beta", "gamma", "0123", "x y"], dtype=object)
+    data: dict[str, object] = {}
+    for i in range(8):
+        data[f"text_{i}"] = rng.choice(words, rows)
+    for i in range(2):
+        values = rng.choice(words, rows)
+        values[rng.random(rows) < MISSING_SHARE] = None
+        data[f"text_none_{i}"] = values
+    for i in range(4):
+        data[f"int_{i}"] = rng.integers(0, 1_000_000, rows)
+    for i in range(3):
+        data[f"float_{i}"] = np.where(
+            rng.random(rows) < MISSING_SHARE, np.nan, rng.random(rows)
+        )
+    data["date"] = pd.Timestamp("2020-01-01") + pd.to_timedelta(
+        rng.integers(0, 3650, rows), unit="D"
+    )
+    # ints mixed with strings, like a column of a CSV file that was read as strings
+    data["mixed"] = rng.choice(np.array([1, 2, "a"], dtype=object), rows)
+    data["decimal_text"] = rng.integers(0, 100, rows).astype(str).astype(object)
+    return pd.DataFrame(data)
+
+
+def measure(
+    name: str,
+    normalize: Callable[[pd.DataFrame], None],
+    convert_mixed: Callable[[pd.DataFrame, pd.DataFrame], None],
+    frames: tuple[pd.DataFrame, pd.DataFrame],
+) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        left, right = frames[0].copy(), frames[1].copy()
+        start = time.perf_counter()
+        normalize(left)
+        normalize(right)
+        convert_mixed(left, right)
+        best = min(best, time.perf_counter() - start)
+    print(f"{name:<12}{best:>8.2f} s")
+    return best
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+    frames = (sample_frame(rows, 1), sample_frame(rows, 2))
+    print(f"{rows} rows x {len(frames[0].columns)} columns, best of {REPEAT}")
+    per_cell = measure("per cell", normalize_per_cell, convert_mixed_per_value, frames)
+    vectorized = measure(
+        "vectorized", normalize_vectorized, convert_mixed_vectorized, frames
+    )
+    print(f"speedup     {per_cell / vectorized:>8.1f} x")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@ from pathlib import Path
 
 import pytest
 
+import data_check.config
 from data_check import DataCheck
 from data_check.config import DataCheckConfig
 from data_check.sql import DataCheckSql, get_sql
@@ -17,6 +18,12 @@ def _change_test_dir(monkeypatch: pytest.MonkeyPatch):
         monkeypatch.chdir("example")
 
 
+@pytest.fixture(autouse=True)
+def _cache_in_tmp_path(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    """Store the durations and caches outside of the example project."""
+    monkeypatch.setattr(data_check.config, "CACHE_PATH", tmp_path / ".data_check")
+
+
 @pytest.fixture
 def dc() -> DataCheck:
     config = DataCheckConfig().load_config().set_connection("test")
@@ -0,0 +1,131 @@
+from pathlib import Path
+from typing import cast
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from data_check import DataCheck
+from data_check.checks.comparison_backend import (
+    ArrowComparisonBackend,
+    ComparisonBackend,
+    get_comparison_backend,
+)
+from data_check.checks.csv_check import CSVCheck
+from data_check.exceptions import DataCheckError
+
+pytest.importorskip("pyarrow")
+
+SIZE = 200
+BACKENDS = ["pandas", "arrow"]
+EXAMPLE_PATH = Path(__file__).parent.parent.parent / "example"
+CHECK_PATHS = sorted(
+    str(p.relative_to(EXAMPLE_PATH))
+    for folder in ("basic", "failing", "compressed", "parquet", "excel")
+    for p in (EXAMPLE_PATH / "checks" / folder).rglob("*.sql")
+)
+
+
+def random_result(seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "id": rng.integers(0, 20, SIZE),
+            "s": rng.choice(np.array(["a", "b", "", None], dtype=object), SIZE),
+            "f": rng.choice([0.5, 0.0, -0.0, np.nan], SIZE),
+            "d": pd.Timestamp("2020-01-01")
+            + pd.to_timedelta(rng.integers(0, 3, SIZE), unit="D"),
+            "mixed": rng.choice(np.array([1, 2, "1", "a"], dtype=object), SIZE),
+        }
+    )
+    CSVCheck.normalize_result(df)
+    return df
+
+
+def compare(name: str, left: pd.DataFrame, right: pd.DataFrame) -> pd.DataFrame:
+    comparison = get_comparison_backend(name).compare(
+        left.copy(), right.copy(), partitions=1
+    )
+    return comparison.diff.reset_index(drop=True)
+
+
+def assert_same_diff(left: pd.DataFrame, right: pd.DataFrame):
+    expected = compare("pandas", left, right)
+    diff = compare("arrow", left, right)
+    assert_frame_equal(diff, expected)
+
+
+@pytest.mark.parametrize("seeds", [(1, 2), (3, 3), (4, 5)])
+def test_backends_same_diff(seeds: tuple[int, int]):
+    assert_same_diff(random_result(seeds[0]), random_result(seeds[1]))
+
+
+@pytest.mark.parametrize(
+    ("left", "right"),
+    [
+        (pd.DataFrame({"a": [1, 1, 2]}), pd.DataFrame({"a": [1, 3]})),
+        (pd.DataFrame({"a": [0.0, np.nan]}), pd.DataFrame({"a": [-0.0, np.nan]})),
+        (
+            pd.DataFrame({"a": ["x", pd.NA]}, dtype=object),
+            pd.DataFrame({"a": [pd.NA, "y"]}, dtype=object),
+        ),
+        (
+            pd.DataFrame({"a": [1, 2], "b": ["x", "y"]}),
+            pd.DataFrame({"b": ["x", "z"], "a": [1, 2]}),
+        ),
+        (pd.DataFrame({"a": [1, 2]}), pd.DataFrame({"a": [1.0, 3.0]})),
+        (pd.DataFrame({"a": [1, 2]}), pd.DataFrame({"a": ["1", "2"]})),
+        (pd.DataFrame({"a": [1, 2]}), pd.DataFrame({"a": [1], "b": [2]})),
+        (pd.DataFrame({"a": []}, dtype=object), pd.DataFrame({"a": ["x"]})),
+    ],
+)
+def test_backends_same_diff_types(left: pd.DataFrame, right: pd.DataFrame):
+    CSVCheck.normalize_result(left)
+    CSVCheck.normalize_result(right)
+    assert_same_diff(left, right)
+
+
+@pytest.mark.parametrize("check_path", CHECK_PATHS)
+def test_backends_same_check_result(dc: DataCheck, check_path: str):
+    check = dc.get_check(Path(check_path))
+    assert check
+    results = {}
+    for name in BACKENDS:
+        dc.config.config["comparison_backend"] = name
+        results[name] = check.run_test()
+    expected, result = results["pandas"], results["arrow"]
+    assert result.result_type == expected.result_type
+    if isinstance(expected.result, pd.DataFrame):
+        assert_frame_equal(
+            cast(pd.DataFrame, result.result).reset_index(drop=True),
+            expected.result.reset_index(drop=True),
+        )
+    else:
+        assert result.result == expected.result
+
+
+def test_arrow_backend_no_merged_result():
+    left, right = random_result(1), random_result(2)
+    comparison = ArrowComparisonBackend().compare(left, right, partitions=1)
+    assert comparison.merged is None
+    assert len(comparison.diff) > 0
+
+
+def test_get_comparison_backend():
+    assert type(get_comparison_backend("pandas")) is ComparisonBackend
+    assert type(get_comparison_backend("Arrow")) is ArrowComparisonBackend
+
+
+def test_get_comparison_backend_unknown():
+    with pytest.raises(DataCheckError):
+        get_comparison_backend("spark")
+
+
+def test_unknown_comparison_backend_fails_check(dc: DataCheck):
+    dc.config.config["comparison_backend"] = "spark"
+    check = dc.get_check(Path("checks/basic/simple_string.sql"))
+    assert check
+    result = check.run_test()
+    assert not result
+    assert isinstance(result.exception, DataCheckError)
@@ -2,6 +2,7 @@ from pathlib import Path
 
 import pytest
 
+import data_check.config
 from data_check.config import DataCheckConfig
 
 T_CONFIG = """
@@ -179,3 +180,16 @@ def test_log_path_is_absolute(tmp_path: Path):
     cfg.write_text(T_CONFIG + "log: dc.log")
     config = DataCheckConfig().load_config(tmp_path)
     assert str(config.log_path) == str(tmp_path / "dc.log")
+
+
+def test_cache_path_default(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(data_check.config, "CACHE_PATH", ".data_check")
+    config = DataCheckConfig().load_config()
+    assert config.durations_path == config.project_path / ".data_check/durations.json"
+    assert config.fingerprints_path == config.project_path / ".data_check/fingerprints"
+
+
+def test_durations_path_from_config():
+    config = DataCheckConfig().load_config()
+    config.config["durations_file"] = "some/durations.json"
+    assert config.durations_path == config.project_path / "some/durations.json"
@@ -0,0 +1,55 @@
+from pathlib import Path
+
+from data_check import DataCheck
+from data_check.durations import CheckDurations
+
+
+def test_durations_file_does_not_exist(tmp_path: Path):
+    durations = CheckDurations(tmp_path / "durations.json", tmp_path)
+    assert durations.get(tmp_path / "a.sql") is None
+
+
+def test_durations_are_saved(tmp_path: Path):
+    durations_file = tmp_path / "sub" / "durations.json"
+    durations = CheckDurations(durations_file, tmp_path)
+    duration = 1.5
+    durations.durations["a.sql"] = duration
+    durations.save()
+    assert CheckDurations(durations_file, tmp_path).get(tmp_path / "a.sql") == duration
+
+
+def test_invalid_durations_file_is_ignored(tmp_path: Path):
+    durations_file = tmp_path / "durations.json"
+    durations_file.write_text("no json")
+    durations = CheckDurations(durations_file, tmp_path)
+    assert durations.durations == {}
+
+
+def test_longest_first(dc: DataCheck, tmp_path: Path):
+    durations = CheckDurations(tmp_path / "durations.json", tmp_path)
+    durations.durations.update({"a.sql": 1.0, "b.sql": 3.0, "c.sql": 2.0})
+    checks = dc.collect_checks(
+        [tmp_path / "a.sql", tmp_path / "b.sql", tmp_path / "c.sql"]
+    )
+    ordered = durations.longest_first(checks)
+    assert [c.check_path.name for c in ordered] == ["b.sql", "c.sql", "a.sql"]
+
+
+def test_longest_first_unknown_durations_first(dc: DataCheck, tmp_path: Path):
+    durations = CheckDurations(tmp_path / "durations.json", tmp_path)
+    durations.durations.update({"a.sql": 1.0})
+    checks = dc.collect_checks([tmp_path / "a.sql", tmp_path / "b.sql"])
+    ordered = durations.longest_first(checks)
+    assert [c.check_path.name for c in ordered] == ["b.sql", "a.sql"]
+
+
+def test_run_checks_updates_durations(dc: DataCheck, tmp_path: Path):
+    dc.check_durations = CheckDurations(tmp_path / "durations.json", Path().absolute())
+    dc.run([Path("checks/basic/simple_string.sql")])
+    assert dc.check_durations.get(Path("checks/basic/simple_string.sql")) is not None
+    # the durations are saved once by the top-level run
+    assert not (tmp_path / "durations.json").exists()
+
+
+def test_durations_use_lock_of_runner(dc: DataCheck):
+    assert dc.check_durations._lock is dc.runner.lock
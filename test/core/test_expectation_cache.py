@@ -0,0 +1,221 @@
+import os
+from functools import partial
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from data_check import DataCheck
+from data_check.checks import csv_check
+from data_check.checks.csv_check import CSVCheck
+from data_check.checks.excel_check import ExcelCheck
+from data_check.config import DataCheckConfig
+from data_check.expectation_cache import ExpectationCache
+from data_check.file_ops import read_csv
+from data_check.result import DataCheckResult
+
+pytest.importorskip("pyarrow")
+
+CACHE_SIZE = 1024 * 1024
+
+
+def read_counting(reads: list[Path], csv_file: Path):
+    def read_file() -> pd.DataFrame:
+        reads.append(csv_file)
+        return read_csv(csv_file)
+
+    return read_file
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> ExpectationCache:
+    return ExpectationCache(tmp_path / "cache", CACHE_SIZE)
+
+
+@pytest.mark.parametrize(
+    "csv_file",
+    [
+        "checks/basic/data_types.csv",
+        "checks/basic/decimal_varchar.csv",
+        "checks/basic/float.csv",
+        "checks/basic/leading_zeros.csv",
+        "checks/basic/mixed_dates.csv",
+        "checks/basic/unicode_column.csv",
+        "load_data/sample/test_date_with_null_dates.csv",
+    ],
+)
+def test_cached_same_as_read_csv(cache: ExpectationCache, csv_file: str):
+    path = Path(csv_file)
+    expected = read_csv(path)
+    cache.read(path, lambda: read_csv(path))
+    cached = cache.read(path, lambda: pytest.fail("not cached"))
+    CSVCheck.normalize_result(expected)
+    CSVCheck.normalize_result(cached)
+    pd.testing.assert_frame_equal(cached, expected)
+
+
+def test_cached_excel_same_as_read_excel(dc: DataCheck, cache: ExpectationCache):
+    check = ExcelCheck(dc, Path("checks/excel/basic/data_types.sql"))
+    path = Path("checks/excel/basic/data_types.xlsx")
+    expected = check.read_excel(path)
+    cache.read(path, lambda: check.read_excel(path))
+    cached = cache.read(path, lambda: pytest.fail("not cached"))
+    pd.testing.assert_frame_equal(cached, expected)
+
+
+def test_file_is_read_once(cache: ExpectationCache, tmp_path: Path):
+    csv_file = tmp_path / "check.csv"
+    csv_file.write_text("a,b\n1,x\n", encoding="UTF-8")
+    reads: list[Path] = []
+    for _ in range(3):
+        cache.read(csv_file, read_counting(reads, csv_file))
+    assert reads == [csv_file]
+
+
+def test_options_are_cached_separately(cache: ExpectationCache, tmp_path: Path):
+    csv_file = tmp_path / "check.csv"
+    csv_file.write_text("a\n01\n", encoding="UTF-8")
+    df = cache.read(csv_file, lambda: read_csv(csv_file))
+    df_strings = cache.read(
+        csv_file,
+        lambda: read_csv(csv_file, string_columns=["a"]),
+        string_columns=["a"],
+    )
+    assert df["a"].tolist() == [1]
+    assert df_strings["a"].tolist() == ["01"]
+
+
+def test_changed_file_is_read_again(cache: ExpectationCache, tmp_path: Path):
+    csv_file = tmp_path / "check.csv"
+    csv_file.write_text("a\n1\n", encoding="UTF-8")
+    cache.read(csv_file, lambda: read_csv(csv_file))
+    csv_file.write_text("a\n2\n", encoding="UTF-8")
+    df = cache.read(csv_file, lambda: read_csv(csv_file))
+    expected_value = 2
+    assert df["a"].tolist() == [expected_value]
+
+
+def test_touched_file_uses_content_hash(cache: ExpectationCache, tmp_path: Path):
+    csv_file = tmp_path / "check.csv"
+    csv_file.write_text("a\n1\n", encoding="UTF-8")
+    cache.read(csv_file, lambda: read_csv(csv_file))
+    stat = csv_file.stat()
+    os.utime(csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    cache.read(csv_file, lambda: pytest.fail("not cached"))
+
+
+def test_eviction(tmp_path: Path):
+    cache = ExpectationCache(tmp_path / "cache", 1)
+    first = tmp_path / "first.csv"
+    first.write_text("a\n1\n", encoding="UTF-8")
+    cache.read(first, lambda: read_csv(first))
+    # a single entry is larger than the cache
+    assert list((tmp_path / "cache" / "data").glob("*.feather")) == []
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path: Path):
+    cache = ExpectationCache(tmp_path / "cache", CACHE_SIZE)
+    files = []
+    for i in range(3):
+        csv_file = tmp_path / f"check_{i}.csv"
+        csv_file.write_text(f"a\n{i}\n", encoding="UTF-8")
+        cache.read(csv_file, partial(read_csv, csv_file))
+        files.append(csv_file)
+    entries = sorted(
+        (tmp_path / "cache" / "data").glob("*.feather"), key=lambda p: p.stat().st_mtime
+    )
+    for i, entry in enumerate(entries):
+        os.utime(entry, ns=(0, i * 1_000_000_000))
+    cache.max_size = sum(p.stat().st_size for p in entries[1:])
+    cache.evict()
+    assert not entries[0].exists()
+    assert entries[1].exists()
+    assert entries[2].exists()
+
+
+def test_disabled_cache(tmp_path: Path):
+    cache = ExpectationCache(tmp_path / "cache", 0)
+    csv_file = tmp_path / "check.csv"
+    csv_file.write_text("a\n1\n", encoding="UTF-8")
+    reads: list[Path] = []
+    for _ in range(2):
+        cache.read(csv_file, read_counting(reads, csv_file))
+    assert reads == [csv_file, csv_file]
+    assert not (tmp_path / "cache").exists()
+
+
+def test_unsupported_dataframe_is_not_cached(cache: ExpectationCache, tmp_path: Path):
+    csv_file = tmp_path / "check.csv"
+    csv_file.write_text("a\n1\n", encoding="UTF-8")
+    mixed = pd.DataFrame({"a": [1, "x"]}, dtype=object)
+    assert cache.read(csv_file, lambda: mixed) is mixed
+    assert cache.read(csv_file, lambda: mixed) is mixed
+
+
+def test_check_uses_expectation_cache(dc: DataCheck):
+    check = dc.get_check(Path("checks/basic/data_types.sql"))
+    assert check
+    assert check.run_test()
+    assert list(dc.config.expectation_cache_path.glob("data/*.feather"))
+    assert check.run_test()
+
+
+def run_csv_check(check_path: Path) -> DataCheckResult:
+    """Runs the check with a new DataCheck, like a new run of data_check."""
+    config = DataCheckConfig().load_config().set_connection("test")
+    dc = DataCheck(config)
+    dc.load_template()
+    check = dc.get_check(check_path)
+    assert check
+    return check.run_test()
+
+
+@pytest.fixture
+def csv_reads(monkeypatch: pytest.MonkeyPatch) -> list[Path]:
+    reads: list[Path] = []
+
+    def counting_read_csv(csv_file: Path, *args, **kwargs) -> pd.DataFrame:
+        reads.append(csv_file)
+        return read_csv(csv_file, *args, **kwargs)
+
+    monkeypatch.setattr(csv_check, "read_csv", counting_read_csv)
+    return reads
+
+
+@pytest.fixture
+def check_path(tmp_path: Path) -> Path:
+    sql_file = tmp_path / "cached_check.sql"
+    sql_file.write_text(
+        "select 1 as a, 'x' as b union all select 2 as a, 'y' as b", encoding="UTF-8"
+    )
+    sql_file.with_suffix(".csv").write_text("a,b\n1,x\n3,z\n", encoding="UTF-8")
+    return sql_file
+
+
+def test_second_run_reads_cached_expectation(check_path: Path, csv_reads: list[Path]):
+    first = run_csv_check(check_path)
+    assert csv_reads == [check_path.with_suffix(".csv")]
+    second = run_csv_check(check_path)
+    # the expectation is read from the Feather file
+    assert csv_reads == [check_path.with_suffix(".csv")]
+    assert not first.passed
+    assert second.passed == first.passed
+    assert second.result_type == first.result_type
+    assert isinstance(first.result, pd.DataFrame)
+    assert isinstance(second.result, pd.DataFrame)
+    pd.testing.assert_frame_equal(second.result, first.result)
+
+
+def test_changed_expectation_invalidates_cache(check_path: Path, csv_reads: list[Path]):
+    csv_file = check_path.with_suffix(".csv")
+    assert not run_csv_check(check_path)
+    # a new size
+    csv_file.write_text("a,b\n1,x\n2,y\n", encoding="UTF-8")
+    assert run_csv_check(check_path)
+    # the same size with a new modification time
+    stat = csv_file.stat()
+    csv_file.write_text("a,b\n1,x\n3,y\n", encoding="UTF-8")
+    os.utime(csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert csv_file.stat().st_size == stat.st_size
+    assert not run_csv_check(check_path)
+    assert csv_reads == [csv_file, csv_file, csv_file]
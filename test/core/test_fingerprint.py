@@ -0,0 +1,138 @@
+import os
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from data_check import DataCheck
+from data_check.result import ResultType
+from data_check.sql import DataCheckSql
+from data_check.sql.fingerprint import (
+    Fingerprint,
+    FingerprintCache,
+    dataframe_fingerprint,
+    row_hash,
+)
+
+
+def test_row_hash_is_stable():
+    assert row_hash("a", "1") == row_hash("a", "1")
+    assert row_hash("a", "1") != row_hash("1", "a")
+
+
+def test_row_hash_null_equals_empty_string():
+    assert row_hash("a", None) == row_hash("a", "")
+    assert row_hash("a", None) != row_hash("a", "None")
+
+
+def test_dataframe_fingerprint_is_order_independent():
+    df1 = pd.DataFrame({"a": ["1", "2", "3"]})
+    df2 = pd.DataFrame({"a": ["3", "1", "2"]})
+    assert dataframe_fingerprint(df1) == dataframe_fingerprint(df2)
+
+
+def test_dataframe_fingerprint_counts_duplicates():
+    df1 = pd.DataFrame({"a": ["1", "1", "2"]})
+    df2 = pd.DataFrame({"a": ["1", "2", "2"]})
+    assert dataframe_fingerprint(df1) != dataframe_fingerprint(df2)
+
+
+def test_query_fingerprint_equals_dataframe_fingerprint(sql: DataCheckSql):
+    query = (
+        "select 'a' as s, 1 as i, 1.5 as f, null as n union all select 'b', 2, 2.5, ''"
+    )
+    df = pd.DataFrame(
+        {"s": ["a", "b"], "i": ["1", "2"], "f": ["1.5", "2.5"], "n": [None, None]}
+    )
+    assert sql.query_fingerprint(query, {}, ["s", "i", "f", "n"]) == (
+        dataframe_fingerprint(df)
+    )
+
+
+def test_query_fingerprint_uses_column_order(sql: DataCheckSql):
+    df = pd.DataFrame({"b": ["2"], "a": ["1"]})
+    fingerprint = sql.query_fingerprint("select 1 as a, 2 as b", {}, ["b", "a"])
+    assert fingerprint == dataframe_fingerprint(df)
+
+
+def test_query_fingerprint_empty_result(sql: DataCheckSql):
+    fingerprint = sql.query_fingerprint("select 1 as a where 1 = 0", {}, ["a"])
+    assert fingerprint == Fingerprint(row_count=0, hash_sum=0)
+
+
+def test_query_fingerprint_different_columns(sql: DataCheckSql):
+    assert sql.query_fingerprint("select 1 as a, 2 as b", {}, ["a"]) is None
+
+
+def test_fingerprint_cache(tmp_path: Path):
+    expect_file = tmp_path / "check.csv"
+    expect_file.write_text("a\n1\n", encoding="UTF-8")
+    cache = FingerprintCache(tmp_path / "fingerprints")
+    assert cache.get(expect_file) is None
+    fingerprint = Fingerprint(row_count=1, hash_sum=42)
+    cache.set(expect_file, ["a"], fingerprint)
+    assert cache.get(expect_file) == (["a"], fingerprint)
+
+
+def test_fingerprint_cache_invalid_after_change(tmp_path: Path):
+    expect_file = tmp_path / "check.csv"
+    expect_file.write_text("a\n1\n", encoding="UTF-8")
+    cache = FingerprintCache(tmp_path / "fingerprints")
+    cache.set(expect_file, ["a"], Fingerprint(row_count=1, hash_sum=42))
+    stat = expect_file.stat()
+    os.utime(expect_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert cache.get(expect_file) is None
+
+
+@pytest.fixture
+def dc_fingerprint(dc: DataCheck) -> DataCheck:
+    dc.config.config["fingerprint_check"] = True
+    return dc
+
+
+def test_fingerprint_check_is_disabled_by_default(dc: DataCheck):
+    assert not dc.config.fingerprint_check
+
+
+def test_check_passes_with_fingerprint(dc_fingerprint: DataCheck):
+    check = dc_fingerprint.get_check(Path("checks/basic/simple_string.sql"))
+    assert check
+    result = check.run_test()
+    assert result
+    # the result wasn't fetched
+    assert result.full_result is None
+
+
+def test_check_without_fingerprint(dc: DataCheck):
+    check = dc.get_check(Path("checks/basic/simple_string.sql"))
+    assert check
+    result = check.run_test()
+    assert result
+    assert result.full_result is not None
+
+
+def test_check_fails_with_different_fingerprint(dc_fingerprint: DataCheck):
+    check = dc_fingerprint.get_check(Path("checks/failing/expected_to_fail.sql"))
+    assert check
+    result = check.run_test()
+    assert not result
+    assert result.result_type == ResultType.FAILED
+    assert result.result is not None
+
+
+@pytest.mark.parametrize(
+    "check_path",
+    [
+        "checks/basic/data_types.sql",
+        "checks/basic/float.sql",
+        "checks/basic/mixed_dates.sql",
+    ],
+)
+def test_check_passes_with_different_fingerprint(dc_fingerprint: DataCheck, check_path):
+    # the values are written differently in the CSV file,
+    # the comparison of the results is still needed
+    check = dc_fingerprint.get_check(Path(check_path))
+    assert check
+    result = check.run_test()
+    assert result
+    assert result.full_result is not None
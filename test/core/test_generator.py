@@ -1,3 +1,5 @@
+import bz2
+import gzip
 from pathlib import Path
 from unittest.mock import create_autospec
 
@@ -108,3 +110,27 @@ def test_gen_csv_is_sorted(tmp_path: Path):
     generator.gen_expectation(sql_file=sql_file)
 
     assert expect_result.read_text().strip() == "test\n1\n2"
+
+
+def test_gen_compressed_expectation(tmp_path: Path):
+    data_check, sql_file, _, check = prepare_sql(tmp_path=tmp_path)
+    data_check.config.generate_format = "csv.gz"
+
+    generator = DataCheckGenerator(data_check, sql_file, check)
+    generator.gen_expectation(sql_file=sql_file)
+
+    expect_result = tmp_path / "a.csv.gz"
+    assert gzip.decompress(expect_result.read_bytes()).decode().strip() == "test\n1"
+    assert not (tmp_path / "a.csv").exists()
+
+
+def test_gen_keeps_format_of_existing_expectation(tmp_path: Path):
+    data_check, sql_file, _, check = prepare_sql(tmp_path=tmp_path)
+    expect_result = tmp_path / "a.csv.bz2"
+    expect_result.write_bytes(bz2.compress(b"test\n2\n"))
+
+    generator = DataCheckGenerator(data_check, sql_file, check)
+    generator.gen_expectation(sql_file=sql_file, force=True)
+
+    assert bz2.decompress(expect_result.read_bytes()).decode().strip() == "test\n1"
+    assert not (tmp_path / "a.csv").exists()
@@ -1,11 +1,27 @@
+import bz2
+import gzip
 import os
 from pathlib import Path
 
 import pandas as pd
 import pytest
 
+from data_check import file_ops
 from data_check.exceptions import DataCheckError
-from data_check.file_ops import expand_files, get_expect_file, read_csv, read_sql_file
+from data_check.file_ops import (
+    csv_partitions,
+    csv_suffix,
+    expand_files,
+    file_stem,
+    get_expect_file,
+    read_csv,
+    read_csv_chunks,
+    read_sql_file,
+    replace_suffix,
+    write_csv,
+)
+
+COMPRESSED_CSV = "a,b\n# a comment\n1,\\#x\n2,\n"
 
 
 def test_expand_files():
@@ -41,6 +57,92 @@ def test_get_expect_file():
     assert ef == Path("test_file.csv")
 
 
+def test_get_expect_file_compressed(tmp_path: Path):
+    (tmp_path / "a.csv.gz").write_bytes(b"")
+    assert get_expect_file(tmp_path / "a.sql") == tmp_path / "a.csv.gz"
+
+
+def test_get_expect_file_prefers_csv(tmp_path: Path):
+    (tmp_path / "a.csv.gz").write_bytes(b"")
+    (tmp_path / "a.csv").write_bytes(b"")
+    assert get_expect_file(tmp_path / "a.sql") == tmp_path / "a.csv"
+
+
+@pytest.mark.parametrize(
+    ("file_name", "suffix", "stem"),
+    [
+        ("main.table.csv", ".csv", "main.table"),
+        ("main.table.CSV.GZ", ".csv.gz", "main.table"),
+        ("a.csv.zst", ".csv.zst", "a"),
+        ("a.csv.bz2", ".csv.bz2", "a"),
+        ("a.gz", "", "a"),
+        ("a.xlsx", "", "a"),
+    ],
+)
+def test_csv_suffix(file_name, suffix, stem):
+    assert csv_suffix(Path(file_name)) == suffix
+    assert file_stem(Path(file_name)) == stem
+    assert replace_suffix(Path(file_name), ".sql") == Path(f"{stem}.sql")
+
+
+def test_expand_files_compressed(tmp_path: Path):
+    for name in ("a.csv", "b.csv.gz", "c.gz"):
+        (tmp_path / name).write_bytes(b"")
+    files = expand_files([tmp_path], extension=[".csv", ".csv.gz"])
+    assert files == [tmp_path / "a.csv", tmp_path / "b.csv.gz"]
+
+
+@pytest.mark.parametrize(
+    ("suffix", "compress"), [(".csv.gz", gzip.compress), (".csv.bz2", bz2.compress)]
+)
+def test_read_compressed_csv(tmp_path: Path, suffix, compress):
+    (tmp_path / "a.csv").write_text(COMPRESSED_CSV, "UTF-8")
+    csv_file = tmp_path / f"a{suffix}"
+    csv_file.write_bytes(compress(COMPRESSED_CSV.encode("UTF-8")))
+    expected = read_csv(tmp_path / "a.csv")
+    assert expected["b"].tolist()[0] == "#x"
+    pd.testing.assert_frame_equal(read_csv(csv_file), expected)
+    chunks = list(read_csv_chunks(csv_file, chunk_size=1))
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), expected)
+
+
+@pytest.mark.parametrize("suffix", [".csv.gz", ".csv.bz2"])
+def test_write_compressed_csv(tmp_path: Path, suffix):
+    df = pd.DataFrame({"a": [2, 1], "b": ["#x", "y"]})
+    write_csv(df, f"a{suffix}", base_path=tmp_path, sort_output=True)
+    write_csv(df, "a.csv", base_path=tmp_path, sort_output=True)
+    pd.testing.assert_frame_equal(
+        read_csv(tmp_path / f"a{suffix}"), read_csv(tmp_path / "a.csv")
+    )
+
+
+def test_write_compressed_csv_is_reproducible(tmp_path: Path):
+    df = pd.DataFrame({"a": [1]})
+    write_csv(df, "a.csv.gz", base_path=tmp_path)
+    content = (tmp_path / "a.csv.gz").read_bytes()
+    write_csv(df, "a.csv.gz", base_path=tmp_path)
+    assert (tmp_path / "a.csv.gz").read_bytes() == content
+
+
+def test_read_write_zstd_csv(tmp_path: Path):
+    pytest.importorskip("zstandard")
+    df = pd.DataFrame({"a": [1], "b": ["#x"]})
+    write_csv(df, "a.csv.zst", base_path=tmp_path)
+    pd.testing.assert_frame_equal(read_csv(tmp_path / "a.csv.zst"), df)
+
+
+def test_zstd_csv_without_zstandard(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(file_ops, "find_spec", lambda name: None)
+    csv_file = tmp_path / "a.csv.zst"
+    csv_file.write_bytes(b"")
+    with pytest.raises(DataCheckError, match=r"data-check\[zstd\]"):
+        read_csv(csv_file)
+    with pytest.raises(DataCheckError, match=r"data-check\[zstd\]"):
+        next(read_csv_chunks(csv_file, chunk_size=1))
+    with pytest.raises(DataCheckError, match=r"data-check\[zstd\]"):
+        write_csv(pd.DataFrame({"a": [1]}), "b.csv.zst", base_path=tmp_path)
+
+
 def test_get_expect_file_null():
     p = Path()
     ef = get_expect_file(p)
@@ -82,3 +184,84 @@ def test_read_csv_leading_zeros_as_string():
         string_columns=["leading_zero_varchar"],
     )
     assert df["leading_zero_varchar"].dtype == "object"
+
+
+def test_read_csv_chunks_same_as_read_csv():
+    csv_file = Path("load_data/sample/test_date_with_null_dates.csv")
+    chunks = list(read_csv_chunks(csv_file, chunk_size=1))
+    assert len(chunks) > 1
+    pd.testing.assert_frame_equal(
+        pd.concat(chunks, ignore_index=True), read_csv(csv_file)
+    )
+
+
+def test_read_csv_chunks_dates_from_first_chunk(tmp_path: Path):
+    csv_file = tmp_path / "dates.csv"
+    csv_file.write_text("d,s\n2020-01-01,a\n2020-01-02,2020-01-03\n", "UTF-8")
+    first, second = read_csv_chunks(csv_file, chunk_size=1)
+    assert first["d"].dtype == second["d"].dtype == "datetime64[ns]"
+    # not a date in the first chunk
+    assert second["s"].tolist() == ["2020-01-03"]
+
+
+def test_read_csv_chunks_date_columns(tmp_path: Path):
+    csv_file = tmp_path / "dates.csv"
+    csv_file.write_text("d,i\n,1\n2020-01-02,2\n", "UTF-8")
+    _, second = read_csv_chunks(csv_file, chunk_size=1, date_columns=["d"])
+    assert second["d"].dtype == "datetime64[ns]"
+
+
+def test_read_csv_chunks_dates_after_empty_chunk(tmp_path: Path):
+    csv_file = tmp_path / "dates.csv"
+    csv_file.write_text("d,i\n,1\n2020-01-02,2\n2020-01-03,3\n", "UTF-8")
+    _, second, third = read_csv_chunks(csv_file, chunk_size=1)
+    assert second["d"].dtype == third["d"].dtype == "datetime64[ns]"
+
+
+def test_read_csv_chunks_empty_file(tmp_path: Path):
+    csv_file = tmp_path / "empty.csv"
+    csv_file.write_text("a,b\n", "UTF-8")
+    (chunk,) = read_csv_chunks(csv_file, chunk_size=1)
+    assert chunk.columns.tolist() == ["a", "b"]
+
+
+def test_read_csv_chunks_non_unicode():
+    with pytest.raises(DataCheckError):
+        list(read_csv_chunks(Path("checks/failing/non_unicode.csv"), chunk_size=1))
+
+
+def test_csv_partitions_same_as_read_csv(tmp_path: Path):
+    csv_file = tmp_path / "partitions.csv"
+    csv_file.write_text("# comment\na,b\n1,x\n2,y\n3,z\n4,w\n5,\n", "UTF-8")
+    partitions = csv_partitions(csv_file, 3)
+    assert len(partitions) > 1
+    chunks = [
+        chunk
+        for byte_range in partitions
+        for chunk in read_csv_chunks(csv_file, chunk_size=2, byte_range=byte_range)
+    ]
+    pd.testing.assert_frame_equal(
+        pd.concat(chunks, ignore_index=True), read_csv(csv_file)
+    )
+
+
+def test_csv_partitions_start_at_line_breaks(tmp_path: Path):
+    csv_file = tmp_path / "partitions.csv"
+    csv_file.write_text("a\n" + "123456789\n" * 10, "UTF-8")
+    content = csv_file.read_bytes()
+    for start, end in csv_partitions(csv_file, 4):
+        assert content[start - 1 : start] == b"\n"
+        assert content[end - 1 : end] == b"\n"
+
+
+def test_csv_partitions_more_partitions_than_rows(tmp_path: Path):
+    csv_file = tmp_path / "partitions.csv"
+    csv_file.write_text("a\n1\n2\n", "UTF-8")
+    expected_partitions = 2
+    assert len(csv_partitions(csv_file, 10)) == expected_partitions
+
+
+def test_csv_partitions_empty_file(tmp_path: Path):
+    csv_file = tmp_path / "empty.csv"
+    csv_file.write_text("a,b\n", "UTF-8")
+    assert csv_partitions(csv_file, 2) == []
@@ -0,0 +1,128 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_check import DataCheck
+from data_check.checks.key_diff import key_diff
+from data_check.exceptions import DataCheckError
+from data_check.file_ops import read_key_columns
+from data_check.result import ResultType
+
+SIZE = 1000
+
+
+def run_check(dc: DataCheck, check_path: str):
+    check = dc.get_check(Path(check_path))
+    assert check
+    return check.run_test()
+
+
+@pytest.mark.parametrize(
+    "check_path",
+    [
+        "checks/key_columns/basic/key_columns.sql",
+        "checks/key_columns/basic/composite_key.sql",
+    ],
+)
+def test_key_columns_passing_checks(dc: DataCheck, check_path):
+    result = run_check(dc, check_path)
+    assert result
+    assert result.full_result is None
+
+
+def test_key_columns_failing_check(dc: DataCheck):
+    result = run_check(dc, "checks/key_columns/failing/changed_values.sql")
+    assert result.result_type == ResultType.FAILED
+    diff = result.result
+    assert diff[diff._diff == "changed"][
+        ["id", "_column", "_db", "_expected"]
+    ].values.tolist() == [["2", "name", "b", "B"]]
+    assert diff[diff._diff == "db"]["id"].tolist() == ["3"]
+    assert diff[diff._diff == "expected"]["id"].tolist() == ["4"]
+
+
+def test_key_columns_are_not_compared_on_the_server(dc: DataCheck):
+    dc.config.config["server_side_diff"] = True
+    dc.config.config["sort_merge_diff"] = True
+    result = run_check(dc, "checks/key_columns/failing/changed_values.sql")
+    assert set(result.result["_diff"]) == {"changed", "db", "expected"}
+
+
+def test_key_columns_print(dc: DataCheck):
+    result = run_check(dc, "checks/key_columns/failing/changed_values.sql")
+    dc.output.print_format = "csv"
+    output = dc.output.pprint_result(result)
+    assert output.splitlines()[0] == "id,_column,_db,_expected,_diff"
+    assert "2,name,b,B,changed" in output
+
+
+def test_key_diff_changed_values():
+    db = pd.DataFrame({"id": [1, 2, 3], "a": ["x", "y", None], "b": [1.0, 2.0, 3.0]})
+    expected = pd.DataFrame({"b": [3, 2, 5], "id": [3, 2, 1], "a": ["", "z", "x"]})
+    diff = key_diff(db, expected, ["id"])
+    assert diff.changed_count == 2  # noqa: PLR2004
+    assert (diff.db_only_count, diff.expected_only_count) == (0, 0)
+    assert sorted(diff.diff[["id", "_column", "_db", "_expected"]].values.tolist()) == [
+        ["1", "b", "1", "5"],
+        ["2", "a", "y", "z"],
+    ]
+
+
+def test_key_diff_rows_only_on_one_side():
+    db = pd.DataFrame({"k1": [1, 1], "k2": ["a", "b"], "v": [1, 2]})
+    expected = pd.DataFrame({"k1": [1, 2], "k2": ["a", "a"], "v": [1, 2]})
+    diff = key_diff(db, expected, ["k1", "k2"])
+    assert diff.changed_count == 0
+    assert diff.diff[["k1", "k2", "_diff"]].values.tolist() == [
+        ["1", "b", "db"],
+        ["2", "a", "expected"],
+    ]
+    assert diff.diff["_column"].isna().all()
+
+
+def test_key_diff_equal_results():
+    df = pd.DataFrame(
+        {"id": [1, 2], "d": pd.to_datetime(pd.Series(["2020-01-01", None]))}
+    )
+    diff = key_diff(df, df.iloc[::-1].copy(), ["id"])
+    assert len(diff.diff) == 0
+    assert diff.diff.columns.tolist() == ["id", "_column", "_db", "_expected", "_diff"]
+
+
+def test_key_diff_duplicate_keys():
+    with pytest.raises(DataCheckError, match="not unique in the expected result"):
+        key_diff(pd.DataFrame({"id": [1, 2]}), pd.DataFrame({"id": [1, 1]}), ["id"])
+
+
+def test_key_diff_missing_key_column():
+    with pytest.raises(DataCheckError, match="missing"):
+        key_diff(pd.DataFrame({"a": [1]}), pd.DataFrame({"a": [1]}), ["id"])
+
+
+def test_key_diff_wide_results():
+    rng = np.random.default_rng(42)
+    values = rng.integers(0, 10, (SIZE, 50))
+    db = pd.DataFrame(values).add_prefix("c")
+    db["id"] = range(SIZE)
+    expected = db.sample(frac=1, random_state=1).reset_index(drop=True)
+    expected.loc[expected.id == 7, "c3"] += 1  # noqa: PLR2004
+    diff = key_diff(db, expected, ["id"])
+    assert diff.diff[["id", "_column"]].values.tolist() == [["7", "c3"]]
+
+
+def test_read_key_columns(tmp_path: Path):
+    sql_file = tmp_path / "a.sql"
+    sql_file.write_text("\n-- a comment\n--Key_Columns: id ,name\nselect 1 as id")
+    assert read_key_columns(sql_file) == ["id", "name"]
+
+
+def test_read_key_columns_after_the_query(tmp_path: Path):
+    sql_file = tmp_path / "a.sql"
+    sql_file.write_text("select 1 as id\n-- key_columns: id")
+    assert read_key_columns(sql_file) == []
+
+
+def test_read_key_columns_missing_file(tmp_path: Path):
+    assert read_key_columns(tmp_path / "a.sql") == []
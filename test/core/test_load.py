@@ -1,13 +1,21 @@
+import gzip
 from pathlib import Path
 
 import pandas as pd
 import pytest
 from pandas.testing import assert_frame_equal
-from sqlalchemy import text
+from sqlalchemy import Date, text
+from sqlalchemy.dialects import mssql
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.schema import CreateTable
 
+from data_check.config import LOAD_CHUNK_SIZE
 from data_check.exceptions import DataCheckError
-from data_check.sql import DataCheckSql, LoadMode
+from data_check.sql import DataCheckSql, LoadMode, get_sql
+from data_check.sql.dialect.mssql import TableLoaderMSSQL
+from data_check.sql.dialect.postgresql import TableLoaderPostgreSQL, copy_text_row
 from data_check.sql.table import Table
+from data_check.sql.table_loader import TableLoader, read_ahead
 
 
 @pytest.fixture(scope="module", params=["csv", "xlsx"])
@@ -161,6 +169,15 @@ def test_load_from_files(sql: DataCheckSql):
     assert_frame_equal(data2, df2)
 
 
+def test_load_from_compressed_files(sql: DataCheckSql, tmp_path: Path):
+    data = pd.DataFrame.from_dict({"id": [0, 1, 2], "data": ["a", "b", "c"]})
+    csv = Path("load_data/test.csv").read_bytes()
+    (tmp_path / "main.test_load_compressed.csv.gz").write_bytes(gzip.compress(csv))
+    sql.table_loader.load_tables_from_files([tmp_path], LoadMode.REPLACE)
+    df = sql.run_query("select id, data from main.test_load_compressed")
+    assert_frame_equal(data, df)
+
+
 def test_load_from_files_non_existing_dir(sql: DataCheckSql):
     with pytest.raises(FileNotFoundError):
         sql.table_loader.load_tables_from_files(
@@ -290,3 +307,360 @@ def test_get_load_mode_set_append(sql: DataCheckSql):
     sql.config.config["default_load_mode"] = "append"
     mode = sql.table_loader.get_load_mode(None, LoadMode.DEFAULT)
     assert mode == LoadMode.APPEND
+
+
+def test_load_table_from_file_upsert_prints_rows(
+    sql: DataCheckSql, tmp_path: Path, capsys
+):
+    table = Table(sql, "test_load_table_from_file_upsert")
+    with sql.conn() as c:
+        c.execute(text(f"create table {table} (id integer primary key, data text)"))
+        c.execute(text(f"insert into {table} values (1, 'a')"))
+    csv_file = tmp_path / "upsert.csv"
+    csv_file.write_text("id,data\n1,b\n2,c\n", encoding="UTF-8")
+    assert sql.table_loader.load_table_from_file(
+        table=table.name, file=csv_file, mode=LoadMode.UPSERT
+    )
+    assert "1 rows inserted, 1 rows updated" in capsys.readouterr().out
+    df = sql.run_query(f"select id, data from {table}")
+    assert df["data"].tolist() == ["b", "c"]
+
+
+def test_upsert_duplicate_keys_last_row_wins(sql: DataCheckSql, tmp_path: Path, capsys):
+    table = Table(sql, "test_upsert_duplicate_keys")
+    with sql.conn() as c:
+        c.execute(text(f"create table {table} (id integer primary key, data text)"))
+        c.execute(text(f"insert into {table} values (1, 'a')"))
+    csv_file = tmp_path / "upsert.csv"
+    csv_file.write_text("id,data\n1,b\n2,c\n1,d\n2,e\n", encoding="UTF-8")
+    assert sql.table_loader.load_table_from_file(
+        table=table.name, file=csv_file, mode=LoadMode.UPSERT
+    )
+    assert "1 rows inserted, 3 rows updated" in capsys.readouterr().out
+    df = sql.run_query(f"select id, data from {table} order by id")
+    assert df["data"].tolist() == ["d", "e"]
+
+
+def test_mssql_staging_table_ddl(sql: DataCheckSql):
+    table = Table(sql, "test_mssql_staging_table_ddl")
+    with sql.conn() as c:
+        c.execute(text(f"create table {table} (id integer primary key, data text)"))
+    loader = TableLoaderMSSQL(sql, sql.output, LoadMode.TRUNCATE)
+    staging = loader.staging_table(table, ["id", "data"])
+    ddl = str(CreateTable(staging).compile(dialect=mssql.dialect()))
+    assert ddl.strip().startswith(f"CREATE TABLE [{staging.name}]")
+    assert staging.name.startswith("#dc_upsert_")
+
+
+def test_merge_upsert_statement(sql: DataCheckSql):
+    table = Table(sql, "test_merge_upsert_statement")
+    with sql.conn() as c:
+        c.execute(text(f"create table {table} (id integer primary key, data text)"))
+    staging = sql.table_loader.staging_table(table, ["id", "data"])
+    statement = str(sql.table_loader.merge_upsert_statement(table, staging))
+    assert statement == (
+        f"MERGE INTO test_merge_upsert_statement t USING {staging.name} s "
+        "ON (t.id = s.id) WHEN MATCHED THEN UPDATE SET t.data = s.data "
+        "WHEN NOT MATCHED THEN INSERT (id, data) VALUES (s.id, s.data)"
+    )
+
+
+def test_executemany_insert_same_values_as_to_sql(sql: DataCheckSql):
+    data = pd.DataFrame(
+        {
+            "i": [1, None],
+            "f": [1.5, 2.0],
+            "s": ["a", None],
+            "t": pd.to_datetime(pd.Series(["2020-01-02 03:04:05", None])),
+        }
+    )
+    # the loader disconnects when it's deleted, so it must be kept until the end
+    loaders = [TableLoader(sql, sql.output, LoadMode.APPEND), sql.table_loader]
+    tables: list[Table] = []
+    for loader in loaders:
+        table = Table(sql, f"test_executemany_insert_{len(tables)}")
+        with sql.conn() as c:
+            c.execute(text(f"create table {table} (i integer, f real, s text, t date)"))
+        loader.load_table(table, data, LoadMode.APPEND, dtype={"t": Date()})
+        tables.append(table)
+    values = [
+        sql.run_query(f"select i, f, s, t, typeof(i), typeof(t) from {table}")
+        for table in tables
+    ]
+    assert_frame_equal(values[0], values[1])
+
+
+def test_copy_text_row_null_differs_from_empty_string():
+    row = copy_text_row((1, "", None, "a\tb\\N\n", 1.5))
+    assert row == "1\t\t\\N\ta\\tb\\\\N\\n\t1.5\n"
+
+
+def test_load_table_from_file_prints_rows_per_second(
+    sql: DataCheckSql, tmp_path: Path, capsys
+):
+    sql.output.verbose = True
+    csv_file = tmp_path / "test_load_rows_per_second.csv"
+    csv_file.write_text("id\n1\n2\n", encoding="UTF-8")
+    sql.table_loader.load_table_from_file(
+        table="test_load_rows_per_second", file=csv_file, mode=LoadMode.REPLACE
+    )
+    assert "table test_load_rows_per_second: 2 rows in" in capsys.readouterr().out
+
+
+def test_load_rate_message():
+    message = TableLoader.load_rate_message("t", 1000, 0.5)
+    assert message == "table t: 1000 rows in 0.50s (2000 rows/s)"
+
+
+def test_duckdb_dataframe_insert():
+    pytest.importorskip("duckdb_engine")
+    duckdb_sql = get_sql("duckdb:///:memory:")
+    table = Table(duckdb_sql, "test_duckdb_dataframe_insert")
+    duckdb_sql.run_sql(f"create table {table} (i integer, s varchar, d date)")
+    data = pd.DataFrame(
+        {
+            "i": [1, 2],
+            "s": ["a", None],
+            "d": pd.to_datetime(pd.Series(["2020-01-02", None])),
+        }
+    )
+    assert duckdb_sql.table_loader.insert_method(table, data) is not None
+    duckdb_sql.table_loader.load_table(table, data, LoadMode.TRUNCATE)
+    df = duckdb_sql.run_query(f"select i, s, d from {table}")
+    assert_frame_equal(df, data)
+
+
+def test_duckdb_insert_mixed_object_column():
+    pytest.importorskip("duckdb_engine")
+    duckdb_sql = get_sql("duckdb:///:memory:")
+    table = Table(duckdb_sql, "test_duckdb_insert_mixed")
+    data = pd.DataFrame({"s": ["a", 1]}, dtype="object")
+    assert duckdb_sql.table_loader.insert_method(table, data) is None
+
+
+@pytest.mark.parametrize("mode", [LoadMode.TRUNCATE, LoadMode.REPLACE])
+def test_load_table_from_file_in_chunks(sql: DataCheckSql, tmp_path: Path, mode):
+    sql.config.config["load_chunk_size"] = 2
+    table = Table(sql, "test_load_table_from_file_in_chunks")
+    with sql.conn() as c:
+        c.execute(text(f"create table {table} (id integer, d date)"))
+        c.execute(text(f"insert into {table} values (0, '2000-01-01')"))
+    csv_file = tmp_path / "chunks.csv"
+    csv_file.write_text(
+        "id,d\n1,2020-01-01\n2,\n3,2020-01-03\n4,2020-01-04\n5,\n", encoding="UTF-8"
+    )
+    assert sql.table_loader.load_table_from_file(
+        table=table.name, file=csv_file, mode=mode
+    )
+    df = sql.run_query(f"select id, d from {table}")
+    assert df["id"].tolist() == [1, 2, 3, 4, 5]
+    assert df["d"].dtype == "datetime64[ns]"
+
+
+def test_load_new_table_from_file_in_chunks_same_types(
+    sql: DataCheckSql, tmp_path: Path
+):
+    csv_file = tmp_path / "types.csv"
+    csv_file.write_text("a,b\n1,\n2,\nx,2020-01-01\n", encoding="UTF-8")
+    column_types = []
+    for chunk_size in (LOAD_CHUNK_SIZE, 2):
+        sql.config.config["load_chunk_size"] = chunk_size
+        table = f"test_load_new_table_in_chunks_{chunk_size}"
+        assert sql.table_loader.load_table_from_file(
+            table=table, file=csv_file, mode=LoadMode.REPLACE
+        )
+        types = sql.run_query(f"select type from pragma_table_info('{table}')")
+        column_types.append(types["type"].tolist())
+    assert column_types[0] == column_types[1]
+
+
+def test_load_table_from_file_in_chunks_is_atomic(sql: DataCheckSql, tmp_path: Path):
+    sql.config.config["load_chunk_size"] = 1
+    table = Table(sql, "test_load_in_chunks_is_atomic")
+    with sql.conn() as c:
+        c.execute(text(f"create table {table} (id integer not null, data text)"))
+        c.execute(text(f"insert into {table} values (0, 'a')"))
+    csv_file = tmp_path / "atomic.csv"
+    # the last row fails because of the NOT NULL constraint
+    csv_file.write_text("id,data\n1,b\n2,c\n,d\n", encoding="UTF-8")
+    with pytest.raises(IntegrityError):
+        sql.table_loader.load_table_from_file(
+            table=table.name, file=csv_file, mode=LoadMode.TRUNCATE
+        )
+    df = sql.run_query(f"select id, data from {table}")
+    assert df["data"].tolist() == ["a"]
+
+
+def test_upsert_table_from_file_in_chunks(sql: DataCheckSql, tmp_path: Path, capsys):
+    sql.config.config["load_chunk_size"] = 1
+    table = Table(sql, "test_upsert_table_from_file_in_chunks")
+    with sql.conn() as c:
+        c.execute(text(f"create table {table} (id integer primary key, data text)"))
+        c.execute(text(f"insert into {table} values (1, 'a')"))
+    csv_file = tmp_path / "upsert.csv"
+    csv_file.write_text("id,data\n1,b\n2,c\n3,d\n", encoding="UTF-8")
+    sql.table_loader.load_table_from_file(
+        table=table.name, file=csv_file, mode=LoadMode.UPSERT
+    )
+    assert "2 rows inserted, 1 rows updated" in capsys.readouterr().out
+
+
+def test_read_ahead():
+    chunks = [pd.DataFrame({"a": [i]}) for i in range(3)]
+    assert list(read_ahead(iter(chunks))) == chunks
+
+
+def test_default_load_chunk_size(sql: DataCheckSql):
+    assert sql.table_loader.chunk_size == LOAD_CHUNK_SIZE
+
+
+def test_default_load_partitions(sql: DataCheckSql):
+    assert sql.table_loader.partitions == 1
+
+
+@pytest.mark.parametrize("mode", [LoadMode.TRUNCATE, LoadMode.APPEND])
+def test_load_table_from_file_in_partitions(
+    sql: DataCheckSql, tmp_path: Path, capsys, mode
+):
+    sql.config.config["load_partitions"] = 3
+    sql.table_loader.parallel_load = True
+    sql.output.verbose = True
+    table = Table(sql, "test_load_table_from_file_in_partitions")
+    with sql.conn() as c:
+        c.execute(text(f"create table {table} (id integer, d date)"))
+        c.execute(text(f"insert into {table} values (0, '2000-01-01')"))
+    csv_file = tmp_path / "partitions.csv"
+    csv_file.write_text(
+        "id,d\n1,2020-01-01\n2,\n3,2020-01-03\n4,2020-01-04\n5,\n", encoding="UTF-8"
+    )
+    assert sql.table_loader.use_partitions(table, csv_file, mode)
+    assert sql.table_loader.load_table_from_file(
+        table=table.name, file=csv_file, mode=mode
+    )
+    df = sql.run_query(f"select id, d from {table} order by id")
+    expected_ids = [1, 2, 3, 4, 5] if mode == LoadMode.TRUNCATE else [0, 1, 2, 3, 4, 5]
+    assert df["id"].tolist() == expected_ids
+    assert df["d"].dtype == "datetime64[ns]"
+    assert "5 rows in" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("mode", [LoadMode.REPLACE, LoadMode.UPSERT])
+def test_load_partitions_not_used_for_load_mode(
+    sql: DataCheckSql, tmp_path: Path, mode
+):
+    sql.config.config["load_partitions"] = 3
+    sql.table_loader.parallel_load = True
+    table = Table(sql, "test_load_partitions_not_used_for_load_mode")
+    with sql.conn() as c:
+        c.execute(text(f"create table {table} (id integer primary key)"))
+    assert not sql.table_loader.use_partitions(table, Path("data.csv"), mode)
+
+
+def test_load_partitions_not_used_for_new_table(sql: DataCheckSql):
+    sql.config.config["load_partitions"] = 3
+    sql.table_loader.parallel_load = True
+    table = Table(sql, "test_load_partitions_not_used_for_new_table")
+    assert not sql.table_loader.use_partitions(
+        table, Path("data.csv"), LoadMode.TRUNCATE
+    )
+
+
+def test_load_partitions_not_used_for_compressed_file(sql: DataCheckSql):
+    sql.config.config["load_partitions"] = 3
+    sql.table_loader.parallel_load = True
+    table = Table(sql, "test_load_partitions_not_used_for_compressed_file")
+    with sql.conn() as c:
+        c.execute(text(f"create table {table} (id integer)"))
+    assert sql.table_loader.use_partitions(table, Path("data.csv"), LoadMode.TRUNCATE)
+    assert not sql.table_loader.use_partitions(
+        table, Path("data.csv.gz"), LoadMode.TRUNCATE
+    )
+
+
+def test_sqlite_loads_without_partitions(sql: DataCheckSql):
+    sql.config.config["load_partitions"] = 3
+    table = Table(sql, "test_sqlite_loads_without_partitions")
+    with sql.conn() as c:
+        c.execute(text(f"create table {table} (id integer)"))
+    assert not sql.table_loader.use_partitions(
+        table, Path("data.csv"), LoadMode.TRUNCATE
+    )
+
+
+def create_foreign_key_tables(sql: DataCheckSql, tmp_path: Path) -> list[Path]:
+    with sql.conn() as c:
+        c.execute(text("pragma foreign_keys = on"))
+        c.execute(text("create table fk_parent (id integer primary key)"))
+        c.execute(
+            text(
+                "create table fk_child (id integer, "
+                "parent_id integer references fk_parent (id))"
+            )
+        )
+        c.execute(text("insert into fk_parent values (9)"))
+        c.execute(text("insert into fk_child values (9, 9)"))
+    (tmp_path / "fk_parent.csv").write_text("id\n1\n2\n", encoding="UTF-8")
+    # the child is sorted before the parent
+    (tmp_path / "fk_child.csv").write_text("id,parent_id\n1,1\n2,2\n", "UTF-8")
+    return [tmp_path]
+
+
+def test_load_dependencies(sql: DataCheckSql, tmp_path: Path):
+    create_foreign_key_tables(sql, tmp_path)
+    dependencies = sql.table_loader.load_dependencies(
+        ["fk_child", "fk_parent", "other"]
+    )
+    assert dependencies == {0: {1}}
+
+
+def test_load_dependencies_only_for_loaded_tables(sql: DataCheckSql, tmp_path: Path):
+    create_foreign_key_tables(sql, tmp_path)
+    assert sql.table_loader.load_dependencies(["fk_child"]) == {}
+
+
+def test_load_dependencies_with_cycle(sql: DataCheckSql, capsys):
+    with sql.conn() as c:
+        c.execute(text("create table fk_a (id integer primary key, b integer)"))
+        c.execute(
+            text(
+                "create table fk_b (id integer primary key, "
+                "a integer references fk_a (id))"
+            )
+        )
+        c.execute(text("drop table fk_a"))
+        c.execute(
+            text(
+                "create table fk_a (id integer primary key, "
+                "b integer references fk_b (id))"
+            )
+        )
+    assert sql.table_loader.load_dependencies(["fk_a", "fk_b"]) == {}
+    assert "cycle" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("mode", [LoadMode.TRUNCATE, LoadMode.APPEND])
+def test_load_from_files_with_foreign_keys(sql: DataCheckSql, tmp_path: Path, mode):
+    files = create_foreign_key_tables(sql, tmp_path)
+    assert sql.table_loader.load_tables_from_files(files, mode)
+    df = sql.run_query("select id, parent_id from fk_child order by id")
+    expected_ids = [1, 2] if mode == LoadMode.TRUNCATE else [1, 2, 9]
+    assert df["id"].tolist() == expected_ids
+
+
+def test_truncate_tables_in_reverse_order(sql: DataCheckSql, tmp_path: Path):
+    create_foreign_key_tables(sql, tmp_path)
+    # the parent can only be deleted after the child
+    sql.table_loader.truncate_tables(["fk_parent", "fk_child"], {1: {0}})
+    assert len(sql.run_query("select * from fk_parent")) == 0
+
+
+def test_truncate_statements(sql: DataCheckSql):
+    tables = [Table(sql, "fk_child", "main"), Table(sql, "fk_parent", "main")]
+    assert sql.table_loader.truncate_statements(tables) == [
+        "DELETE FROM main.fk_child",
+        "DELETE FROM main.fk_parent",
+    ]
+    loader = TableLoaderPostgreSQL(sql, sql.output, LoadMode.TRUNCATE)
+    assert loader.truncate_statements(tables) == [
+        "TRUNCATE TABLE main.fk_child, main.fk_parent"
+    ]
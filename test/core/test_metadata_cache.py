@@ -0,0 +1,218 @@
+import json
+from pathlib import Path
+from typing import Optional
+
+import pytest
+from sqlalchemy import Column, DefaultClause, MetaData, text
+from sqlalchemy import Table as SQLTable
+from sqlalchemy.exc import NoSuchTableError
+
+from data_check.sql import DataCheckSql, Table
+from data_check.sql.metadata_cache import TYPE_KEY, MetadataCache, is_ddl
+
+
+class CountingCache(MetadataCache):
+    """Counts the reflections, i.e. the accesses of the inspector."""
+
+    def __init__(self, sql: DataCheckSql, cache_path=None) -> None:
+        super().__init__(sql, cache_path)
+        self.reflections = 0
+
+    def _get(self, table_name, schema, kind, reflect):
+        def counting_reflect(inspector):
+            self.reflections += 1
+            return reflect(inspector)
+
+        return super()._get(table_name, schema, kind, counting_reflect)
+
+
+def create_table(sql: DataCheckSql, name: str):
+    with sql.conn() as c:
+        c.execute(text(f"create table {name} (id integer primary key, data text)"))
+
+
+def column_default(column: Column) -> Optional[str]:
+    default = column.server_default
+    return str(default.arg) if isinstance(default, DefaultClause) else None
+
+
+def test_metadata_is_reflected_once(sql: DataCheckSql):
+    create_table(sql, "test_metadata_once")
+    cache = CountingCache(sql)
+    for _ in range(3):
+        assert cache.has_table("test_metadata_once")
+        assert [c["name"] for c in cache.get_columns("test_metadata_once")] == [
+            "id",
+            "data",
+        ]
+    # existence and columns
+    expected_reflections = 2
+    assert cache.reflections == expected_reflections
+
+
+def test_missing_table_is_not_cached(sql: DataCheckSql):
+    cache = MetadataCache(sql)
+    assert not cache.has_table("test_metadata_missing")
+    create_table(sql, "test_metadata_missing")
+    assert cache.has_table("test_metadata_missing")
+
+
+def test_columns_of_missing_table(sql: DataCheckSql):
+    with pytest.raises(NoSuchTableError):
+        MetadataCache(sql).get_columns("test_metadata_missing")
+
+
+def test_invalidate(sql: DataCheckSql):
+    create_table(sql, "test_metadata_invalidate")
+    cache = MetadataCache(sql)
+    assert cache.has_table("test_metadata_invalidate")
+    with sql.conn() as c:
+        c.execute(text("drop table test_metadata_invalidate"))
+    assert cache.has_table("test_metadata_invalidate")
+    cache.invalidate("test_metadata_invalidate")
+    assert not cache.has_table("test_metadata_invalidate")
+
+
+def test_persisted_cache(sql: DataCheckSql, tmp_path: Path):
+    create_table(sql, "test_metadata_persisted")
+    columns = CountingCache(sql, tmp_path).get_columns("test_metadata_persisted")
+    cache = CountingCache(sql, tmp_path)
+    assert [c["name"] for c in cache.get_columns("test_metadata_persisted")] == [
+        c["name"] for c in columns
+    ]
+    assert cache.reflections == 0
+
+
+def test_clear_persisted_cache(sql: DataCheckSql, tmp_path: Path):
+    create_table(sql, "test_metadata_clear")
+    MetadataCache(sql, tmp_path / "cache").get_columns("test_metadata_clear")
+    cache = CountingCache(sql, tmp_path / "cache")
+    cache.clear()
+    cache.get_columns("test_metadata_clear")
+    assert cache.reflections == 1
+
+
+def test_persisted_cache_is_json(sql: DataCheckSql, tmp_path: Path):
+    with sql.conn() as c:
+        c.execute(
+            text("create table test_metadata_json (id integer, data varchar(10))")
+        )
+    columns = MetadataCache(sql, tmp_path).get_columns("test_metadata_json")
+    (entry_file,) = tmp_path.iterdir()
+    assert entry_file.suffix == ".json"
+    assert json.loads(entry_file.read_text(encoding="UTF-8"))
+    cached = CountingCache(sql, tmp_path).get_columns("test_metadata_json")
+    assert [repr(c["type"]) for c in cached] == [repr(c["type"]) for c in columns]
+
+
+def test_persisted_cache_only_creates_types(sql: DataCheckSql, tmp_path: Path):
+    create_table(sql, "test_metadata_other")
+    MetadataCache(sql, tmp_path).get_columns("test_metadata_other")
+    (entry_file,) = tmp_path.iterdir()
+    entry = json.loads(entry_file.read_text(encoding="UTF-8"))
+    entry["columns"][0]["type"] = {
+        TYPE_KEY: "os:system",
+        "arguments": {"command": "exit"},
+    }
+    entry_file.write_text(json.dumps(entry), encoding="UTF-8")
+    cache = CountingCache(sql, tmp_path)
+    assert [c["name"] for c in cache.get_columns("test_metadata_other")] == [
+        "id",
+        "data",
+    ]
+    assert cache.reflections == 1
+
+
+def test_sql_table_keeps_defaults(sql: DataCheckSql):
+    with sql.conn() as c:
+        c.execute(
+            text(
+                "create table test_metadata_defaults "
+                "(id integer primary key autoincrement, data text default 'x')"
+            )
+        )
+    sql_table = Table(sql, "test_metadata_defaults").sql_table
+    with sql.conn() as c:
+        reflected = SQLTable("test_metadata_defaults", MetaData(), autoload_with=c)
+    assert [
+        (c.name, c.primary_key, c.nullable, c.autoincrement, column_default(c))
+        for c in sql_table.columns
+    ] == [
+        (c.name, c.primary_key, c.nullable, c.autoincrement, column_default(c))
+        for c in reflected.columns
+    ]
+    assert column_default(sql_table.c.data) == "'x'"
+
+
+def test_table_uses_metadata_cache(sql: DataCheckSql):
+    create_table(sql, "test_metadata_table")
+    sql.metadata = CountingCache(sql)  # type: ignore[misc]
+    for _ in range(2):
+        table = Table.from_table_name(sql, "test_metadata_table")
+        assert table.primary_keys == ["id"]
+        assert table.sql_table.primary_key.columns.keys() == ["id"]
+    # primary key and columns
+    expected_reflections = 2
+    assert sql.metadata.reflections == expected_reflections
+
+
+def test_load_replace_invalidates_table(sql: DataCheckSql, tmp_path: Path):
+    sql.config.config["metadata_cache"] = True
+    create_table(sql, "test_metadata_replace")
+    assert Table(sql, "test_metadata_replace").columns
+    csv_file = tmp_path / "replace.csv"
+    csv_file.write_text("other\n1\n", encoding="UTF-8")
+    sql.table_loader.load_table_from_file(
+        table="test_metadata_replace", file=csv_file, mode="replace"
+    )
+    columns = Table(sql, "test_metadata_replace").columns
+    assert [c["name"] for c in columns] == ["other"]
+
+
+def test_run_sql_with_ddl_clears_cache(sql: DataCheckSql):
+    sql.config.config["metadata_cache"] = True
+    create_table(sql, "test_metadata_ddl")
+    assert Table(sql, "test_metadata_ddl").exists()
+    sql.run_sql("drop table test_metadata_ddl")
+    assert not Table(sql, "test_metadata_ddl").exists()
+
+
+@pytest.mark.parametrize(
+    ("statement", "expected"),
+    [
+        ("create table a (b int)", True),
+        ("DROP TABLE a", True),
+        ("alter table a add c int", True),
+        ("select created_at from a", False),
+        ("insert into a values (1)", False),
+    ],
+)
+def test_is_ddl(statement: str, expected: bool):
+    assert is_ddl(statement) == expected
+
+
+def test_metadata_cache_is_not_persisted_by_default(sql: DataCheckSql):
+    assert sql.metadata.cache_path is None
+
+
+def test_metadata_is_not_cached_by_default(sql: DataCheckSql):
+    create_table(sql, "test_metadata_not_cached")
+    assert not sql.metadata.enabled
+    assert Table(sql, "test_metadata_not_cached").exists()
+    # changed outside of run_sql, e.g. by a cmd step
+    with sql.conn() as c:
+        c.execute(text("drop table test_metadata_not_cached"))
+        c.execute(text("create table test_metadata_not_cached (other integer)"))
+    columns = Table(sql, "test_metadata_not_cached").columns
+    assert [c["name"] for c in columns] == ["other"]
+
+
+def test_metadata_cache_enabled(sql: DataCheckSql):
+    sql.config.config["metadata_cache"] = True
+    assert sql.metadata.enabled
+
+
+def test_metadata_cache_path(sql: DataCheckSql):
+    sql.config.config["metadata_cache"] = True
+    assert sql.metadata.cache_path is not None
+    assert sql.metadata.cache_path.parent == sql.config.metadata_path
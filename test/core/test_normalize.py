@@ -0,0 +1,89 @@
+import datetime
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from data_check.checks.csv_check import CSVCheck
+from data_check.checks.sql_base_check import SQLBaseCheck
+
+
+def normalize_per_cell(df: pd.DataFrame):
+    """The normalization that replaces the values in every cell."""
+    df.fillna(value=pd.NA, inplace=True)
+    df.replace(r"^$", pd.NA, regex=True, inplace=True)
+    df.replace({pd.NaT: pd.NA}, inplace=True)
+
+
+def is_mixed_per_value(col_1: pd.Series, col_2: pd.Series) -> bool:
+    """The check for mixed columns that collects the type of every value."""
+    both_types = {type(el) for el in col_1.array} | {type(el) for el in col_2.array}
+    return both_types in ({str, int}, {str, float}, {str, int, float})
+
+
+COLUMNS = {
+    "float": [1.5, np.nan, 2.0],
+    "int": [1, 2, 3],
+    "bool": [True, False, True],
+    "str": ["a", "", "b"],
+    "str_none": ["a", None, ""],
+    "str_nan": ["", np.nan, "c"],
+    "str_int": ["a", 1, ""],
+    "str_float": ["a", 1.5, 2.0],
+    "str_int_float": ["a", 1, 1.5],
+    "int_float": [1, 1.5, np.nan],
+    "object_int": pd.Series([1, 2, 3], dtype=object),
+    "object_bool": [True, None, False],
+    "object_float": pd.Series([1.5, 2.0, 3.0], dtype=object),
+    "object_datetime": [datetime.datetime(2020, 1, 1)] * 3,
+    "object_nat": [pd.NaT, "a", ""],
+    "decimal": [Decimal("1.5"), None, Decimal(2)],
+    "date": [datetime.date(2020, 1, 1), None, datetime.date(2020, 1, 2)],
+    "datetime": pd.to_datetime(pd.Series(["2020-01-01", None, "2020-01-02"])),
+    "datetime_tz": pd.to_datetime(
+        pd.Series(["2020-01-01", None, "2020-01-02"])
+    ).dt.tz_localize("UTC"),
+    "string": pd.Series(["a", None, ""], dtype="string"),
+    "Int64": pd.Series([1, None, 3], dtype="Int64"),
+    "spaces": [" ", "a\n", "\t"],
+    "empty": pd.Series([None, None, None], dtype=object),
+}
+
+
+def test_normalize_result_same_as_per_cell():
+    df = pd.DataFrame(COLUMNS)
+    expected = df.copy()
+    normalize_per_cell(expected)
+    CSVCheck.normalize_result(df)
+    assert_frame_equal(df, expected)
+
+
+def test_normalize_result_without_rows():
+    df = pd.DataFrame({"a": pd.Series([], dtype=object)})
+    CSVCheck.normalize_result(df)
+    assert df["a"].dtype == object
+
+
+def test_normalize_result_duplicate_columns():
+    df = pd.DataFrame([["", 1, None]], columns=["a", "b", "a"])
+    CSVCheck.normalize_result(df)
+    assert df.iloc[0].isna().tolist() == [True, False, True]
+
+
+@pytest.mark.parametrize("column_1", COLUMNS)
+def test_is_mixed_column_same_as_per_value(column_1):
+    df = pd.DataFrame(COLUMNS)
+    for column_2 in COLUMNS:
+        assert SQLBaseCheck.is_mixed_column(
+            df[column_1], df[column_2]
+        ) == is_mixed_per_value(df[column_1], df[column_2]), column_2
+
+
+def test_convert_mixed_object_columns():
+    df_1 = pd.DataFrame({"a": ["1", "x"], "b": ["1", "2"]})
+    df_2 = pd.DataFrame({"a": [1, "x"], "b": ["1", "2"]}, dtype=object)
+    SQLBaseCheck.convert_mixed_object_columns(df_1, df_2)
+    assert df_2["a"].tolist() == ["1", "x"]
+    assert df_2["b"].tolist() == ["1", "2"]
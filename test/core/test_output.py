@@ -1,11 +1,13 @@
+import itertools
 from pathlib import Path
 from typing import cast
 
+import numpy as np
 import pandas as pd
 import pytest
 from pandas.testing import assert_frame_equal
 
-from data_check.output import DataCheckOutput
+from data_check.output import DataCheckOutput, diffed_df
 from data_check.output.diffed_df import get_diffed_df
 from data_check.result import DataCheckResult
 
@@ -77,3 +79,73 @@ def test_diffed():
         {"id": [2, 2], "x": ["y", "z"], "_merge": ["left_only", "right_only"]}
     )
     assert_frame_equal(diffed, expected)
+
+
+def brute_force_columns(full: pd.DataFrame) -> list[str]:
+    """The columns that were kept by the exhaustive search over all combinations."""
+    columns = [c for c in full.columns if c != "_merge"]
+    target = len(full.drop_duplicates())
+    for size in range(len(columns) - 1, 0, -1):
+        for removed in itertools.combinations(columns[1:], size):
+            kept = [c for c in columns if c not in removed]
+            if len(full[kept].drop_duplicates()) == target:
+                return kept
+    return columns
+
+
+def random_full_result(rng: np.random.Generator, columns: int) -> pd.DataFrame:
+    full = pd.DataFrame(
+        rng.choice([0, 1, 2, None], (40, columns)),
+        columns=[f"c{i}" for i in range(columns)],
+    ).drop_duplicates()
+    full["_merge"] = rng.choice(["both", "left_only", "right_only"], len(full))
+    return full
+
+
+def get_diffed_columns(full: pd.DataFrame, **kwargs) -> list[str]:
+    result = DataCheckResult(passed=False, source="test", full_result=full)
+    return get_diffed_df(full, result, **kwargs).columns.tolist()[:-1]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_diffed_same_as_exhaustive_search(seed: int):
+    full = random_full_result(np.random.default_rng(seed), columns=6)
+    assert get_diffed_columns(full) == brute_force_columns(full)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_diffed_greedy_search(seed: int, monkeypatch):
+    monkeypatch.setattr(diffed_df, "EXACT_SEARCH_COLUMNS", 0)
+    full = random_full_result(np.random.default_rng(seed), columns=6)
+    columns = get_diffed_columns(full)
+    target = len(full.drop_duplicates())
+    assert columns[0] == "c0"
+    assert len(full[columns].drop_duplicates()) == target
+    # no column can be removed from the result
+    for c in columns[1:]:
+        others = [o for o in columns if o != c]
+        assert len(full[others].drop_duplicates()) < target
+
+
+def test_diffed_wide_result():
+    rng = np.random.default_rng(42)
+    full = pd.DataFrame(rng.integers(0, 1000, (1000, 30))).add_prefix("c")
+    full["c0"] = range(len(full))
+    full["_merge"] = "both"
+    changed = full.iloc[[0]].assign(c17=-1, _merge="right_only")
+    full.loc[0, "_merge"] = "left_only"
+    full = pd.concat([full, changed], ignore_index=True)
+    assert get_diffed_columns(full) == ["c0", "c17"]
+
+
+def test_diffed_keeps_all_columns_over_budget():
+    full = pd.DataFrame(
+        {
+            "a": [1, 1, 2],
+            "b": ["x", "y", "x"],
+            "c": [1, 1, 1],
+            "_merge": ["left_only", "right_only", "both"],
+        }
+    )
+    assert get_diffed_columns(full) == ["a", "b"]
+    assert get_diffed_columns(full, time_budget=-1) == ["a", "b", "c"]
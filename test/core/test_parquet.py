@@ -0,0 +1,200 @@
+import datetime
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from data_check import DataCheck
+from data_check.checks import DataCheckGenerator, ParquetCheck
+from data_check.exceptions import DataCheckError
+from data_check.file_ops import (
+    read_parquet,
+    read_parquet_chunks,
+    write_file,
+    write_parquet,
+)
+from data_check.sql import DataCheckSql, LoadMode
+
+pytest.importorskip("pyarrow")
+
+CHUNK_SIZE = 2
+
+
+def test_parquet_check(dc: DataCheck):
+    check = dc.get_check(Path("checks/parquet/basic/simple_parquet.sql"))
+    assert isinstance(check, ParquetCheck)
+    result = check.run_test()
+    assert result
+
+
+def test_parquet_check_from_parquet_file(dc: DataCheck):
+    check = dc.get_check(Path("checks/parquet/basic/simple_parquet.parquet"))
+    assert isinstance(check, ParquetCheck)
+    assert check.check_path.suffix == ".sql"
+    assert check.run_test()
+
+
+def test_empty_query(dc: DataCheck):
+    check = dc.get_check(Path("checks/parquet/basic/empty.sql"))
+    assert check
+    result = check.run_test()
+    assert result
+
+
+def test_data_types(dc: DataCheck):
+    check = dc.get_check(Path("checks/parquet/basic/data_types.sql"))
+    assert check
+    result = check.run_test()
+    assert result
+
+
+def test_failing(dc: DataCheck):
+    check = dc.get_check(Path("checks/parquet/failing/failing_parquet.sql"))
+    assert check
+    result = check.run_test()
+    assert not result
+
+
+def test_read_parquet_keeps_types(tmp_path: Path):
+    df = pd.DataFrame(
+        {
+            "i": [1, 2],
+            "s": ["2020-01-01", "0123"],
+            "f": [1.5, None],
+            "d": [datetime.date(2020, 1, 1), None],
+        }
+    )
+    df.to_parquet(tmp_path / "a.parquet", index=False)
+    result = read_parquet(tmp_path / "a.parquet")
+    assert result["i"].dtype == "int64"
+    # strings are not parsed as dates or numbers
+    assert result["s"].tolist() == ["2020-01-01", "0123"]
+    assert result["f"].dtype == "float64"
+    assert result["d"].dtype == "datetime64[ns]"
+
+
+def test_read_parquet_chunks(tmp_path: Path):
+    df = pd.DataFrame({"a": [0, 1, 2, 3, 4], "b": list("abcde")})
+    df.to_parquet(tmp_path / "a.parquet", index=False)
+    chunks = list(read_parquet_chunks(tmp_path / "a.parquet", CHUNK_SIZE))
+    assert [len(c) for c in chunks] == [2, 2, 1]
+    assert_frame_equal(pd.concat(chunks, ignore_index=True), df)
+
+
+def test_read_parquet_chunks_empty_file(tmp_path: Path):
+    pd.DataFrame({"a": pd.Series([], dtype="int64")}).to_parquet(
+        tmp_path / "a.parquet", index=False
+    )
+    chunks = list(read_parquet_chunks(tmp_path / "a.parquet", CHUNK_SIZE))
+    assert len(chunks) == 1
+    assert chunks[0].columns.tolist() == ["a"]
+
+
+def test_read_parquet_invalid_file(tmp_path: Path):
+    (tmp_path / "a.parquet").write_text("a\n1\n")
+    with pytest.raises(DataCheckError):
+        read_parquet(tmp_path / "a.parquet")
+
+
+def test_write_parquet_sorted(tmp_path: Path):
+    df = pd.DataFrame({"a": [2, 1]})
+    write_parquet(df, "a.parquet", base_path=tmp_path, sort_output=True)
+    assert pd.read_parquet(tmp_path / "a.parquet")["a"].tolist() == [1, 2]
+
+
+def test_write_file_by_suffix(tmp_path: Path):
+    df = pd.DataFrame({"a": [1]})
+    write_file(df, "a.csv", base_path=tmp_path)
+    write_file(df, "a.parquet", base_path=tmp_path)
+    assert (tmp_path / "a.csv").read_text().splitlines() == ["a", "1"]
+    assert_frame_equal(pd.read_parquet(tmp_path / "a.parquet"), df)
+
+
+def test_run_sql_output_parquet(dc: DataCheck, tmp_path: Path):
+    dc.run_sql_query(
+        "select 1 as a, '2020-01-01' as d", output="a.parquet", base_path=tmp_path
+    )
+    result = pd.read_parquet(tmp_path / "a.parquet")
+    assert result["a"].dtype == "int64"
+    assert result["d"].dtype == "datetime64[ns]"
+
+
+def test_generate_parquet(dc: DataCheck, tmp_path: Path):
+    dc.config.generate_mode = True
+    dc.config.generate_format = "parquet"
+    sql_file = tmp_path / "a.sql"
+    sql_file.write_text("select 1 as a, 'b' as b")
+    check = dc.get_check(sql_file)
+    assert isinstance(check, DataCheckGenerator)
+    assert check.run_test()
+    assert (tmp_path / "a.parquet").exists()
+    assert not (tmp_path / "a.csv").exists()
+
+    dc.config.generate_mode = False
+    check = dc.get_check(sql_file)
+    assert isinstance(check, ParquetCheck)
+    assert check.run_test()
+
+
+def test_generate_existing_parquet_file(dc: DataCheck, tmp_path: Path):
+    dc.config.generate_mode = True
+    sql_file = tmp_path / "a.sql"
+    sql_file.write_text("select 2 as a")
+    pd.DataFrame({"a": [1]}).to_parquet(tmp_path / "a.parquet", index=False)
+    dc.config.force = True
+    check = dc.get_check(sql_file)
+    assert check
+    assert check.run_test()
+    assert pd.read_parquet(tmp_path / "a.parquet")["a"].tolist() == [2]
+    assert not (tmp_path / "a.csv").exists()
+
+
+def test_table_check_parquet(dc: DataCheck, tmp_path: Path):
+    dc.sql.run_sql("create table test_table_check_parquet (a int, b varchar(10))")
+    dc.sql.run_sql("insert into test_table_check_parquet values (1, 'x')")
+    pd.DataFrame({"a": [1], "b": ["x"]}).to_parquet(
+        tmp_path / "test_table_check_parquet.parquet", index=False
+    )
+    check = dc.get_check(tmp_path / "test_table_check_parquet.parquet")
+    assert check
+    assert check.run_test()
+
+
+def test_load_from_parquet_file(sql: DataCheckSql):
+    data = pd.DataFrame.from_dict({"id": [0, 1, 2], "data": ["a", "b", "c"]})
+    sql.table_loader.load_table_from_file(
+        "test_load_from_parquet_file",
+        Path("load_data/test.parquet"),
+        LoadMode.REPLACE,
+    )
+    df = sql.run_query("select id, data from test_load_from_parquet_file")
+    assert_frame_equal(data, df)
+
+
+def test_load_from_parquet_file_in_chunks(sql: DataCheckSql):
+    sql.config.config["load_chunk_size"] = CHUNK_SIZE
+    sql.table_loader.load_table_from_file(
+        "test_load_from_parquet_file_in_chunks",
+        Path("load_data/test.parquet"),
+        LoadMode.TRUNCATE,
+    )
+    df = sql.run_query("select id, data from test_load_from_parquet_file_in_chunks")
+    assert df["id"].tolist() == [0, 1, 2]
+
+
+def test_load_tables_from_parquet_files(sql: DataCheckSql, tmp_path: Path):
+    pd.DataFrame({"a": [1, 2]}).to_parquet(tmp_path / "parquet_a.parquet", index=False)
+    sql.table_loader.load_tables_from_files([tmp_path], LoadMode.REPLACE)
+    df = sql.run_query("select a from parquet_a")
+    assert df["a"].tolist() == [1, 2]
+
+
+def test_parquet_without_pyarrow(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    # a missing module is None in sys.modules, importing it fails
+    monkeypatch.setitem(sys.modules, "pyarrow.parquet", None)
+    with pytest.raises(DataCheckError, match=r"data-check\[arrow\]"):
+        write_parquet(pd.DataFrame({"a": [1]}), "a.parquet", base_path=tmp_path)
+    with pytest.raises(DataCheckError, match=r"data-check\[arrow\]"):
+        read_parquet(tmp_path / "a.parquet")
@@ -0,0 +1,134 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from data_check import DataCheck
+from data_check.checks import partitioned_merge as pm
+from data_check.checks.csv_check import CSVCheck
+from data_check.checks.sql_base_check import SQLBaseCheck
+
+PARTITIONS = 3
+SIZE = 300
+
+
+@pytest.fixture(scope="module")
+def small_partitions():
+    # the pool is shared by the tests, spawning the processes takes a while
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(pm, "PARTITION_MIN_ROWS", 0)
+        yield
+    pm.shutdown_pool()
+
+
+def random_result(seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "id": rng.integers(0, 50, SIZE),
+            "s": rng.choice(np.array(["a", "b", "", None], dtype=object), SIZE),
+            "f": rng.choice([0.5, 1.0, np.nan], SIZE),
+            "d": pd.Timestamp("2020-01-01")
+            + pd.to_timedelta(rng.integers(0, 5, SIZE), unit="D"),
+        }
+    )
+    CSVCheck.normalize_result(df)
+    return df
+
+
+def single_merge(left: pd.DataFrame, right: pd.DataFrame) -> pd.DataFrame:
+    return SQLBaseCheck.merge_results(left.copy(), right.copy())
+
+
+@pytest.mark.usefixtures("small_partitions")
+def test_partitioned_merge_same_as_single_merge():
+    left, right = random_result(1), random_result(2)
+    expected = single_merge(left, right)
+    merged = SQLBaseCheck.merge_results(left, right, partitions=PARTITIONS)
+    assert_frame_equal(merged, expected)
+
+
+@pytest.mark.usefixtures("small_partitions")
+def test_partitioned_merge_equal_results():
+    left = random_result(1)
+    merged = pm.partitioned_merge(left, left.copy(), PARTITIONS)
+    assert merged is not None
+    assert_frame_equal(merged, single_merge(left, left))
+    assert (merged._merge == "both").all()
+
+
+@pytest.mark.usefixtures("small_partitions")
+def test_partitioned_merge_different_types():
+    left = pd.DataFrame({"id": [1, 2], "a": ["1", "2"]})
+    right = pd.DataFrame({"id": [1, 2], "a": [1, 3]})
+    # the columns must be converted, like in a single merge
+    assert pm.partitioned_merge(left, right, PARTITIONS) is None
+    merged = SQLBaseCheck.merge_results(left, right, partitions=PARTITIONS)
+    assert merged._merge.tolist() == ["both", "left_only", "right_only"]
+
+
+@pytest.mark.usefixtures("small_partitions")
+def test_partitioned_merge_without_hash_columns():
+    df = pd.DataFrame({"f": [1.5, 2.5]})
+    assert pm.partitioned_merge(df, df.copy(), PARTITIONS) is None
+
+
+def test_partitioned_merge_small_results(monkeypatch):
+    monkeypatch.setattr(pm, "PARTITION_MIN_ROWS", SIZE)
+    df = pd.DataFrame({"id": [1, 2]})
+    assert pm.partitioned_merge(df, df.copy(), PARTITIONS) is None
+
+
+@pytest.mark.usefixtures("small_partitions")
+def test_partitioned_merge_single_partition():
+    df = pd.DataFrame({"id": [1, 2]})
+    assert pm.partitioned_merge(df, df.copy(), 1) is None
+
+
+def test_row_partitions_missing_values():
+    left = pd.DataFrame({"s": ["a", None, pd.NA]}, dtype=object)
+    right = pd.DataFrame({"s": [pd.NA, "a", np.nan]}, dtype=object)
+    left_partitions = pm._row_partitions(left, ["s"], PARTITIONS)
+    right_partitions = pm._row_partitions(right, ["s"], PARTITIONS)
+    assert left_partitions[0] == right_partitions[1]
+    assert len({*left_partitions[1:], right_partitions[0], right_partitions[2]}) == 1
+
+
+@pytest.mark.parametrize(
+    ("col_1", "col_2", "expected"),
+    [
+        (pd.Series([1]), pd.Series([2]), True),
+        (pd.Series([1]), pd.Series([2], dtype="int32"), False),
+        (pd.Series([1.0]), pd.Series([2.0]), False),
+        (pd.Series(["a", pd.NA]), pd.Series(["b"]), True),
+        (pd.Series(["a", 1]), pd.Series(["b"]), False),
+        (pd.Series(pd.to_datetime(["2020-01-01"])), pd.Series([pd.NaT]), True),
+    ],
+)
+def test_is_hash_column(col_1: pd.Series, col_2: pd.Series, expected: bool):
+    assert pm._is_hash_column(col_1, col_2) == expected
+
+
+@pytest.mark.usefixtures("small_partitions")
+@pytest.mark.parametrize(
+    "check_path",
+    [
+        "checks/basic/data_types.sql",
+        "checks/basic/duplicates.sql",
+        "checks/basic/mixed_dates.sql",
+        "checks/failing/diff.sql",
+        "checks/failing/duplicates.sql",
+    ],
+)
+def test_partitioned_check_same_as_single_process(dc: DataCheck, check_path: str):
+    check = dc.get_check(Path(check_path))
+    assert check
+    expected = check.run_test()
+    dc.config.config["compare_partitions"] = PARTITIONS
+    result = check.run_test()
+    assert result.result_type == expected.result_type
+    assert result.full_result is not None
+    assert expected.full_result is not None
+    assert_frame_equal(result.full_result, expected.full_result)
@@ -0,0 +1,161 @@
+import datetime
+from decimal import Decimal
+
+import pandas as pd
+import pytest
+from sqlalchemy import text
+
+from data_check.date import parse_date_columns
+from data_check.sql import DataCheckSql, get_sql
+from data_check.sql.query_result import (
+    QueryResult,
+    arrow_to_frame,
+    parse_result_dates,
+    rows_to_frame,
+)
+
+FIVE_ROWS = " union all ".join(f"select {i} as a, 'x{i}' as b" for i in range(5))
+CHUNK_SIZE = 2
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        [1, 2],
+        [1, None],
+        [1.5, None],
+        [Decimal("1.5"), None],
+        [Decimal("1.5"), 2],
+        [Decimal("1.5"), "a"],
+        ["a", None],
+        [datetime.datetime(2020, 1, 1), None],
+        [datetime.date(2020, 1, 1), None],
+        [True, None],
+        [None, None],
+    ],
+)
+def test_rows_to_frame_same_types_as_from_records(values):
+    rows = [(v, i) for i, v in enumerate(values)]
+    expected = pd.DataFrame.from_records(rows, columns=["a", "b"], coerce_float=True)
+    pd.testing.assert_frame_equal(rows_to_frame(["a", "b"], rows), expected)
+
+
+def test_rows_to_frame_empty():
+    df = rows_to_frame(["a", "b"], [])
+    assert df.columns.tolist() == ["a", "b"]
+    assert len(df) == 0
+
+
+def test_rows_to_frame_duplicate_columns():
+    df = rows_to_frame(["a", "a"], [(1, 2)])
+    assert df.columns.tolist() == ["a", "a"]
+    assert df.iloc[0].tolist() == [1, 2]
+
+
+def test_query_result_in_chunks(sql: DataCheckSql):
+    with sql.conn() as c:
+        qr = QueryResult(FIVE_ROWS, c.execute(text(FIVE_ROWS)), chunk_size=CHUNK_SIZE)
+    assert qr.df["a"].tolist() == [0, 1, 2, 3, 4]
+    assert qr.string_columns == ["b"]
+
+
+def test_query_result_iter_chunks(sql: DataCheckSql):
+    with sql.conn() as c:
+        chunks = list(
+            QueryResult.iter_chunks(c.execute(text(FIVE_ROWS)), chunk_size=CHUNK_SIZE)
+        )
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+
+
+def test_query_result_iter_chunks_empty(sql: DataCheckSql):
+    query = "select 1 as a, 'x' as b where 1 = 0"
+    with sql.conn() as c:
+        (chunk,) = QueryResult.iter_chunks(c.execute(text(query)))
+    assert chunk.columns.tolist() == ["a", "b"]
+    assert len(chunk) == 0
+
+
+def test_run_query_chunks(sql: DataCheckSql):
+    chunks = list(sql.run_query_chunks(FIVE_ROWS, chunk_size=CHUNK_SIZE))
+    pd.testing.assert_frame_equal(
+        pd.concat(chunks, ignore_index=True), sql.run_query(FIVE_ROWS)
+    )
+
+
+def test_run_query_chunks_parses_dates(sql: DataCheckSql):
+    chunks = list(sql.run_query_chunks("select '2020-01-01' as d"))
+    assert chunks[0]["d"].dtype == "datetime64[ns]"
+
+
+def test_parse_result_dates_same_as_parse_date_columns():
+    rows = [
+        (1234567890, 0.123456789012, "2020-01-01", datetime.datetime(2020, 1, 1)),
+        (1, None, "2020-01-02 03:04:05", None),
+    ]
+    columns = ["i", "f", "s", "t"]
+    expected_columns, expected = parse_date_columns(rows_to_frame(columns, rows))
+    date_columns, df = parse_result_dates(rows_to_frame(columns, rows))
+    assert date_columns == expected_columns == ["s", "t"]
+    pd.testing.assert_frame_equal(df, expected)
+
+
+def test_parse_result_dates_skips_typed_columns():
+    df = pd.DataFrame({"i": [20200101], "d": [datetime.date(2020, 1, 1)]})
+    date_columns, df = parse_result_dates(df)
+    assert date_columns == ["d"]
+    assert df["i"].dtype == "int64"
+    assert df["d"].dtype == "datetime64[ns]"
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        [1, 2],
+        [1, None],
+        [1.5, None],
+        [Decimal("1.5"), None],
+        ["a", None],
+        [datetime.datetime(2020, 1, 1), None],
+        [datetime.datetime(9999, 12, 31), None],
+        [datetime.date(2020, 1, 1), None],
+        [datetime.time(1, 2), None],
+        [True, None],
+        [None, None],
+    ],
+)
+def test_arrow_to_frame_same_types_as_rows(values):
+    pa = pytest.importorskip("pyarrow")
+    table = pa.table({"a": values, "b": [1, 2]})
+    rows = list(zip(values, [1, 2]))
+    pd.testing.assert_frame_equal(
+        arrow_to_frame(table), rows_to_frame(["a", "b"], rows)
+    )
+
+
+def test_arrow_to_frame_empty():
+    pa = pytest.importorskip("pyarrow")
+    table = pa.table({"a": pa.array([], pa.int64())})
+    pd.testing.assert_frame_equal(arrow_to_frame(table), rows_to_frame(["a"], []))
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "1",
+        "1.25::DECIMAL(10,2)",
+        "'a'",
+        "DATE '2020-01-02'",
+        "TIMESTAMP '2020-01-02 03:04:05'",
+        "INTERVAL 1 DAY",
+    ],
+)
+def test_duckdb_arrow_result_equals_row_result(expression):
+    pytest.importorskip("pyarrow")
+    pytest.importorskip("duckdb_engine")
+    duckdb_sql = get_sql("duckdb:///:memory:")
+    query = f"select {expression} as a union all select null"
+    with duckdb_sql.conn() as c:
+        row_result = QueryResult(query, c.execute(text(query)))
+    pd.testing.assert_frame_equal(
+        duckdb_sql.run_query_with_result(query).df, row_result.df
+    )
@@ -1,4 +1,7 @@
+import threading
+import time
 from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from graphlib import CycleError
 
 import pytest
 
@@ -39,3 +42,86 @@ def test_executor_returns_thread_pool_executor_for_task_list_with_more_task(
 ):
     executor = DataCheckRunner(workers=workers).executor([1] * task_size)
     assert isinstance(executor, ThreadPoolExecutor)
+
+
+def test_executor_is_shared_between_calls():
+    runner = DataCheckRunner(workers=2)
+    assert runner.executor([1, 2]) is runner.executor([1, 2, 3])
+    runner.shutdown()
+
+
+def test_nested_run_any_does_not_exceed_workers():
+    workers = 2
+    runner = DataCheckRunner(workers=workers)
+    lock = threading.Lock()
+    running = [0]
+    max_running = [0]
+
+    def task(i: int) -> int:
+        with lock:
+            running[0] += 1
+            max_running[0] = max(max_running[0], running[0])
+        time.sleep(0.01)
+        with lock:
+            running[0] -= 1
+        return i
+
+    def nested_task(i: int) -> int:
+        return sum(runner.run_any(task, [{"i": j} for j in range(4)])) + i
+
+    results = runner.run_any(nested_task, [{"i": i} for i in range(4)])
+    runner.shutdown()
+    assert sorted(results) == [6, 7, 8, 9]
+    assert max_running[0] <= workers
+
+
+def test_run_any_returns_results_in_order():
+    runner = DataCheckRunner(workers=4)
+
+    def task(i: int) -> int:
+        time.sleep(0.01 * (5 - i))
+        return i
+
+    results = runner.run_any(task, [{"i": i} for i in range(5)])
+    runner.shutdown()
+    assert results == [0, 1, 2, 3, 4]
+
+
+def test_run_graph_waits_for_dependencies():
+    runner = DataCheckRunner(workers=4)
+    lock = threading.Lock()
+    finished: list[int] = []
+
+    def task(i: int) -> int:
+        # the independent tasks take longer than the dependent ones
+        time.sleep(0.01 * (5 - i))
+        with lock:
+            finished.append(i)
+        return i
+
+    dependencies = {2: {0}, 3: {0, 1}, 4: {3}}
+    results = runner.run_graph(task, [{"i": i} for i in range(5)], dependencies)
+    runner.shutdown()
+    assert results == [0, 1, 2, 3, 4]
+    for task_index, parents in dependencies.items():
+        assert all(finished.index(p) < finished.index(task_index) for p in parents)
+
+
+def test_nested_run_graph():
+    runner = DataCheckRunner(workers=2)
+
+    def task(i: int) -> int:
+        return i
+
+    def nested_task(i: int) -> int:
+        return sum(runner.run_graph(task, [{"i": j} for j in range(3)], {2: {1}})) + i
+
+    results = runner.run_graph(nested_task, [{"i": i} for i in range(3)], {1: {0}})
+    runner.shutdown()
+    assert results == [3, 4, 5]
+
+
+def test_run_graph_with_cycle():
+    runner = DataCheckRunner(workers=2)
+    with pytest.raises(CycleError):
+        runner.run_graph(lambda i: i, [{"i": 0}, {"i": 1}], {0: {1}, 1: {0}})
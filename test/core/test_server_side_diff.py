@@ -0,0 +1,184 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from data_check import DataCheck
+from data_check.config import DataCheckConfig
+from data_check.result import ResultType
+from data_check.sql import DataCheckSql
+
+
+@pytest.fixture
+def dc_server_side() -> DataCheck:
+    config = DataCheckConfig().load_config().set_connection("test")
+    config.parallel_workers = 1
+    config.config["server_side_diff"] = True
+    _dc = DataCheck(config)
+    _dc.load_template()
+    _dc.output.configure_output(
+        verbose=True,
+        traceback=True,
+        print_failed=True,
+        print_format="json",
+    )
+    return _dc
+
+
+def run_check(dc: DataCheck, check_path: str):
+    check = dc.get_check(Path(check_path))
+    assert check
+    return check.run_test()
+
+
+def test_server_side_diff_is_disabled_by_default(dc: DataCheck):
+    assert not dc.config.server_side_diff
+
+
+def test_sqlite_supports_server_side_diff(sql: DataCheckSql):
+    assert sql.supports_server_side_diff()
+
+
+@pytest.mark.parametrize(
+    "check_path",
+    [
+        "checks/basic/data_types.sql",
+        "checks/basic/decimal_varchar.sql",
+        "checks/basic/duplicates.sql",
+        "checks/basic/float.sql",
+        "checks/basic/leading_zeros.sql",
+        "checks/basic/mixed_dates.sql",
+        "checks/basic/simple_string.sql",
+        "checks/basic/sorted_set.sql",
+        "checks/basic/unicode_column.sql",
+        "checks/basic/unicode_string.sql",
+    ],
+)
+def test_server_side_diff_passing_checks(dc_server_side: DataCheck, check_path):
+    result = run_check(dc_server_side, check_path)
+    assert result
+    # the merged result is only available for the client side comparison
+    assert result.full_result is None
+
+
+def test_server_side_diff_failing_check(dc_server_side: DataCheck):
+    result = run_check(dc_server_side, "checks/failing/diff.sql")
+    assert not result
+    assert result.result_type == ResultType.FAILED
+    assert result.result is not None
+    assert result.result["_merge"].tolist() == ["left_only", "right_only"]
+    assert result.result["x"].tolist() == ["y", "z"]
+
+
+def test_server_side_diff_same_diff_as_client_side(
+    dc: DataCheck, dc_server_side: DataCheck
+):
+    client_result = run_check(dc, "checks/failing/diff.sql")
+    server_result = run_check(dc_server_side, "checks/failing/diff.sql")
+    pd.testing.assert_frame_equal(
+        client_result.result.reset_index(drop=True),
+        server_result.result.reset_index(drop=True),
+    )
+
+
+def test_server_side_diff_same_types_as_client_side(
+    dc: DataCheck, dc_server_side: DataCheck, tmp_path: Path
+):
+    (tmp_path / "typed.sql").write_text(
+        "select 1 as a, 0.5 as b, '2020-01-01' as d, '01' as s "
+        "union all select 2, 1.5, '2020-01-02', '02'"
+    )
+    (tmp_path / "typed.csv").write_text(
+        "a,b,d,s\n1,0.5,2020-01-01,01\n3,2.5,2020-01-03,03\n"
+    )
+    check_path = str(tmp_path / "typed.sql")
+    client_result = run_check(dc, check_path)
+    server_result = run_check(dc_server_side, check_path)
+    assert server_result.result["_merge"].tolist() == ["left_only", "right_only"]
+    pd.testing.assert_frame_equal(
+        client_result.result.reset_index(drop=True),
+        server_result.result.reset_index(drop=True),
+    )
+
+
+def test_server_side_diff_duplicates(dc_server_side: DataCheck):
+    result = run_check(dc_server_side, "checks/failing/duplicates.sql")
+    assert not result
+    assert result.result_type == ResultType.FAILED_DIFFERENT_LENGTH
+
+
+def test_server_side_diff_table_check(dc_server_side: DataCheck):
+    result = run_check(
+        dc_server_side, "checks/table_check/failing/wrong_data/sqlite_master.csv"
+    )
+    assert not result
+    assert result.full_result is None
+
+
+def test_server_side_diff_falls_back_for_different_columns(
+    dc_server_side: DataCheck,
+):
+    result = run_check(
+        dc_server_side, "checks/table_check/failing/wrong_column/sqlite_master.csv"
+    )
+    assert not result
+    assert result.result_type == ResultType.FAILED_WITH_EXCEPTION
+
+
+def test_server_side_diff_returns_none_for_different_columns(sql: DataCheckSql):
+    diff = sql.server_side_diff(
+        "select 1 as a", {}, pd.DataFrame({"b": ["1"]}, dtype="object")
+    )
+    assert diff is None
+
+
+def test_server_side_diff_empty_string_equals_null(sql: DataCheckSql):
+    diff = sql.server_side_diff(
+        "select '' as a union all select null as a",
+        {},
+        pd.DataFrame({"a": [None, None]}, dtype="object"),
+    )
+    assert diff
+    assert len(diff.db_only) == 0
+    assert diff.expected_only == []
+
+
+def test_server_side_diff_numbers_from_strings(sql: DataCheckSql):
+    diff = sql.server_side_diff(
+        "select 1 as a, 2.5 as b, '01' as c",
+        {},
+        pd.DataFrame({"a": ["1.0"], "b": ["2.5"], "c": ["01"]}, dtype="object"),
+    )
+    assert diff
+    assert len(diff.db_only) == 0
+    assert diff.expected_only == []
+
+
+def test_server_side_diff_rows(sql: DataCheckSql):
+    diff = sql.server_side_diff(
+        "select 1 as a union all select 2 as a",
+        {},
+        pd.DataFrame({"a": ["2", "3", "4"]}, dtype="object"),
+    )
+    assert diff
+    assert diff.db_only.df["a"].tolist() == [1]
+    assert diff.expected_only == [1, 2]
+    expected_row_count = 2
+    assert diff.db_row_count == expected_row_count
+
+
+def test_server_side_diff_dates(sql: DataCheckSql):
+    diff = sql.server_side_diff(
+        "select '2020-12-20' as d",
+        {},
+        pd.DataFrame({"d": ["2020-12-20 00:00:00"]}, dtype="object"),
+        date_columns=["d"],
+    )
+    assert diff
+    assert diff.expected_only == []
+
+
+def test_server_side_diff_drops_temporary_tables(sql: DataCheckSql):
+    sql.server_side_diff("select 1 as a", {}, pd.DataFrame({"a": ["1"]}))
+    tables = sql.run_query("select name from sqlite_temp_master where type='table'")
+    assert len(tables) == 0
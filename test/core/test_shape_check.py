@@ -0,0 +1,224 @@
+from inspect import GEN_CLOSED, getgeneratorstate
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from data_check import DataCheck
+from data_check.checks.csv_check import SHAPE_SAMPLE_ROWS
+from data_check.file_ops import read_check_option
+from data_check.result import ResultType
+from data_check.sql import DataCheckSql
+from data_check.sql.result_shape import (
+    ResultShape,
+    dataframe_shape,
+    is_far_apart,
+    shape_differences,
+)
+
+RATIO = 10
+ROWS = 100
+EXPECTED_ROWS = 3
+
+# a query with ROWS rows in SQLite
+ROWS_QUERY = f"""
+with recursive r(id) as (select 1 union all select id + 1 from r where id < {ROWS})
+select id, 'a' as data from r
+"""
+
+
+def write_check(path: Path, query: str, csv: str, option: str = "") -> Path:
+    sql_file = path / "check.sql"
+    sql_file.write_text(f"{option}\n{query}" if option else query)
+    (path / "check.csv").write_text(csv)
+    return sql_file
+
+
+def expected_csv(rows: int) -> str:
+    return "id,data\n" + "".join(f"{i},a\n" for i in range(1, rows + 1))
+
+
+def run_check(dc: DataCheck, sql_file: Path):
+    check = dc.get_check(sql_file)
+    assert check
+    return check.run_test()
+
+
+def test_is_far_apart():
+    assert is_far_apart(ROWS, 1, RATIO)
+    assert is_far_apart(0, RATIO, RATIO)
+    assert not is_far_apart(RATIO - 1, 1, RATIO)
+    assert not is_far_apart(0, 0, RATIO)
+
+
+def test_dataframe_shape():
+    df = pd.DataFrame({"a": ["x", "", None], "b": [1.0, None, 2.0]})
+    assert dataframe_shape(df) == ResultShape(("a", "b"), 3)
+    assert dataframe_shape(df, value_counts=True).value_counts == (1, 2)
+
+
+def test_shape_differences_columns():
+    differences = shape_differences(
+        ResultShape(("a", "b"), 1), ResultShape(("a", "c"), 1), RATIO
+    )
+    assert differences == [
+        "columns only in the query: b",
+        "columns only in the expectation: c",
+    ]
+
+
+def test_shape_differences_counts():
+    differences = shape_differences(
+        ResultShape(("a", "b"), ROWS, (ROWS, 0)),
+        ResultShape(("a", "b"), ROWS, (ROWS, ROWS)),
+        RATIO,
+    )
+    assert differences == [f"0 values in column b in the query, {ROWS} expected"]
+
+
+def test_shape_differences_similar():
+    assert not shape_differences(
+        ResultShape(("a",), ROWS, (ROWS,)), ResultShape(("a",), ROWS - 1), RATIO
+    )
+
+
+def test_query_shape(sql: DataCheckSql):
+    shape = sql.query_shape(
+        "select 1 as a, null as b union all select 2, 'x' union all select 0, ''",
+        {},
+        value_counts=True,
+    )
+    assert shape == ResultShape(("a", "b"), 3, (3, 1))
+
+
+def test_read_check_option(tmp_path: Path):
+    sql_file = tmp_path / "a.sql"
+    sql_file.write_text("-- key_columns: id\n-- Shape_Check: nulls \nselect 1")
+    assert read_check_option(sql_file, "shape_check") == "nulls"
+    assert read_check_option(sql_file, "other") is None
+
+
+def test_shape_check_off_by_default(dc: DataCheck, tmp_path: Path):
+    sql_file = write_check(tmp_path, ROWS_QUERY, expected_csv(EXPECTED_ROWS))
+    result = run_check(dc, sql_file)
+    assert result.result_type == ResultType.FAILED
+
+
+def test_shape_check_row_count(dc: DataCheck, tmp_path: Path):
+    sql_file = write_check(
+        tmp_path, ROWS_QUERY, expected_csv(EXPECTED_ROWS), "-- shape_check: rows"
+    )
+    result = run_check(dc, sql_file)
+    assert result.result_type == ResultType.FAILED_DIFFERENT_SHAPE
+    assert f"{ROWS} rows in the query, {EXPECTED_ROWS} expected" in result.extra_message
+    assert isinstance(result.result, pd.DataFrame)
+    # the first rows of the query are also in the expectation
+    assert result.result._merge.tolist() == ["left_only"] * (
+        SHAPE_SAMPLE_ROWS - EXPECTED_ROWS
+    )
+
+
+def test_shape_sample_closes_query_chunks(
+    dc: DataCheck, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    run_query_chunks = dc.sql.run_query_chunks
+    generators = []
+
+    def keep_generator(*args, **kwargs):
+        # keeps the generator alive, so it isn't closed by the garbage collection
+        generators.append(run_query_chunks(*args, **kwargs))
+        return generators[-1]
+
+    monkeypatch.setattr(dc.sql, "run_query_chunks", keep_generator)
+    sql_file = write_check(
+        tmp_path, ROWS_QUERY, expected_csv(EXPECTED_ROWS), "-- shape_check: rows"
+    )
+    result = run_check(dc, sql_file)
+    assert result.result_type == ResultType.FAILED_DIFFERENT_SHAPE
+    assert generators
+    assert all(getgeneratorstate(g) == GEN_CLOSED for g in generators)
+
+
+def test_shape_check_from_config(dc: DataCheck, tmp_path: Path):
+    dc.config.config["shape_check"] = True
+    sql_file = write_check(tmp_path, ROWS_QUERY, expected_csv(EXPECTED_ROWS))
+    result = run_check(dc, sql_file)
+    assert result.result_type == ResultType.FAILED_DIFFERENT_SHAPE
+
+
+def test_shape_check_off_in_check(dc: DataCheck, tmp_path: Path):
+    dc.config.config["shape_check"] = "rows"
+    sql_file = write_check(
+        tmp_path, ROWS_QUERY, expected_csv(EXPECTED_ROWS), "-- shape_check: off"
+    )
+    result = run_check(dc, sql_file)
+    assert result.result_type == ResultType.FAILED
+
+
+def test_shape_check_similar_row_count(dc: DataCheck, tmp_path: Path):
+    sql_file = write_check(
+        tmp_path, ROWS_QUERY, expected_csv(ROWS - 1), "-- shape_check: rows"
+    )
+    result = run_check(dc, sql_file)
+    assert result.result_type == ResultType.FAILED
+
+
+def test_shape_check_passed(dc: DataCheck, tmp_path: Path):
+    sql_file = write_check(
+        tmp_path, ROWS_QUERY, expected_csv(ROWS), "-- shape_check: nulls"
+    )
+    result = run_check(dc, sql_file)
+    assert result.result_type == ResultType.PASSED
+
+
+def test_shape_check_columns(dc: DataCheck, tmp_path: Path):
+    sql_file = write_check(
+        tmp_path,
+        "select 1 as id, 'a' as other",
+        "id,data\n1,a\n",
+        "-- shape_check: rows",
+    )
+    result = run_check(dc, sql_file)
+    assert result.result_type == ResultType.FAILED_DIFFERENT_SHAPE
+    assert "columns only in the query: other" in result.extra_message
+    assert "columns only in the expectation: data" in result.extra_message
+    assert isinstance(result.result, pd.DataFrame)
+    assert result.result._merge.tolist() == ["left_only", "right_only"]
+
+
+def test_shape_check_null_counts(dc: DataCheck, tmp_path: Path):
+    query = ROWS_QUERY.replace("'a' as data", "null as data")
+    sql_file = write_check(tmp_path, query, expected_csv(ROWS), "-- shape_check: nulls")
+    result = run_check(dc, sql_file)
+    assert result.result_type == ResultType.FAILED_DIFFERENT_SHAPE
+    assert (
+        f"0 values in column data in the query, {ROWS} expected" in result.extra_message
+    )
+
+
+def test_shape_check_null_counts_only_with_nulls(dc: DataCheck, tmp_path: Path):
+    query = ROWS_QUERY.replace("'a' as data", "null as data")
+    sql_file = write_check(tmp_path, query, expected_csv(ROWS), "-- shape_check: rows")
+    result = run_check(dc, sql_file)
+    assert result.result_type == ResultType.FAILED
+
+
+@pytest.mark.parametrize("shape_check", ["off", "nulls"])
+def test_shape_check_empty_strings(dc: DataCheck, tmp_path: Path, shape_check: str):
+    rows = 20
+    query = ROWS_QUERY.replace(f"id < {ROWS}", f"id < {rows}").replace(
+        "'a' as data", "'' as data"
+    )
+    csv = "id,data\n" + "".join(f"{i},\n" for i in range(1, rows + 1))
+    sql_file = write_check(tmp_path, query, csv, f"-- shape_check: {shape_check}")
+    result = run_check(dc, sql_file)
+    assert result.result_type == ResultType.PASSED
+
+
+@pytest.mark.parametrize("shape_check", ["unknown", ""])
+def test_shape_check_unknown_mode(dc: DataCheck, tmp_path: Path, shape_check: str):
+    sql_file = write_check(
+        tmp_path, ROWS_QUERY, expected_csv(ROWS), f"-- shape_check: {shape_check}"
+    )
+    result = run_check(dc, sql_file)
+    assert result.result_type == ResultType.FAILED_WITH_EXCEPTION
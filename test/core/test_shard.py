@@ -0,0 +1,93 @@
+from pathlib import Path
+
+import pytest
+
+from data_check import DataCheck
+from data_check.durations import CheckDurations
+from data_check.exceptions import DataCheckError
+from data_check.output import DataCheckOutput
+from data_check.result import DataCheckResult, ResultType
+from data_check.shard import (
+    parse_shard,
+    read_result_durations,
+    read_result_file,
+    select_shard,
+    write_result_file,
+)
+
+
+def test_parse_shard():
+    assert parse_shard("3/8") == (3, 8)
+
+
+@pytest.mark.parametrize("shard", ["", "3", "a/b", "0/8", "9/8", "1/0"])
+def test_parse_shard_invalid(shard: str):
+    with pytest.raises(DataCheckError):
+        parse_shard(shard)
+
+
+def all_checks(dc: DataCheck, tmp_path: Path, count: int):
+    return dc.collect_checks([tmp_path / f"c{i}.sql" for i in range(count)])
+
+
+def test_shards_contain_all_checks(dc: DataCheck, tmp_path: Path):
+    checks = all_checks(dc, tmp_path, 20)
+    shards = [select_shard(checks, f"{i}/3", tmp_path) for i in range(1, 4)]
+    sharded = [c.check_path for s in shards for c in s]
+    assert sorted(sharded) == sorted(c.check_path for c in checks)
+
+
+def test_shards_are_deterministic(dc: DataCheck, tmp_path: Path):
+    checks = all_checks(dc, tmp_path, 20)
+    shard_1 = select_shard(checks, "2/3", tmp_path)
+    shard_2 = select_shard(list(reversed(checks)), "2/3", tmp_path)
+    assert sorted(c.check_path for c in shard_1) == sorted(
+        c.check_path for c in shard_2
+    )
+
+
+def test_shards_ignore_local_durations(dc: DataCheck, tmp_path: Path):
+    checks = all_checks(dc, tmp_path, 20)
+    expected = select_shard(checks, "1/3", tmp_path)
+    # another node with a different durations file computes the same shard
+    dc.check_durations.durations.update({"c0.sql": 10.0})
+    dc.check_durations.save()
+    assert select_shard(checks, "1/3", tmp_path) == expected
+
+
+def test_shards_are_balanced_by_duration(dc: DataCheck, tmp_path: Path):
+    durations = CheckDurations(tmp_path / "durations.json", tmp_path)
+    durations.add({"c0.sql": 10.0, "c1.sql": 5.0, "c2.sql": 5.0})
+    durations.save()
+    checks = all_checks(dc, tmp_path, 3)
+    shard_1 = select_shard(checks, "1/2", tmp_path, durations.durations_path)
+    shard_2 = select_shard(checks, "2/2", tmp_path, durations.durations_path)
+    assert [c.check_path.name for c in shard_1] == ["c0.sql"]
+    assert [c.check_path.name for c in shard_2] == ["c1.sql", "c2.sql"]
+
+
+def test_result_file(tmp_path: Path):
+    result_file = tmp_path / "result.json"
+    duration = 1.5
+    results = [
+        DataCheckResult(passed=True, source="a.sql", result_type=ResultType.PASSED),
+        DataCheckResult(
+            passed=False,
+            source="b.sql",
+            result_type=ResultType.NO_EXPECTED_RESULTS_FILE,
+            duration=duration,
+        ),
+    ]
+    write_result_file(result_file, results, shard="1/2", durations={"b.sql": duration})
+    read_results = read_result_file(result_file, DataCheckOutput())
+    assert [r.passed for r in read_results] == [True, False]
+    assert read_results[1].is_warning
+    assert read_results[1].duration == duration
+    assert read_result_durations(result_file) == {"b.sql": duration}
+
+
+def test_result_file_invalid(tmp_path: Path):
+    result_file = tmp_path / "result.json"
+    result_file.write_text("{}")
+    with pytest.raises(DataCheckError):
+        read_result_file(result_file, DataCheckOutput())
@@ -0,0 +1,271 @@
+import datetime
+from decimal import Decimal
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_check import DataCheck
+from data_check.checks import sort_merge_diff as smd
+from data_check.checks.csv_check import CSVCheck
+from data_check.config import DataCheckConfig
+from data_check.result import ResultType
+
+CHUNK_SIZE = 2
+
+
+@pytest.fixture
+def dc_sort_merge() -> DataCheck:
+    config = DataCheckConfig().load_config().set_connection("test")
+    config.parallel_workers = 1
+    config.config["sort_merge_diff"] = True
+    config.config["sort_merge_chunk_size"] = CHUNK_SIZE
+    _dc = DataCheck(config)
+    _dc.load_template()
+    _dc.output.configure_output(
+        verbose=True,
+        traceback=True,
+        print_failed=True,
+        print_format="json",
+    )
+    return _dc
+
+
+def run_check(dc: DataCheck, check_path: str):
+    check = dc.get_check(Path(check_path))
+    assert check
+    return check.run_test()
+
+
+def chunks(df: pd.DataFrame, chunk_size: int = CHUNK_SIZE):
+    return (df.iloc[i : i + chunk_size] for i in range(0, max(len(df), 1), chunk_size))
+
+
+def merge_diff(left: pd.DataFrame, right: pd.DataFrame) -> pd.DataFrame:
+    """The diff of the in-memory comparison."""
+    CSVCheck.normalize_result(left)
+    CSVCheck.normalize_result(right)
+    merged = CSVCheck.merge_results(left, right)
+    return merged[merged._merge != "both"]
+
+
+def diff_counts(diff: pd.DataFrame) -> dict[str, int]:
+    return {str(k): v for k, v in diff["_merge"].astype(str).value_counts().items()}
+
+
+def test_sort_merge_diff_is_disabled_by_default(dc: DataCheck):
+    assert not dc.config.sort_merge_diff
+
+
+@pytest.mark.parametrize(
+    "check_path",
+    [
+        "checks/basic/data_types.sql",
+        "checks/basic/decimal_varchar.sql",
+        "checks/basic/duplicates.sql",
+        "checks/basic/float.sql",
+        "checks/basic/leading_zeros.sql",
+        "checks/basic/mixed_dates.sql",
+        "checks/basic/simple_string.sql",
+        "checks/basic/sorted_set.sql",
+        "checks/basic/unicode_column.sql",
+        "checks/basic/unicode_string.sql",
+        "checks/compressed/gzip.sql",
+        "checks/table_check/basic/sqlite_master.csv",
+    ],
+)
+def test_sort_merge_diff_passing_checks(dc_sort_merge: DataCheck, check_path):
+    result = run_check(dc_sort_merge, check_path)
+    assert result
+    # the merged result is only available for the in-memory comparison
+    assert result.full_result is None
+
+
+def test_sort_merge_diff_same_diff_as_in_memory(
+    dc: DataCheck, dc_sort_merge: DataCheck
+):
+    in_memory_result = run_check(dc, "checks/failing/diff.sql")
+    sort_merge_result = run_check(dc_sort_merge, "checks/failing/diff.sql")
+    assert sort_merge_result.result_type == ResultType.FAILED
+    pd.testing.assert_frame_equal(
+        in_memory_result.result.reset_index(drop=True),
+        sort_merge_result.result.reset_index(drop=True),
+    )
+
+
+def test_sort_merge_diff_duplicates(dc_sort_merge: DataCheck):
+    result = run_check(dc_sort_merge, "checks/failing/duplicates.sql")
+    assert not result
+    assert result.result_type == ResultType.FAILED_DIFFERENT_LENGTH
+
+
+def test_sort_merge_diff_different_columns(dc_sort_merge: DataCheck):
+    result = run_check(
+        dc_sort_merge, "checks/table_check/failing/wrong_column/sqlite_master.csv"
+    )
+    assert not result
+    assert result.result_type == ResultType.FAILED_WITH_EXCEPTION
+
+
+def test_sort_merge_diff_parquet(dc_sort_merge: DataCheck):
+    pytest.importorskip("pyarrow")
+    assert run_check(dc_sort_merge, "checks/parquet/basic/data_types.sql")
+    assert not run_check(dc_sort_merge, "checks/parquet/failing/failing_parquet.sql")
+
+
+def test_sort_merge_diff_invalid_query(dc_sort_merge: DataCheck):
+    result = run_check(dc_sort_merge, "checks/failing/invalid.sql")
+    assert result.result_type == ResultType.FAILED_WITH_EXCEPTION
+
+
+def test_sort_merge_diff_keeps_duplicate_rows():
+    left = pd.DataFrame({"a": [1, 1, 1, 2]})
+    right = pd.DataFrame({"a": [2, 3, 3]})
+    diff = smd.sort_merge_diff(chunks(left), chunks(right))
+    assert diff.diff["a"].tolist() == [1, 1, 1, 3, 3]
+    assert diff_counts(diff.diff) == {"left_only": 3, "right_only": 2}
+    assert (diff.left_row_count, diff.right_row_count) == (len(left), len(right))
+
+
+def test_sort_merge_diff_empty_side():
+    left = pd.DataFrame({"a": pd.Series([], dtype=object)})
+    right = pd.DataFrame({"a": ["x"]})
+    diff = smd.sort_merge_diff(chunks(left), chunks(right))
+    assert diff.diff["_merge"].tolist() == ["right_only"]
+    assert diff.left_row_count == 0
+
+
+def test_sort_merge_diff_without_common_columns():
+    with pytest.raises(pd.errors.MergeError):
+        smd.sort_merge_diff(
+            chunks(pd.DataFrame({"a": [1]})), chunks(pd.DataFrame({"b": [1]}))
+        )
+
+
+def test_sort_merge_diff_same_as_merge():
+    rng = np.random.default_rng(42)
+    size = 200
+    left = pd.DataFrame(
+        {
+            "i": rng.integers(0, 5, size),
+            "s": rng.choice(["a", "b", "", None], size),
+            "f": rng.choice([0.5, 1.0, np.nan], size),
+        }
+    )
+    right = pd.DataFrame(
+        {
+            "f": rng.choice([0.5, 1.0, np.nan], size),
+            "i": rng.integers(0, 5, size),
+            "s": rng.choice(["a", "b", "c", None], size),
+        }
+    )
+    diff = smd.sort_merge_diff(chunks(left, 7), chunks(right, 11))
+    expected = merge_diff(left.copy(), right.copy())
+    assert diff_counts(diff.diff) == diff_counts(expected)
+
+
+def test_sorted_runs_merge_in_several_passes(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(smd, "MAX_OPEN_RUNS", 2)
+    monkeypatch.setattr(smd, "RUN_BLOCK_SIZE", 2)
+    runs = smd.SortedRuns(tmp_path, "test")
+    for i in range(5):
+        runs.add([(str(j),) for j in range(i, 10, 2)])
+    rows = list(runs)
+    assert rows == sorted(rows)
+    assert len(rows) == runs.row_count
+    # the run files are removed after they are read
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (None, ""),
+        (pd.NA, ""),
+        (pd.NaT, ""),
+        (float("nan"), ""),
+        ("", ""),
+        ("0123", "0123"),
+        (1, "1"),
+        (1.0, "1"),
+        (1.5, "1.5"),
+        (Decimal("1.50"), "1.5"),
+        (True, "True"),
+        (datetime.date(2020, 1, 2), "2020-01-02 00:00:00.000000"),
+        (datetime.datetime(9999, 12, 31), "9999-12-31 00:00:00.000000"),
+        (pd.Timestamp("2020-01-02 03:04:05", tz="UTC"), "2020-01-02 03:04:05.000000"),
+    ],
+)
+def test_canonical_value(value, expected):
+    assert smd.canonical_value(value) == expected
+
+
+@pytest.mark.parametrize(
+    "column",
+    [
+        pd.Series([1, 2]),
+        pd.Series([1.0, np.nan]),
+        pd.Series([True, False]),
+        pd.to_datetime(pd.Series(["2020-01-01", None])),
+        pd.Series(["a", None]),
+    ],
+)
+def test_canonical_column_same_as_canonical_value(column: pd.Series):
+    assert smd.canonical_column(column) == [
+        smd.canonical_value(v) for v in column.tolist()
+    ]
+
+
+def write_check(path: Path, query: str, csv: str) -> str:
+    (path / "check.sql").write_text(query, encoding="UTF-8")
+    (path / "check.csv").write_text(csv, encoding="UTF-8")
+    return str(path / "check.sql")
+
+
+def test_sort_merge_diff_dates_after_null_chunk(
+    dc: DataCheck, dc_sort_merge: DataCheck, tmp_path: Path
+):
+    # the date column is NULL in the first chunk of both sides
+    check_path = write_check(
+        tmp_path,
+        "select 1 as id, null as d union all select 2, null "
+        "union all select 3, '2020-01-02' union all select 4, '2020-01-03 10:00:00'",
+        "id,d\n1,\n2,\n3,2020-01-02\n4,2020-01-03 10:00:00\n",
+    )
+    assert run_check(dc, check_path)
+    assert run_check(dc_sort_merge, check_path)
+
+
+def test_sort_merge_diff_typed_values(
+    dc: DataCheck, dc_sort_merge: DataCheck, tmp_path: Path
+):
+    check_path = write_check(
+        tmp_path,
+        "select 1 as id, 0.5 as f, '2020-01-02' as d, '01' as s "
+        "union all select 2, 1.5, '2020-01-03', '02'",
+        "id,f,d,s\n1,0.25,2020-01-02,01\n2,1.5,2020-01-03,02\n",
+    )
+    in_memory_result = run_check(dc, check_path)
+    sort_merge_result = run_check(dc_sort_merge, check_path)
+    assert sort_merge_result.result_type == ResultType.FAILED
+    assert sort_merge_result.result["f"].tolist() == [0.25, 0.5]
+    pd.testing.assert_frame_equal(
+        in_memory_result.result.sort_values("f").reset_index(drop=True),
+        sort_merge_result.result.reset_index(drop=True),
+    )
+
+
+def test_sort_merge_diff_releases_connection(tmp_path: Path):
+    config = DataCheckConfig().load_config()
+    config.config["connections"]["file"] = f"sqlite+pysqlite:///{tmp_path / 'd.db'}"
+    config.set_connection("file")
+    config.config["sort_merge_diff"] = True
+    _dc = DataCheck(config)
+    _dc.load_template()
+    check_path = write_check(tmp_path, "select 1 as a, 2 as a", "a,a\n1,2\n")
+    # the result keeps the exception and its traceback
+    result = run_check(_dc, check_path)
+    assert result.result_type == ResultType.FAILED_WITH_EXCEPTION
+    assert "Data columns not unique" in str(result.exception)
+    assert _dc.sql.get_engine().pool.checkedout() == 0  # type: ignore[attr-defined]
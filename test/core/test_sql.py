@@ -1,6 +1,12 @@
+import pickle
+from pathlib import Path
+
 import pytest
+from sqlalchemy import create_engine
 from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import QueuePool
 
+from data_check import DataCheck
 from data_check.sql import DataCheckSql
 
 
@@ -110,3 +116,66 @@ def test_table_loaded_is_lazy_loaded(sql: DataCheckSql):
     tl1 = sql.table_loader
     tl2 = sql.table_loader
     assert tl1 == tl2
+
+
+def test_engine_is_cached_with_multiple_workers(dc: DataCheck):
+    assert dc.runner.workers > 1
+    assert dc.sql.get_engine() is dc.sql.get_engine()
+
+
+def test_engine_with_extra_params_is_not_cached(sql: DataCheckSql):
+    engine = sql.get_engine(extra_params={"pool_pre_ping": True})
+    assert engine is not sql.get_engine()
+
+
+def test_pool_statistics_count_checkouts(sql: DataCheckSql):
+    sql.run_query("select 1 as a")
+    sql.run_query("select 1 as a")
+    checkouts = 2
+    assert sql.pool_statistics.checkouts == checkouts
+
+
+def test_pool_exhausted_only_without_overflow():
+    engine = create_engine(
+        "sqlite://", poolclass=QueuePool, pool_size=1, max_overflow=1
+    )
+    sql = DataCheckSql("sqlite://")
+    sql.max_overflow = 1
+    pool = engine.pool
+    first = pool.connect()
+    # the next connection is an overflow connection, it doesn't wait
+    assert not sql.pool_exhausted(pool)
+    second = pool.connect()
+    assert sql.pool_exhausted(pool)
+    second.close()
+    first.close()
+    engine.dispose()
+
+
+def test_max_overflow_from_pool_params(tmp_path: Path):
+    sql = DataCheckSql(f"sqlite+pysqlite:///{tmp_path / 'd.db'}")
+    sql.get_engine()
+    assert sql.max_overflow == sql.get_pool_params()["max_overflow"]
+    sql.get_engine().dispose()
+
+
+def test_pool_statistics_are_printed(dc: DataCheck, capsys):
+    dc.sql.run_query("select 1 as a")
+    dc.output.pprint_pool_statistics(dc.sql.pool_statistics.as_dict())
+    assert "1 checkouts, 0 waits (0.00 s)" in capsys.readouterr().out
+
+
+def test_pickled_sql_uses_single_engine_per_process(sql: DataCheckSql):
+    sql.get_engine()
+    copy_1 = pickle.loads(pickle.dumps(sql))
+    copy_2 = pickle.loads(pickle.dumps(sql))
+    assert copy_1.get_engine() is copy_2.get_engine()
+    assert copy_1.get_engine() is not sql.get_engine()
+
+
+def test_disconnect_keeps_process_engine(sql: DataCheckSql):
+    copy_1 = pickle.loads(pickle.dumps(sql))
+    engine = copy_1.get_engine()
+    copy_1.disconnect()
+    copy_2 = pickle.loads(pickle.dumps(sql))
+    assert copy_2.get_engine() is engine
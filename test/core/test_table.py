@@ -1,3 +1,5 @@
+from sqlalchemy import text
+
 from data_check.sql import DataCheckSql, Table
 
 
@@ -24,3 +26,20 @@ def test_parse_table_name_with_schema_with_db(sql: DataCheckSql):
     # this looks wrong, but multiple databases are currently not supported
     assert table.schema == "db"
     assert table.name == "a.b"
+
+
+def test_referred_tables(sql: DataCheckSql):
+    with sql.conn() as c:
+        c.execute(text("create table test_referred_parent (id integer primary key)"))
+        c.execute(
+            text(
+                "create table test_referred_child (id integer, "
+                "parent_id integer references test_referred_parent (id))"
+            )
+        )
+    table = Table.from_table_name(sql, "test_referred_child")
+    assert [t.full_name for t in table.referred_tables] == ["test_referred_parent"]
+
+
+def test_referred_tables_non_existing_table(sql: DataCheckSql):
+    assert Table.from_table_name(sql, "non_existing").referred_tables == []
@@ -1,3 +1,4 @@
+import gzip
 from pathlib import Path
 
 from data_check import DataCheck
@@ -36,3 +37,23 @@ def test_table_check_pipeline(dc_serial: DataCheck):
     result = check.run_test()
     print(result)
     assert result
+
+
+def test_table_check_compressed(dc: DataCheck, tmp_path: Path):
+    dc.sql.run_sql("create table test_table_check_compressed (a int, b varchar(10))")
+    dc.sql.run_sql("insert into test_table_check_compressed values (1, 'x')")
+    check_file = tmp_path / "main.test_table_check_compressed.csv.gz"
+    check_file.write_bytes(gzip.compress(b"a,b\n1,x\n"))
+    check = dc.get_check(check_file)
+    assert check
+    assert check.run_test()
+
+
+def test_table_check_compressed_wrong_data(dc: DataCheck, tmp_path: Path):
+    dc.sql.run_sql("create table test_table_check_compressed_wd (a int)")
+    dc.sql.run_sql("insert into test_table_check_compressed_wd values (1)")
+    check_file = tmp_path / "test_table_check_compressed_wd.csv.gz"
+    check_file.write_bytes(gzip.compress(b"a\n2\n"))
+    check = dc.get_check(check_file)
+    assert check
+    assert not check.run_test()
@@ -4,7 +4,17 @@ from pathlib import Path
 import pandas as pd
 import pytest
 from pandas.testing import assert_frame_equal
-from sqlalchemy import Column, Date, DateTime, Integer, MetaData, Numeric, String
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Integer,
+    MetaData,
+    Numeric,
+    String,
+    text,
+)
 from sqlalchemy import Table as SQLTable
 from sqlalchemy.exc import DatabaseError
 
@@ -473,3 +483,45 @@ def test_load_large_number(dc_serial: DataCheck):
     result = table_check.run_test()
 
     assert result
+
+
+def test_load_empty_string_and_null(dc_serial: DataCheck):
+    if dc_serial.sql.dialect == "oracle":
+        pytest.skip("oracle stores empty strings as NULL")
+    table = create_test_table("test_load_empty_string_and_null", "main", dc_serial)
+    data = pd.DataFrame({"id": [1, 2, 3], "data": ["", None, "a\tb\\N"]})
+    dc_serial.sql.table_loader.load_table(table, data, LoadMode.APPEND)
+    df = dc_serial.sql.run_query(f"select id, data from {table} order by id")
+    assert df["data"].tolist() == ["", None, "a\tb\\N"]
+
+
+def test_truncate_tables_with_foreign_keys(dc_serial: DataCheck):
+    if dc_serial.sql.dialect == "databricks":
+        pytest.skip("databricks: foreign keys are only supported in Unity Catalog")
+    parent = Table(dc_serial.sql, "test_truncate_fk_parent", "main")
+    child = Table(dc_serial.sql, "test_truncate_fk_child", "main")
+    child.drop_if_exists()
+    parent.drop_if_exists()
+    metadata = MetaData()
+    SQLTable(
+        parent.name,
+        metadata,
+        Column("id", Integer, primary_key=True),
+        schema=parent.schema,
+    )
+    SQLTable(
+        child.name,
+        metadata,
+        Column("id", Integer),
+        Column("parent_id", Integer, ForeignKey(f"{parent.full_name}.id")),
+        schema=child.schema,
+    )
+    with dc_serial.sql.conn() as c:
+        metadata.create_all(bind=c)
+        c.execute(text(f"insert into {parent} values (1)"))
+        c.execute(text(f"insert into {child} values (1, 1)"))
+    dc_serial.sql.table_loader.truncate_tables(
+        [parent.full_name, child.full_name], {1: {0}}
+    )
+    assert len(dc_serial.sql.run_query(f"select * from {parent}")) == 0
+    assert len(dc_serial.sql.run_query(f"select * from {child}")) == 0
@@ -6,6 +6,7 @@ from sqlalchemy import Table as SQLTable
 
 from data_check.sql import DataCheckSql, Table
 from data_check.sql.load_mode import LoadMode
+from data_check.sql.table_loader import TableLoader, UpsertResult
 
 
 def create_test_table(table_name: str, schema: str, sql: DataCheckSql):
@@ -88,3 +89,78 @@ def test_upsert(sql: DataCheckSql):
     data = sql.run_query("select * from main.test_upsert_1")
 
     assert_frame_equal(data, df_expected)
+
+
+def skip_without_primary_keys(sql: DataCheckSql):
+    if sql.dialect == "duckdb":
+        pytest.skip("duckdb-engine doesn't yet support reflection on indices")
+    elif sql.dialect == "databricks":
+        pytest.skip(
+            "databricks: Table constraints are only supported in Unity Catalog."
+        )
+
+
+def test_upsert_result(sql: DataCheckSql):
+    skip_without_primary_keys(sql)
+    table = create_test_table("test_upsert_result", "main", sql)
+    sql.table_loader.load_table(
+        table, pd.DataFrame({"id": [1, 2], "data": ["a", "b"]}), LoadMode.APPEND
+    )
+    result = sql.table_loader.upsert_data(
+        pd.DataFrame({"id": [2, 3, 4], "data": ["b2", "c", "d"]}), table
+    )
+    assert result == UpsertResult(inserted=2, updated=1)
+
+
+def test_upsert_row_by_row(sql: DataCheckSql):
+    skip_without_primary_keys(sql)
+    table = create_test_table("test_upsert_row_by_row", "main", sql)
+    sql.table_loader.load_table(
+        table, pd.DataFrame({"id": [1, 2], "data": ["a", "b"]}), LoadMode.APPEND
+    )
+    loader = TableLoader(sql, sql.output, LoadMode.UPSERT)
+    result = loader.upsert_data(
+        pd.DataFrame({"id": [2, 3], "data": ["b2", "c"]}), table
+    )
+    assert result == UpsertResult(inserted=1, updated=1)
+    data = sql.run_query("select * from main.test_upsert_row_by_row")
+    assert data["data"].tolist() == ["a", "b2", "c"]
+
+
+def test_upsert_only_primary_keys(sql: DataCheckSql):
+    skip_without_primary_keys(sql)
+    table = create_test_table("test_upsert_only_pk", "main", sql)
+    sql.table_loader.load_table(
+        table, pd.DataFrame({"id": [1], "data": ["a"]}), LoadMode.APPEND
+    )
+    result = sql.table_loader.upsert_data(pd.DataFrame({"id": [1, 2]}), table)
+    assert result == UpsertResult(inserted=1, updated=1)
+    data = sql.run_query("select * from main.test_upsert_only_pk")
+    assert data["data"].tolist() == ["a", None]
+
+
+def test_upsert_with_null_values(sql: DataCheckSql):
+    skip_without_primary_keys(sql)
+    table = create_test_table("test_upsert_null", "main", sql)
+    sql.table_loader.load_table(
+        table, pd.DataFrame({"id": [1], "data": ["a"]}), LoadMode.APPEND
+    )
+    sql.table_loader.upsert_data(
+        pd.DataFrame({"id": [1, 2], "data": [None, "b"]}), table
+    )
+    data = sql.run_query("select * from main.test_upsert_null")
+    assert data["data"].tolist() == [None, "b"]
+
+
+def test_upsert_duplicate_keys(sql: DataCheckSql):
+    skip_without_primary_keys(sql)
+    table = create_test_table("test_upsert_duplicate_keys", "main", sql)
+    sql.table_loader.load_table(
+        table, pd.DataFrame({"id": [1], "data": ["a"]}), LoadMode.APPEND
+    )
+    result = sql.table_loader.upsert_data(
+        pd.DataFrame({"id": [1, 2, 1], "data": ["b", "c", "d"]}), table
+    )
+    assert result == UpsertResult(inserted=1, updated=2)
+    data = sql.run_query("select * from main.test_upsert_duplicate_keys order by id")
+    assert data["data"].tolist() == ["d", "c"]
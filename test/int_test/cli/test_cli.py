@@ -1,12 +1,16 @@
+import json
+import re
 import shutil
 import warnings
 from os import linesep, sep
 from pathlib import Path
 from typing import Optional
 
+import pytest
 from click.testing import CliRunner, Result
 
 from data_check.cli.main import cli
+from data_check.durations import CheckDurations
 
 FAILED_EXIT_CODE = 2
 
@@ -245,6 +249,12 @@ def test_invalid_verbose():
     assert '(sqlite3.OperationalError) near "selct": syntax error' in res.output
 
 
+def test_verbose_prints_pool_statistics():
+    res = run_check(["--verbose"])
+    assert_passed(res)
+    assert "connection pool: " in res.output
+
+
 def test_invalid_traceback():
     res = run(["--traceback", "checks/failing/invalid.sql"])
     assert_failed(res)
@@ -316,6 +326,25 @@ def test_generate_force():
     )
 
 
+def test_generate_parquet():
+    pytest.importorskip("pyarrow")
+    gen_parquet = Path("checks/generated/generate_before_running.parquet")
+    gen_parquet.unlink(missing_ok=True)
+    res = run(
+        [
+            "gen",
+            "--format",
+            "parquet",
+            "checks/generated/generate_before_running.sql",
+        ]
+    )
+    assert res.exit_code == 0
+    assert gen_parquet.exists()
+    res = run(["checks/generated/generate_before_running.sql"])
+    gen_parquet.unlink()
+    assert res.exit_code == 0
+
+
 def test_generate_full_table_check(tmp_path: Path):
     csv_txt = "type,name,tbl_name,rootpage,sql"
     runner = CliRunner()
@@ -502,3 +531,99 @@ def test_run_pipeline_yaml():
     # being run in parallel/non deterministically, even with a single worker.
     # Hence, we can only compare the length of the output, not the output itself.
     assert len(res_folder.output) == len(res_file.output)
+
+
+def test_shard():
+    res = run(["run", "--shard", "1/1", "checks/basic/simple_string.sql"])
+    assert_passed(res)
+
+
+def test_shard_invalid():
+    res = run(["run", "--shard", "2/1", "checks/basic/simple_string.sql"])
+    assert res.exit_code == 1
+    assert "invalid shard: 2/1" in res.output
+
+
+def test_refresh_metadata():
+    res = run(["run", "--refresh-metadata", "checks/basic/simple_string.sql"])
+    assert_passed(res)
+
+
+def test_result_file_and_merge(tmp_path: Path):
+    result_1 = tmp_path / "result_1.json"
+    result_2 = tmp_path / "result_2.json"
+    run(["run", "--result-file", str(result_1), "checks/basic/simple_string.sql"])
+    run(["run", "--result-file", str(result_2), "checks/failing/invalid.sql"])
+    res = run(["merge", str(result_1), str(result_2)], workers=None)
+    assert res.exit_code == 1
+    output = re.sub(r"\x1b\[[0-9;]*m", "", res.output)
+    assert "summary: 1 passed, 1 failed, 0 warning" in output
+
+
+def test_run_saves_durations(tmp_path: Path):
+    res = run(["run", "checks/basic/simple_string.sql"])
+    assert res.exit_code == 0
+    durations = json.loads((tmp_path / ".data_check" / "durations.json").read_text())
+    assert list(durations) == ["checks/basic/simple_string.sql"]
+
+
+def test_pipeline_saves_durations_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    saves: list[Path] = []
+    save = CheckDurations.save
+
+    def counting_save(self: CheckDurations):
+        saves.append(self.durations_path)
+        save(self)
+
+    monkeypatch.setattr(CheckDurations, "save", counting_save)
+    res = run(["run", "checks/pipelines/simple_pipeline"])
+    assert res.exit_code == 0
+    assert saves == [tmp_path / ".data_check" / "durations.json"]
+    # the durations of the nested checks are saved as well
+    nested_check = "checks/pipelines/simple_pipeline/pipeline_checks/2nd_test.sql"
+    assert nested_check in json.loads(saves[0].read_text())
+
+
+def test_merge_durations(tmp_path: Path):
+    result_file = tmp_path / "result.json"
+    durations_file = tmp_path / "durations.json"
+    run(["run", "--result-file", str(result_file), "checks/basic/simple_string.sql"])
+    res = run(
+        ["merge", "--durations-file", str(durations_file), str(result_file)],
+        workers=None,
+    )
+    assert res.exit_code == 0
+    durations = json.loads(durations_file.read_text())
+    assert list(durations) == ["checks/basic/simple_string.sql"]
+
+
+def test_shard_durations(tmp_path: Path):
+    durations_file = tmp_path / "durations.json"
+    durations_file.write_text(
+        json.dumps({"checks/basic/simple_string.sql": 10, "checks/basic/float.sql": 1})
+    )
+    shards = [
+        run(
+            [
+                "run",
+                "--shard",
+                f"{i}/2",
+                "--shard-durations",
+                str(durations_file),
+                "checks/basic/simple_string.sql",
+                "checks/basic/float.sql",
+            ]
+        )
+        for i in (1, 2)
+    ]
+    assert all(r.exit_code == 0 for r in shards)
+    assert "simple_string.sql: PASSED" in shards[0].output
+    assert "float.sql" not in shards[0].output
+    assert "float.sql: PASSED" in shards[1].output
+
+
+def test_merge_passed(tmp_path: Path):
+    result_file = tmp_path / "result.json"
+    run(["run", "--result-file", str(result_file), "checks/basic/simple_string.sql"])
+    res = run(["merge", str(result_file)], workers=None)
+    assert_passed(res)
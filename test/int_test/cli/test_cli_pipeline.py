@@ -31,9 +31,15 @@ IGNORE_PARAMS = [
     ("run", "print_failed"),
     ("run", "print_format"),
     ("run", "print_diffed"),
+    ("run", "shard"),
+    ("run", "shard_durations"),
+    ("run", "result_file"),
+    ("run", "refresh_metadata"),
+    ("load", "refresh_metadata"),
+    ("append", "refresh_metadata"),
 ]
 
-IGNORE_COMMANDS = ["ping", "gen", "init"]
+IGNORE_COMMANDS = ["ping", "gen", "init", "merge"]
 
 
 def get_command_param_names() -> list[tuple[str, str]]:
@@ -19,6 +19,20 @@ def test_init(tmp_path: Path):
     assert checks_path.exists()
 
 
+def test_init_ignores_cache(tmp_path: Path):
+    runner = CliRunner()
+    with runner.isolated_filesystem(tmp_path) as td:  # type: ignore
+        gitignore = Path(td) / ".gitignore"
+        gitignore.write_text("*.log")
+        result = runner.invoke(cli, ["init", "."])
+        result_sp = runner.invoke(cli, ["init", "sp"])
+
+    assert result.exit_code == 0
+    assert result_sp.exit_code == 0
+    assert gitignore.read_text() == "*.log\n.data_check/\n"
+    assert (Path(td) / "sp" / ".gitignore").read_text() == ".data_check/\n"
+
+
 def test_init_subpath(tmp_path: Path):
     runner = CliRunner()
     with runner.isolated_filesystem(tmp_path) as td:  # type: ignore
@@ -30,6 +30,12 @@ def test_load_tables_folder():
     )
 
 
+def test_load_tables_refresh_metadata():
+    res = run(["load", "--refresh-metadata", "load_data/test.csv"])
+    assert res.exit_code == 0
+    assert res.output.strip() == f"table test loaded from load_data{sep}test.csv"
+
+
 def test_load_table():
     res = run(["load", "load_data/test.csv", "--table", "test_load_table"])
     assert res.exit_code == 0
@@ -39,8 +39,10 @@ def should_pass(command: list[str], workers: Optional[int] = 1):
     scope="module",
     params=[
         "checks/basic",
+        "checks/compressed",
         "checks/empty_sets/basic",
         "checks/excel/basic",
+        "checks/key_columns/basic",
         "checks/pipelines/simple_pipeline",
         "checks/pipelines/date_test",
         "checks/pipelines/leading_zeros",
@@ -69,6 +71,7 @@ def test_passing_tests(passing_tests):
         "checks/empty_sets/failing/not_empty_query.sql",
         "checks/excel/failing/failing_empty.sql",
         "checks/excel/failing/failing_excel.sql",
+        "checks/key_columns/failing/changed_values.sql",
     ],
 )
 def failing_tests(request):